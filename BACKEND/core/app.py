@@ -8,7 +8,7 @@ Author: SkillVerse Team
 Purpose: Initialize and configure Flask application
 """
 
-from flask import Flask, render_template
+from flask import Flask, g, render_template
 from flask_login import LoginManager
 from flask_socketio import SocketIO
 import os
@@ -20,8 +20,17 @@ load_dotenv()
 from config import get_config
 from models import db, User
 
+# Timezones for the to_ist template filter, resolved once at import time.
+# stdlib zoneinfo is C-backed and roughly an order of magnitude faster
+# per conversion than pytz, which also re-resolved the zone on every call
+from datetime import timezone as _tz
+from zoneinfo import ZoneInfo
+
+_IST = ZoneInfo('Asia/Kolkata')
+_UTC = _tz.utc
+
 # Initialize Flask-Login and Flask-Mail
-from extensions import login_manager, oauth, socketio, mail
+from extensions import login_manager, oauth, register_google_oauth, socketio, mail
 from flask_compress import Compress
 
 
@@ -30,6 +39,103 @@ from flask_compress import Compress
 # Initialize Compress
 compress = Compress()
 
+
+def _warm_connection_pool(app):
+    """
+    Open database connections at startup so the first requests don't pay
+    full connect latency (TCP + auth handshake to PostgreSQL).
+
+    Issues pool_size parallel SELECT 1 statements so SQLAlchemy
+    instantiates the engine and fills its connection pool eagerly.
+
+    Args:
+        app: Flask application instance (app context must be active)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from sqlalchemy import text
+
+    pool_size = app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}).get('pool_size', 5)
+
+    # Resolve the engine here — db.engine needs the app context, which
+    # worker threads don't inherit
+    engine = db.engine
+
+    def _ping(_):
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+
+    try:
+        with ThreadPoolExecutor(max_workers=pool_size) as executor:
+            list(executor.map(_ping, range(pool_size)))
+        print(f"[OK] Warmed {pool_size} database connections")
+    except Exception as e:
+        # Non-fatal: connections will simply be opened lazily as before
+        print(f"[WARN] Connection pool warm-up failed: {e}")
+
+
+def _init_database(app):
+    """
+    Create tables, run schema migrations and seed default rows.
+
+    Kept out of the per-worker boot path: each call costs several
+    inspection round-trips plus seed queries, and running it from every
+    Gunicorn worker at once races on DDL and admin seeding. Invoked via
+    the 'flask init-db' CLI command, or on boot when the
+    FLASK_RUN_MIGRATIONS=1 environment flag is set (the dev runner
+    sets it so `python run.py` still works out of the box).
+
+    Args:
+        app: Flask application instance
+    """
+    from sqlalchemy import inspect, text
+
+    with app.app_context():
+        # Advisory lock: when several workers boot with
+        # FLASK_RUN_MIGRATIONS=1 at once, only the lock-holder runs the
+        # DDL and seeding — the rest skip instead of stacking up behind
+        # shared catalog locks and racing on the admin seed.
+        # The lock is session-scoped, so hold one dedicated connection
+        # open for the duration and release on the same connection.
+        lock_conn = None
+        if db.engine.dialect.name == 'postgresql':
+            lock_conn = db.engine.connect()
+            acquired = lock_conn.execute(text(
+                "SELECT pg_try_advisory_lock(hashtext('skillverse_migrations'))"
+            )).scalar()
+            if not acquired:
+                lock_conn.close()
+                print('[OK] Another worker is initializing the database, skipping')
+                return
+
+        try:
+            db.create_all()
+
+            # Migrate: Add is_approved and rejection_reason columns if missing
+            inspector = inspect(db.engine)
+            if 'services' in inspector.get_table_names():
+                columns = [col['name'] for col in inspector.get_columns('services')]
+                if 'is_approved' not in columns:
+                    db.session.execute(text('ALTER TABLE services ADD COLUMN is_approved BOOLEAN DEFAULT TRUE'))
+                    db.session.execute(text('ALTER TABLE services ADD COLUMN rejection_reason VARCHAR(500)'))
+                    db.session.execute(text('UPDATE services SET is_approved = TRUE'))
+                    db.session.commit()
+
+            # Run Schema Migrations (certificates, wallet_balance, etc.)
+            from migrate_db import run_migrations
+            run_migrations(app)
+
+            # Create default admin user if not exists
+            from init_db import create_default_admin, seed_categories
+            create_default_admin(app)
+            seed_categories()
+        finally:
+            if lock_conn is not None:
+                lock_conn.execute(text(
+                    "SELECT pg_advisory_unlock(hashtext('skillverse_migrations'))"
+                ))
+                lock_conn.close()
+
+
 def create_app(config_name='default'):
     """
     Application Factory Function
@@ -72,20 +178,23 @@ def create_app(config_name='default'):
 
 
 
+    # Performance: compiled Jinja templates
+    # The default LRU cache holds 400 templates and re-stats template
+    # files on every render when auto_reload is on; outside debug we
+    # keep every compiled template forever (a plain dict is Jinja's
+    # unbounded cache) and skip the mtime checks entirely
+    if not app.config.get('DEBUG', False):
+        app.jinja_env.auto_reload = False
+        app.jinja_env.cache = {}
+
     # Performance: Cache Static Files for 1 Year
     app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
     app.config['COMPRESS_MIMETYPES'] = ['text/html', 'text/css', 'text/javascript', 'application/json', 'application/javascript']
     app.config['COMPRESS_LEVEL'] = 6
     app.config['COMPRESS_MIN_SIZE'] = 500
 
-    # Register Google OAuth
-    oauth.register(
-        name='google',
-        client_id=app.config['GOOGLE_CLIENT_ID'],
-        client_secret=app.config['GOOGLE_CLIENT_SECRET'],
-        server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
-        client_kwargs={'scope': 'openid email profile'},
-    )
+    # Register Google OAuth (no-op after the first create_app call)
+    register_google_oauth(app)
     
     # Configure Flask-Login
     login_manager.login_view = 'auth.login'  # Redirect to login page if not authenticated
@@ -97,14 +206,25 @@ def create_app(config_name='default'):
     def load_user(user_id):
         """
         Load user by ID for Flask-Login
-        
+
+        Flask-Login calls this on every authenticated request; the loaded
+        user is cached on flask.g so repeated lookups within one request
+        (e.g. Socket.IO long-polling) don't hit the database again.
+        db.session.get() also short-circuits through the SQLAlchemy
+        identity map, unlike the legacy Query.get().
+
         Args:
             user_id (str): User ID
-            
+
         Returns:
             User: User object or None
         """
-        return User.query.get(int(user_id))
+        cached = g.get('_current_user_obj')
+        if cached is not None and str(cached.id) == str(user_id):
+            return cached
+        user = db.session.get(User, int(user_id))
+        g._current_user_obj = user
+        return user
     
     # Register blueprints (routes)
     from routes import main_bp, auth_bp, service_bp, user_bp, admin_bp, api_bp, availability_bp
@@ -138,47 +258,35 @@ def create_app(config_name='default'):
     if upload_folder and not os.path.exists(upload_folder):
         os.makedirs(upload_folder)
     
-    # Create database tables
+    # Database setup as an explicit CLI command: flask init-db
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create tables, run migrations and seed default data."""
+        _init_database(app)
+        print('[OK] Database initialized')
+
+    # Only run migrations on boot when explicitly requested — with
+    # multiple workers each one would otherwise repeat the same DDL
+    # inspection round-trips and race on seeding the admin user
+    if os.environ.get('FLASK_RUN_MIGRATIONS') == '1':
+        _init_database(app)
+
+    # Eagerly fill the connection pool to avoid cold-start latency
     with app.app_context():
-        db.create_all()
-        
-        # Migrate: Add is_approved and rejection_reason columns if missing
-        from sqlalchemy import inspect, text
-        inspector = inspect(db.engine)
-        if 'services' in inspector.get_table_names():
-            columns = [col['name'] for col in inspector.get_columns('services')]
-            if 'is_approved' not in columns:
-                db.session.execute(text('ALTER TABLE services ADD COLUMN is_approved BOOLEAN DEFAULT TRUE'))
-                db.session.execute(text('ALTER TABLE services ADD COLUMN rejection_reason VARCHAR(500)'))
-                db.session.execute(text('UPDATE services SET is_approved = TRUE'))
-                db.session.commit()
-        
-        # Run Schema Migrations (certificates, wallet_balance, etc.)
-        from migrate_db import run_migrations
-        run_migrations(app)
+        _warm_connection_pool(app)
 
-        # Create default admin user if not exists
-        from init_db import create_default_admin, seed_categories
-        create_default_admin(app)
-        seed_categories()
-    
     # Register Socket.IO events
     from events import register_socketio_events
     register_socketio_events(socketio)
     
-    # Template filter for IST conversion
-    from datetime import timedelta
-    import pytz
+    # Template filter for IST conversion (runs once per rendered timestamp)
     @app.template_filter('to_ist')
     def to_ist(dt):
         if dt:
             # If datetime is naive (no timezone), assume UTC
             if dt.tzinfo is None:
-                utc_tz = pytz.UTC
-                dt = utc_tz.localize(dt)
-            # Convert to IST
-            ist_tz = pytz.timezone('Asia/Kolkata')
-            return dt.astimezone(ist_tz)
+                dt = dt.replace(tzinfo=_UTC)
+            return dt.astimezone(_IST)
         return dt
     
     return app
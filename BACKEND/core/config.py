@@ -13,6 +13,8 @@ Purpose: Centralized configuration management
 import os
 from datetime import timedelta
 
+from sqlalchemy.pool import QueuePool
+
 # Get the base directory of the application
 basedir = os.path.abspath(os.path.dirname(__file__))
 
@@ -36,6 +38,19 @@ class Config:
     
     # Disable SQLAlchemy modification tracking (saves memory)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Explicit connection pool settings
+    # The default pool of 5 connections churns under concurrent
+    # Socket.IO + HTTP load; pre_ping avoids stale-connection errors
+    # when PostgreSQL drops idle connections
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'poolclass': QueuePool,
+        'pool_size': 25,
+        'max_overflow': 25,
+        'pool_timeout': 30,
+        'pool_pre_ping': True,
+        'pool_recycle': 1800,  # Recycle connections older than 30 minutes
+    }
     
     # Session Configuration
     # Sessions will expire after 7 days of inactivity
@@ -72,6 +87,14 @@ class Config:
     ENABLE_ASKVERA = os.environ.get('ENABLE_ASKVERA', 'False').lower() == 'true'
     GROQ_API_KEY = os.environ.get('GROQ_API_KEY')
 
+    # File downloads
+    # When running behind nginx/Apache with X-Sendfile support, setting
+    # this makes send_file() emit only the X-Sendfile header so the
+    # proxy streams the bytes instead of the Python worker. Off by
+    # default — the dev server and plain gunicorn must send the file
+    # themselves
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', 'False').lower() == 'true'
+
 
 
 
@@ -94,6 +117,10 @@ class DevelopmentConfig(Config):
     # Development-specific settings
     SQLALCHEMY_ECHO = True  # Log all SQL queries (useful for debugging)
 
+    # Also log connection pool checkouts/checkins in development
+    SQLALCHEMY_ENGINE_OPTIONS = dict(Config.SQLALCHEMY_ENGINE_OPTIONS,
+                                     echo_pool='debug')
+
 
 class ProductionConfig(Config):
     """
@@ -132,7 +159,10 @@ class TestingConfig(Config):
     SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL') or \
         'sqlite:///test_db.sqlite'
 
-    
+    # SQLite doesn't need (or support) the PostgreSQL pool settings
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+
+
     # Disable CSRF protection in testing
     WTF_CSRF_ENABLED = False
 
@@ -4,6 +4,10 @@ Socket.IO Event Handlers for Real-Time Chat
 This module handles WebSocket events for real-time messaging
 """
 
+import logging
+import os
+from collections import defaultdict
+
 from flask import request
 from flask_login import current_user
 from flask_socketio import emit, join_room, leave_room
@@ -11,41 +15,168 @@ from models import db, Message, Order
 from managers import chat_manager
 import pytz
 
-# Global set to track online users (simple in-memory storage)
-# In production with multiple workers, use Redis
+try:
+    import redis as _redis
+except ImportError:
+    _redis = None
+
+# Resolved once at import time — pytz.timezone() does a registry lookup and
+# tzinfo construction on every call, and this handler runs per chat message
+IST = pytz.timezone('Asia/Kolkata')
+UTC = pytz.UTC
+
+# Notification link template, mirrors the 'user.order_detail' route.
+# url_for() walks Flask's URL map on every call; for a fixed route the
+# formatted string is equivalent and free
+_ORDER_DETAIL_URL = '/user/order/{}'
+
+# ============================================================================
+# PRESENCE TRACKING — Redis-backed when REDIS_URL is set, in-memory otherwise
+# ============================================================================
+# A single in-process set breaks with multiple Gunicorn/eventlet workers:
+# each worker only sees its own connections. When REDIS_URL is configured the
+# online set lives in a shared Redis SET so every worker sees the same state
+# (and Socket.IO uses the same Redis instance as its message queue, see
+# extensions.py). Without Redis we fall back to the old in-memory set so
+# local development needs no extra services.
+
+logger = logging.getLogger(__name__)
+
+PRESENCE_KEY = 'skillverse:presence:online'
+
+# In-memory fallback set (single-worker development mode)
 online_users = set()
 
+_presence_redis = None
+if _redis is not None and os.environ.get('REDIS_URL'):
+    try:
+        _presence_redis = _redis.Redis.from_url(
+            os.environ['REDIS_URL'], decode_responses=True
+        )
+        _presence_redis.ping()
+    except Exception as e:
+        logger.warning('Redis unavailable, using in-memory presence set: %s', e)
+        _presence_redis = None
+
+
+def _mark_online(user_id):
+    """Record a user as online in the shared presence store."""
+    if _presence_redis is not None:
+        _presence_redis.sadd(PRESENCE_KEY, user_id)
+    else:
+        online_users.add(user_id)
+
+
+def _mark_offline(user_id):
+    """Remove a user from the shared presence store."""
+    if _presence_redis is not None:
+        _presence_redis.srem(PRESENCE_KEY, user_id)
+    else:
+        online_users.discard(user_id)
+
+
+def _get_online_users():
+    """Return the current online user IDs as a set of ints (one fetch)."""
+    if _presence_redis is not None:
+        return {int(uid) for uid in _presence_redis.smembers(PRESENCE_KEY)}
+    return online_users
+
+# ============================================================================
+# EMIT COALESCING — batch broadcasts instead of one WebSocket frame per event
+# ============================================================================
+# Under bursty chat traffic every emit() pays its own WebSocket frame plus
+# TCP overhead. Instead of emitting immediately, events are appended to
+# per-room buffers which a background task flushes every FLUSH_INTERVAL
+# seconds as a single batch event ('new_message_batch' / 'user_status_batch').
+
+FLUSH_INTERVAL = 0.025   # Seconds between flushes (~40 flushes/sec)
+MAX_BATCH_SIZE = 100     # Max events per batch so one emit can't stall the socket
+
+# room -> list of pending message payloads
+_pending_messages = defaultdict(list)
+# List of pending user status payloads (broadcast to everyone)
+_pending_status = []
+_flusher_started = False
+
+
+def _queue_message(room, payload):
+    """Buffer a chat message payload for the next batch flush."""
+    _pending_messages[room].append(payload)
+
+
+def _queue_status(user_id, status):
+    """Buffer a user online/offline status change for the next batch flush."""
+    _pending_status.append({'user_id': user_id, 'status': status})
+
+
+def _flush_loop(socketio):
+    """Background task: flush pending buffers every FLUSH_INTERVAL seconds."""
+    while True:
+        socketio.sleep(FLUSH_INTERVAL)
+
+        # One failed emit (e.g. a transient message-queue hiccup) must
+        # not end the loop: producers keep buffering and nothing would
+        # ever flush again, so log and move on to the next interval
+        try:
+            # Flush per-room chat messages as single batch emits
+            if _pending_messages:
+                for room in list(_pending_messages.keys()):
+                    payloads = _pending_messages.pop(room, [])
+                    # Emit in capped chunks so one send can't block the socket
+                    for i in range(0, len(payloads), MAX_BATCH_SIZE):
+                        socketio.emit('new_message_batch',
+                                      {'messages': payloads[i:i + MAX_BATCH_SIZE]},
+                                      room=room)
+
+            # Flush status changes as one broadcast
+            if _pending_status:
+                batch = _pending_status[:MAX_BATCH_SIZE]
+                del _pending_status[:MAX_BATCH_SIZE]
+                socketio.emit('user_status_batch', {'statuses': batch})
+        except Exception as e:
+            logger.error('Batch flush failed (will retry next interval): %s', e)
+
+
+def _ensure_flusher(socketio):
+    """Start the flush background task once (lazy, on first connection)."""
+    global _flusher_started
+    if not _flusher_started:
+        _flusher_started = True
+        socketio.start_background_task(_flush_loop, socketio)
+
+
 def register_socketio_events(socketio):
     """Register all socket.io event handlers"""
-    
+
     @socketio.on('connect')
     def handle_connect():
         """Handle client connection"""
+        _ensure_flusher(socketio)
         if current_user.is_authenticated:
-            online_users.add(current_user.id)
-            print(f'User {current_user.username} connected')
-            # Broadcast user online status
-            socketio.emit('user_status', {'user_id': current_user.id, 'status': 'online'})
-        
+            _mark_online(current_user.id)
+            logger.debug('User %s connected', current_user.username)
+            # Broadcast user online status (coalesced)
+            _queue_status(current_user.id, 'online')
+
     @socketio.on('disconnect')
     def handle_disconnect():
         """Handle client disconnection"""
         if current_user.is_authenticated:
-            if current_user.id in online_users:
-                online_users.remove(current_user.id)
-            print(f'User {current_user.username} disconnected')
-            # Broadcast user offline status
-            socketio.emit('user_status', {'user_id': current_user.id, 'status': 'offline'})
+            _mark_offline(current_user.id)
+            logger.debug('User %s disconnected', current_user.username)
+            # Broadcast user offline status (coalesced)
+            _queue_status(current_user.id, 'offline')
 
     @socketio.on('check_users_status')
     def handle_check_status(data):
         """Check status for a list of user IDs"""
-        user_ids = data.get('user_ids', [])
-        status_map = {}
-        for uid in user_ids:
-            uid = int(uid) # Ensure int
-            status_map[uid] = 'online' if uid in online_users else 'offline'
-        
+        # Set intersection runs in C — no per-element Python dispatch even
+        # when a dashboard asks about hundreds of user IDs at once
+        ids = {int(uid) for uid in data.get('user_ids', [])}
+        online = ids & _get_online_users()
+        status_map = dict.fromkeys(online, 'online')
+        status_map.update(dict.fromkeys(ids - online, 'offline'))
+
         emit('users_status_response', status_map)
     
     @socketio.on('join')
@@ -66,7 +197,7 @@ def register_socketio_events(socketio):
         room = f'order_{order_id}'
         join_room(room)
         emit('joined', {'order_id': order_id}, room=room)
-        print(f'User {current_user.username} joined room {room}')
+        logger.debug('User %s joined room %s', current_user.username, room)
     
     @socketio.on('leave')
     def handle_leave(data):
@@ -80,7 +211,7 @@ def register_socketio_events(socketio):
         
         room = f'order_{order_id}'
         leave_room(room)
-        print(f'User {current_user.username} left room {room}')
+        logger.debug('User %s left room %s', current_user.username, room)
     
     @socketio.on('send_message')
     def handle_send_message(data):
@@ -94,64 +225,75 @@ def register_socketio_events(socketio):
         if not order_id or not content:
             return
         
-        # Save message to database
-        message, error = chat_manager.send_message(order_id, current_user.id, content)
-        
+        # Save message to database; the manager returns the recipient it
+        # already resolved while authorizing the sender, so no second
+        # Order fetch is needed here
+        message, error, recipient_id = chat_manager.send_message(order_id, current_user.id, content)
+
         if error:
             emit('error', {'message': error})
             return
-        
+
         # Create notification for the recipient (with rate limiting)
-        order = Order.query.get(order_id)
-        if order:
+        if recipient_id:
             from models import Notification
-            from flask import url_for
             from datetime import datetime, timedelta
-            
-            # Determine who should receive the notification (the other person)
-            if current_user.id == order.buyer_id:
-                recipient_id = order.seller_id
-            else:
-                recipient_id = order.buyer_id
-            
-            # Rate limiting: Check if there's already an unread notification 
-            # for this order from this sender within the last 5 minutes
-            five_mins_ago = datetime.utcnow() - timedelta(minutes=5)
-            existing_notification = Notification.query.filter(
-                Notification.user_id == recipient_id,
-                Notification.title == 'New Message 💬',
-                Notification.link.contains(str(order_id)),
-                Notification.is_read == False,
-                Notification.created_at >= five_mins_ago
-            ).first()
-            
-            # Only create notification if no recent unread notification exists
-            if not existing_notification:
-                notification = Notification(
-                    user_id=recipient_id,
-                    title='New Message 💬',
-                    message=f'{current_user.username} sent you a message in Order #{order_id}',
-                    link=url_for('user.order_detail', order_id=order_id)
+
+            notification_values = dict(
+                user_id=recipient_id,
+                title='New Message 💬',
+                message=f'{current_user.username} sent you a message in Order #{order_id}',
+                link=_ORDER_DETAIL_URL.format(order_id),
+                order_id=order_id
+            )
+
+            if db.engine.dialect.name == 'postgresql':
+                # Rate limiting via the partial unique index
+                # ix_notif_unread_dedup (see migrate_db.py): a single upsert
+                # round-trip that does nothing while an identical unread
+                # notification exists, instead of SELECT + conditional INSERT
+                from sqlalchemy import text
+                from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+                stmt = pg_insert(Notification).values(
+                    **notification_values
+                ).on_conflict_do_nothing(
+                    index_elements=['user_id', 'title', 'link'],
+                    index_where=text('is_read = false')
                 )
-                db.session.add(notification)
+                db.session.execute(stmt)
                 db.session.commit()
+            else:
+                # SQLite fallback: keep the explicit existence check.
+                # Filtering on the indexed order_id column is a seek,
+                # unlike the old link.contains() substring scan
+                five_mins_ago = datetime.utcnow() - timedelta(minutes=5)
+                existing_notification = Notification.query.filter(
+                    Notification.user_id == recipient_id,
+                    Notification.title == 'New Message 💬',
+                    Notification.order_id == order_id,
+                    Notification.is_read == False,
+                    Notification.created_at >= five_mins_ago
+                ).first()
+
+                if not existing_notification:
+                    db.session.add(Notification(**notification_values))
+                    db.session.commit()
         
-        # Convert to IST for display
-        ist_tz = pytz.timezone('Asia/Kolkata')
+        # Convert to IST for display (module-level tzinfo, no per-call lookup)
         created_at = message.created_at
         if created_at.tzinfo is None:
-            utc_tz = pytz.UTC
-            created_at = utc_tz.localize(created_at)
-        ist_time = created_at.astimezone(ist_tz)
+            created_at = UTC.localize(created_at)
+        ist_time = created_at.astimezone(IST)
         
-        # Broadcast to room
+        # Broadcast to room (coalesced into the next batch flush)
         room = f'order_{order_id}'
-        emit('new_message', {
+        _queue_message(room, {
             'id': message.id,
             'sender_id': message.sender_id,
             'sender_name': current_user.username,
             'content': message.content,
             'created_at': ist_time.isoformat(),
             'time_display': ist_time.strftime('%I:%M %p')
-        }, room=room)
+        })
 
@@ -1,10 +1,59 @@
+import os
+
 from flask_login import LoginManager
 from authlib.integrations.flask_client import OAuth
 from flask_socketio import SocketIO
 from flask_mail import Mail
 
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+class _OrjsonWrapper:
+    """
+    json-module lookalike backed by orjson for Socket.IO serialization.
+    orjson encodes in C (several times faster than stdlib json), which
+    matters because every emit serializes its payload. Socket.IO passes
+    stdlib-style kwargs like separators, which orjson neither needs nor
+    accepts, so they are swallowed here.
+    """
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        return _orjson.dumps(obj).decode('utf-8')
+
+    @staticmethod
+    def loads(data, **kwargs):
+        return _orjson.loads(data)
+
+
 # Initialize extensions
 login_manager = LoginManager()
 oauth = OAuth()
-socketio = SocketIO(cors_allowed_origins="*")
+
+
+def register_google_oauth(app):
+    """
+    Register the Google OAuth client exactly once.
+
+    oauth is a module-level singleton, so calling oauth.register from
+    every create_app invocation (tests, scripts, multiple configs)
+    re-registered the client each time and re-triggered metadata parsing.
+    The registry guard makes repeat calls free.
+    """
+    if 'google' not in oauth._registry:
+        oauth.register(
+            name='google',
+            client_id=app.config['GOOGLE_CLIENT_ID'],
+            client_secret=app.config['GOOGLE_CLIENT_SECRET'],
+            server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
+            client_kwargs={'scope': 'openid email profile'},
+        )
+# With REDIS_URL set, Socket.IO uses Redis pub/sub as its message queue so
+# emits from one worker reach clients connected to other workers.
+socketio = SocketIO(cors_allowed_origins="*",
+                    message_queue=os.environ.get('REDIS_URL'),
+                    json=_OrjsonWrapper if _orjson is not None else None)
 mail = Mail()
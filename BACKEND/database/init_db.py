@@ -14,32 +14,43 @@ from models import db, User, Category, Service
 from werkzeug.security import generate_password_hash
 
 
+def _dialect_insert(model):
+    """
+    Return the INSERT construct for the active dialect so seeding can use
+    ON CONFLICT DO NOTHING (supported by both PostgreSQL and SQLite).
+    """
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
 def create_default_admin(app):
     """
     Create default admin user if not exists
-    
+
+    A single INSERT ... ON CONFLICT DO NOTHING on the unique email
+    replaces the old SELECT-then-INSERT pair — one round-trip and no
+    race between workers booting at the same time.
+
     Args:
         app: Flask application instance
     """
     with app.app_context():
-        # Check if admin already exists
-        admin = User.query.filter_by(email=app.config['ADMIN_EMAIL']).first()
-        
-        if not admin:
-            # Create admin user
-            admin = User(
-                username='admin',
-                email=app.config['ADMIN_EMAIL'],
-                user_type='admin',
-                full_name='System Administrator',
-                is_active=True,
-                is_verified=True
-            )
-            admin.set_password(app.config['ADMIN_PASSWORD'])
-            
-            db.session.add(admin)
-            db.session.commit()
-            
+        stmt = _dialect_insert(User).values(
+            username='admin',
+            email=app.config['ADMIN_EMAIL'],
+            password_hash=generate_password_hash(app.config['ADMIN_PASSWORD']),
+            user_type='admin',
+            full_name='System Administrator',
+            is_active=True,
+            is_verified=True
+        ).on_conflict_do_nothing(index_elements=['email'])
+        result = db.session.execute(stmt)
+        db.session.commit()
+
+        if result.rowcount:
             print(f"[OK] Admin user created: {app.config['ADMIN_EMAIL']}")
         else:
             print(f"[OK] Admin user already exists: {app.config['ADMIN_EMAIL']}")
@@ -103,15 +114,13 @@ def seed_categories():
         }
     ]
     
-    for cat_data in categories_data:
-        # Check if category already exists
-        existing = Category.query.filter_by(name=cat_data['name']).first()
-        
-        if not existing:
-            category = Category(**cat_data)
-            db.session.add(category)
-    
+    # One multi-row upsert instead of a SELECT + INSERT per category:
+    # existing names are skipped by ON CONFLICT on the unique name column
     try:
+        stmt = _dialect_insert(Category).values(
+            categories_data
+        ).on_conflict_do_nothing(index_elements=['name'])
+        db.session.execute(stmt)
         db.session.commit()
         print(f"[OK] Seeded {len(categories_data)} categories")
     except Exception as e:
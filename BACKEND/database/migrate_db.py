@@ -27,17 +27,28 @@ def run_migrations(app):
 
         with db.engine.connect() as conn:
 
-            # ── 1. Add wallet_balance to users ──────────────────────────────
+            # ── 0. Inspect the schema in ONE round-trip ─────────────────────
+            # Every information_schema query is a network round-trip; fetch
+            # all the column facts the migrations below need at once and
+            # branch locally on the resulting set
             result = conn.execute(text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name = 'users' 
-                AND column_name = 'wallet_balance'
-                AND table_schema = 'public'
+                SELECT table_name, column_name
+                FROM information_schema.columns
+                WHERE table_schema = 'public'
+                AND (table_name, column_name) IN (
+                    ('users', 'wallet_balance'),
+                    ('services', 'pending_approval'),
+                    ('notifications', 'order_id'),
+                    ('transactions', 'id'),
+                    ('transactions', 'txn_id')
+                )
             """))
-            if result.fetchone() is None:
+            existing = set(result.fetchall())
+
+            # ── 1. Add wallet_balance to users ──────────────────────────────
+            if ('users', 'wallet_balance') not in existing:
                 conn.execute(text("""
-                    ALTER TABLE users 
+                    ALTER TABLE users
                     ADD COLUMN wallet_balance FLOAT NOT NULL DEFAULT 0.0
                 """))
                 conn.commit()
@@ -46,14 +57,7 @@ def run_migrations(app):
                 print("[OK] wallet_balance column already exists")
 
             # ── 1.5 Add pending_approval to services ────────────────────────
-            result = conn.execute(text("""
-                SELECT column_name
-                FROM information_schema.columns
-                WHERE table_name = 'services'
-                AND column_name = 'pending_approval'
-                AND table_schema = 'public'
-            """))
-            if result.fetchone() is None:
+            if ('services', 'pending_approval') not in existing:
                 conn.execute(text("""
                     ALTER TABLE services
                     ADD COLUMN pending_approval BOOLEAN DEFAULT FALSE
@@ -63,22 +67,28 @@ def run_migrations(app):
             else:
                 print("[OK] pending_approval column already exists")
 
+            # ── 1.6 Add order_id to notifications ───────────────────────────
+            # Indexed column for chat-notification rate limiting, replacing
+            # the unindexable LIKE scan over the link text
+            if ('notifications', 'order_id') not in existing:
+                conn.execute(text("""
+                    ALTER TABLE notifications
+                    ADD COLUMN order_id INTEGER REFERENCES orders(id)
+                """))
+                conn.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_notif_rate_limit
+                    ON notifications (user_id, order_id, is_read, created_at)
+                """))
+                conn.commit()
+                print("[OK] Added order_id column to notifications table")
+            else:
+                print("[OK] notifications.order_id column already exists")
+
             # ── 2. Create transactions table ─────────────────────────────────
-            # First check if table exists but is invalid (missing txn_id)
-            result = conn.execute(text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name = 'transactions' 
-                AND column_name = 'txn_id'
-                AND table_schema = 'public'
-            """))
-            is_valid = result.fetchone() is not None
-            
-            # Check if table exists at all
-            result = conn.execute(text("""
-                SELECT to_regclass('public.transactions')
-            """))
-            table_exists = result.scalar() is not None
+            # The table exists if it has its primary key column; it's only
+            # valid if the txn_id column is present too
+            table_exists = ('transactions', 'id') in existing
+            is_valid = ('transactions', 'txn_id') in existing
 
             if table_exists and not is_valid:
                 print("[INFO] Dropping malformed transactions table to recreate it...")
@@ -100,17 +110,17 @@ def run_migrations(app):
                     timestamp   TIMESTAMP DEFAULT NOW()
                 )
             """))
+            # All three indexes in one statement (and one round-trip)
             conn.execute(text("""
-                CREATE INDEX IF NOT EXISTS ix_transactions_txn_id  
-                ON transactions (txn_id)
-            """))
-            conn.execute(text("""
-                CREATE INDEX IF NOT EXISTS ix_transactions_user_id 
-                ON transactions (user_id)
-            """))
-            conn.execute(text("""
-                CREATE INDEX IF NOT EXISTS ix_transactions_timestamp 
-                ON transactions (timestamp)
+                DO $$
+                BEGIN
+                    CREATE INDEX IF NOT EXISTS ix_transactions_txn_id
+                    ON transactions (txn_id);
+                    CREATE INDEX IF NOT EXISTS ix_transactions_user_id
+                    ON transactions (user_id);
+                    CREATE INDEX IF NOT EXISTS ix_transactions_timestamp
+                    ON transactions (timestamp);
+                END $$
             """))
             conn.commit()
             print("[OK] transactions table ready")
@@ -131,6 +141,231 @@ def run_migrations(app):
             conn.commit()
             print("[OK] certificates table ready")
 
+            # ── 3.5 Partial unique index for chat notification dedup ──────────
+            # Lets send_message use INSERT ... ON CONFLICT DO NOTHING instead
+            # of a SELECT + conditional INSERT (one round-trip per message).
+            # Existing databases hold duplicate unread rows from before
+            # the index (the old code freely re-created identical
+            # notifications), so all but the newest per (user_id, title,
+            # link) are deleted first — CREATE UNIQUE INDEX would
+            # otherwise abort the migration with a duplicate-key error.
+            # NULL links can't collide (index keys treat NULLs as
+            # distinct), so the equality join skips them correctly
+            index_missing = conn.execute(text(
+                "SELECT to_regclass('ix_notif_unread_dedup') IS NULL"
+            )).scalar()
+            if index_missing:
+                conn.execute(text("""
+                    DELETE FROM notifications a
+                    USING notifications b
+                    WHERE a.is_read = false
+                      AND b.is_read = false
+                      AND a.user_id = b.user_id
+                      AND a.title = b.title
+                      AND a.link = b.link
+                      AND a.id < b.id
+                """))
+            conn.execute(text("""
+                CREATE UNIQUE INDEX IF NOT EXISTS ix_notif_unread_dedup
+                ON notifications (user_id, title, link)
+                WHERE is_read = false
+            """))
+            conn.commit()
+            print("[OK] notification dedup index ready")
+
+            # ── 3.6 Homepage aggregate indexes ────────────────────────────────
+            # The landing-page satisfaction rate counts reviews and
+            # testimonials by rating; these indexes replace full scans
+            # with index-only counts (orders.status is already indexed)
+            conn.execute(text("""
+                DO $$
+                BEGIN
+                    CREATE INDEX IF NOT EXISTS ix_review_rating
+                    ON reviews (rating);
+                    CREATE INDEX IF NOT EXISTS ix_testimonial_active_rating
+                    ON testimonials (is_active, rating);
+                    CREATE INDEX IF NOT EXISTS idx_review_service_rating
+                    ON reviews (service_id, rating);
+                END $$
+            """))
+            conn.commit()
+            print("[OK] homepage aggregate indexes ready")
+
+            # ── 3.7 Browse partial indexes ────────────────────────────────────
+            # browse() always filters is_active AND is_approved; partial
+            # indexes keep hidden/pending rows out of the index so the
+            # category + sort combinations become index range scans
+            conn.execute(text("""
+                DO $$
+                BEGIN
+                    CREATE INDEX IF NOT EXISTS ix_service_browse_price
+                    ON services (category_id, price)
+                    WHERE is_active AND is_approved;
+                    CREATE INDEX IF NOT EXISTS ix_service_browse_recent
+                    ON services (category_id, created_at DESC)
+                    WHERE is_active AND is_approved;
+                END $$
+            """))
+            conn.commit()
+            print("[OK] browse partial indexes ready")
+
+            # ── 3.8 Full-text search vector for services ─────────────────────
+            # A trigger-maintained tsvector over title/description/tags
+            # with a GIN index turns the search branch of browse() from an
+            # O(N) ILIKE scan into an indexed full-text probe
+            conn.execute(text("""
+                ALTER TABLE services
+                ADD COLUMN IF NOT EXISTS search_vector tsvector
+            """))
+            conn.execute(text("""
+                UPDATE services
+                SET search_vector = to_tsvector('english',
+                    coalesce(title, '') || ' ' ||
+                    coalesce(description, '') || ' ' ||
+                    coalesce(tags, ''))
+                WHERE search_vector IS NULL
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_service_search_vector
+                ON services USING GIN (search_vector)
+            """))
+            conn.execute(text("""
+                DROP TRIGGER IF EXISTS services_search_vector_update ON services
+            """))
+            conn.execute(text("""
+                CREATE TRIGGER services_search_vector_update
+                BEFORE INSERT OR UPDATE OF title, description, tags
+                ON services
+                FOR EACH ROW EXECUTE FUNCTION tsvector_update_trigger(
+                    search_vector, 'pg_catalog.english',
+                    title, description, tags)
+            """))
+            conn.commit()
+            print("[OK] service full-text search index ready")
+
+            # ── 3.9 Daily order-total rollup ─────────────────────────────────
+            # Backing table for the dashboard trend charts; backfilled
+            # from existing orders the first time it's created so the
+            # charts don't go blank on deploy
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS user_daily_stats (
+                    id           SERIAL PRIMARY KEY,
+                    user_id      INTEGER NOT NULL REFERENCES users(id),
+                    role         VARCHAR(10) NOT NULL,
+                    date         DATE NOT NULL,
+                    total_amount FLOAT NOT NULL DEFAULT 0.0,
+                    order_count  INTEGER NOT NULL DEFAULT 0,
+                    CONSTRAINT uq_user_daily_stats UNIQUE (user_id, role, date)
+                )
+            """))
+            rollup_empty = conn.execute(text(
+                "SELECT NOT EXISTS (SELECT 1 FROM user_daily_stats)"
+            )).scalar()
+            if rollup_empty:
+                conn.execute(text("""
+                    INSERT INTO user_daily_stats
+                        (user_id, role, date, total_amount, order_count)
+                    SELECT buyer_id, 'buyer', date(created_at),
+                           SUM(total_price), COUNT(*)
+                    FROM orders
+                    GROUP BY buyer_id, date(created_at)
+                """))
+                conn.execute(text("""
+                    INSERT INTO user_daily_stats
+                        (user_id, role, date, total_amount, order_count)
+                    SELECT seller_id, 'seller', date(completed_at),
+                           SUM(total_price), COUNT(*)
+                    FROM orders
+                    WHERE status = 'completed' AND completed_at IS NOT NULL
+                    GROUP BY seller_id, date(completed_at)
+                """))
+            conn.commit()
+            print("[OK] daily stats rollup ready")
+
+            # ── 3.10 Per-user order indexes ──────────────────────────────────
+            # Buyer/seller listings sort by created_at within one user;
+            # earnings aggregations filter seller + status on completed_at
+            conn.execute(text("""
+                DO $$
+                BEGIN
+                    CREATE INDEX IF NOT EXISTS ix_orders_buyer_created
+                    ON orders (buyer_id, created_at);
+                    CREATE INDEX IF NOT EXISTS ix_orders_seller_created
+                    ON orders (seller_id, created_at);
+                    CREATE INDEX IF NOT EXISTS ix_orders_seller_completed
+                    ON orders (seller_id, status, completed_at);
+                END $$
+            """))
+            conn.commit()
+            print("[OK] per-user order indexes ready")
+
+            # ── 3.11 Availability slot range index ───────────────────────────
+            # One provider's slots over a time window is the only access
+            # pattern (today's bookings, availability manager)
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS ix_slot_provider_start
+                ON availability_slots (provider_id, start_time)
+            """))
+            conn.commit()
+            print("[OK] availability slot index ready")
+
+            # ── 3.12 Denormalized provider rating columns ────────────────────
+            # Backfill uses the same mean-of-per-service-means formula the
+            # Review event listeners maintain from here on
+            conn.execute(text("""
+                ALTER TABLE users
+                ADD COLUMN IF NOT EXISTS avg_rating FLOAT DEFAULT 0.0
+            """))
+            conn.execute(text("""
+                ALTER TABLE users
+                ADD COLUMN IF NOT EXISTS rating_count INTEGER DEFAULT 0
+            """))
+            conn.execute(text("""
+                UPDATE users u SET
+                    avg_rating = COALESCE(agg.avg_rating, 0.0),
+                    rating_count = COALESCE(agg.rating_count, 0)
+                FROM (
+                    SELECT s.user_id,
+                           AVG(per_svc.avg_r) AS avg_rating,
+                           SUM(per_svc.cnt)   AS rating_count
+                    FROM services s
+                    JOIN (
+                        SELECT s2.id,
+                               COALESCE(AVG(r.rating), 0.0) AS avg_r,
+                               COUNT(r.id) AS cnt
+                        FROM services s2
+                        LEFT JOIN reviews r ON r.service_id = s2.id
+                        WHERE s2.is_active
+                        GROUP BY s2.id
+                    ) per_svc ON per_svc.id = s.id
+                    GROUP BY s.user_id
+                ) agg
+                WHERE agg.user_id = u.id
+                  AND (u.avg_rating IS NULL OR u.rating_count IS NULL
+                       OR (u.avg_rating = 0.0 AND u.rating_count = 0))
+            """))
+            conn.execute(text("""
+                UPDATE users SET avg_rating = 0.0, rating_count = 0
+                WHERE avg_rating IS NULL OR rating_count IS NULL
+            """))
+            conn.commit()
+            print("[OK] denormalized user rating columns ready")
+
+            # ── 3.13 Certificate listing indexes ─────────────────────────────
+            # my_certificates / issued_certificates filter one user and
+            # sort by issue date
+            conn.execute(text("""
+                DO $$
+                BEGIN
+                    CREATE INDEX IF NOT EXISTS ix_cert_student_issued
+                    ON certificates (student_id, issued_at);
+                    CREATE INDEX IF NOT EXISTS ix_cert_provider_issued
+                    ON certificates (provider_id, issued_at);
+                END $$
+            """))
+            conn.commit()
+            print("[OK] certificate listing indexes ready")
+
         print("All migrations complete [OK]")
 
     # ── 4. Create required directories ─────────────────────────────────
@@ -7,6 +7,8 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
+from sqlalchemy import update
+
 from BACKEND.models.models import db, User
 from BACKEND.core.app import create_app
 
@@ -17,26 +19,28 @@ def migrate_to_unified_user():
     - 'admin' stays as 'admin'
     """
     app = create_app('development')
-    
+
     with app.app_context():
         print("=" * 60)
         print("🔄 Migrating to Unified User Model")
         print("=" * 60)
-        
-        # Get all non-admin users
-        clients = User.query.filter_by(user_type='client').all()
-        providers = User.query.filter_by(user_type='provider').all()
-        
+
+        # Count non-admin users (no need to load full rows)
+        clients = User.query.filter_by(user_type='client').count()
+        providers = User.query.filter_by(user_type='provider').count()
+
         print(f"\n📊 Found:")
-        print(f"   - {len(clients)} clients")
-        print(f"   - {len(providers)} providers")
-        
-        # Convert all to 'user'
-        count = 0
-        for user in clients + providers:
-            user.user_type = 'user'
-            count += 1
-        
+        print(f"   - {clients} clients")
+        print(f"   - {providers} providers")
+
+        # Convert all to 'user' with a single bulk UPDATE —
+        # no per-row ORM loading or per-row UPDATE statements
+        result = db.session.execute(
+            update(User)
+            .where(User.user_type.in_(['client', 'provider']))
+            .values(user_type='user')
+        )
+        count = result.rowcount
         db.session.commit()
         
         print(f"\n✅ Successfully migrated {count} users to unified 'user' type")
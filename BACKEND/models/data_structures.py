@@ -3,125 +3,179 @@ Custom Data Structures for SkillVerse Application
 Built ENTIRELY from scratch — no external libraries used for core logic.
 
 This module contains hand-built implementations of:
-1. HashMap  — Hash table with separate chaining for O(1) average lookups
+1. HashMap  — Hash table with open addressing for O(1) average lookups
 2. MaxHeap  — Binary max-heap for efficient top-N element selection
-3. Queue    — Linked-list-based FIFO queue for order processing
+3. Queue    — Ring-buffer-based FIFO queue for order processing
 4. Trie     — Prefix tree for fast autocomplete suggestions
 
 Author: SkillVerse Team
 Purpose: Demonstrate understanding of fundamental data structures
 """
 
+import heapq
+from array import array
+from collections import deque
+
 
 # ============================================================================
-# 1. HASHMAP — Hash Table with Separate Chaining
+# 1. HASHMAP — Hash Table with Open Addressing (Linear Probing)
 # ============================================================================
 
-class _HashNode:
-    """
-    Internal linked-list node for HashMap's separate chaining.
-    Each node stores a key-value pair and a pointer to the next node.
-    """
-    def __init__(self, key, value):
-        self.key = key
-        self.value = value
-        self.next = None  # Pointer to next node in chain
-
-
 class HashMap:
     """
-    Hash Table implementation using separate chaining for collision resolution.
+    Hash Table implementation using open addressing with linear probing.
     Built from scratch as a drop-in replacement for Python's built-in dict.
 
     How it works:
-    - An internal array of 'buckets' stores key-value pairs
-    - A hash function maps each key to a bucket index
-    - Collisions are resolved via chaining (linked list per bucket)
-    - The table resizes (doubles) when load factor exceeds 0.75
+    - Entries live in three parallel arrays: _keys, _vals and a _state
+      bytearray (0 = empty, 1 = used, 2 = tombstone/deleted)
+    - A hash function maps each key to a starting slot index
+    - Collisions are resolved by probing the next slot (index + 1) until
+      an empty slot or the key itself is found
+    - Deletes leave a tombstone so later probes keep walking past the hole
+    - The table resizes (doubles) when the fill factor exceeds 0.75
+
+    Why parallel arrays instead of linked chains: a chain of node objects
+    costs one heap allocation plus attribute lookups per hop, while probing
+    here is just integer indexing into flat lists — far better cache
+    behaviour and no per-entry allocation.
 
     Time Complexity:
     - Average case: O(1) for get, put, delete, contains
-    - Worst case:   O(n) when all keys hash to the same bucket
+    - Worst case:   O(n) when many keys cluster into the same probe run
 
     Space Complexity: O(n)
     """
 
-    INITIAL_CAPACITY = 16
+    INITIAL_CAPACITY = 16  # Must stay a power of two (probing uses & mask)
     LOAD_FACTOR_THRESHOLD = 0.75
 
+    # Slot states for the _state bytearray
+    _EMPTY = 0
+    _USED = 1
+    _TOMB = 2
+
     def __init__(self):
         """Initialize an empty HashMap with default capacity."""
         self._capacity = self.INITIAL_CAPACITY
-        self._size = 0
-        self._buckets = [None] * self._capacity
+        self._mask = self._capacity - 1  # Cached for every probe step
+        self._size = 0  # Live entries
+        self._fill = 0  # Live entries + tombstones (drives resizing)
+        self._keys = [None] * self._capacity
+        self._vals = [None] * self._capacity
+        self._state = bytearray(self._capacity)
 
     def _hash(self, key):
-        """Compute bucket index for a given key using modulo hashing."""
-        return hash(key) % self._capacity
+        """
+        Compute the starting slot index for a key.
+        Multiplying by the Fibonacci constant scatters sequential integer
+        keys (like database IDs) across slots before masking down to the
+        power-of-two capacity.
+        """
+        return (hash(key) * 2654435769) & self._mask
 
     def _resize(self):
-        """Double capacity and rehash all existing entries."""
-        old_buckets = self._buckets
+        """
+        Double capacity and bulk-reinsert all live entries.
+
+        Placement goes straight into the new arrays rather than through
+        __setitem__: a freshly built table can't contain duplicates or
+        tombstones, so the duplicate-key comparison and the load-factor
+        check on every reinsert would be pure waste. Tombstones from the
+        old table are dropped in the process.
+        """
+        old_keys = self._keys
+        old_vals = self._vals
+        old_state = self._state
         self._capacity *= 2
-        self._buckets = [None] * self._capacity
-        self._size = 0
-        for head in old_buckets:
-            node = head
-            while node is not None:
-                self[node.key] = node.value
-                node = node.next
+        mask = self._capacity - 1
+        self._mask = mask
+        new_keys = [None] * self._capacity
+        new_vals = [None] * self._capacity
+        new_state = bytearray(self._capacity)
+        count = 0
+        for i, state in enumerate(old_state):
+            if state == self._USED:
+                key = old_keys[i]
+                index = (hash(key) * 2654435769) & mask
+                while new_state[index]:  # Walk to the first empty slot
+                    index = (index + 1) & mask
+                new_state[index] = self._USED
+                new_keys[index] = key
+                new_vals[index] = old_vals[i]
+                count += 1
+        self._keys = new_keys
+        self._vals = new_vals
+        self._state = new_state
+        self._size = count
+        self._fill = count
 
     def __setitem__(self, key, value):
         """Insert or update a key-value pair: hashmap[key] = value"""
+        mask = self._mask
+        state = self._state
+        keys = self._keys
         index = self._hash(key)
-        node = self._buckets[index]
-        while node is not None:
-            if node.key == key:
-                node.value = value
+        first_tomb = -1
+        # Probe until an empty slot; an existing key must be found before
+        # one because inserts never probe past the first empty slot
+        while state[index] != self._EMPTY:
+            if state[index] == self._USED and keys[index] == key:
+                self._vals[index] = value
                 return
-            node = node.next
-        new_node = _HashNode(key, value)
-        new_node.next = self._buckets[index]
-        self._buckets[index] = new_node
+            if state[index] == self._TOMB and first_tomb < 0:
+                first_tomb = index
+            index = (index + 1) & mask
+        if first_tomb >= 0:
+            index = first_tomb  # Reuse the earliest tombstone on this run
+        else:
+            self._fill += 1
+        state[index] = self._USED
+        keys[index] = key
+        self._vals[index] = value
         self._size += 1
-        if self._size / self._capacity > self.LOAD_FACTOR_THRESHOLD:
+        if self._fill / self._capacity > self.LOAD_FACTOR_THRESHOLD:
             self._resize()
 
     def __getitem__(self, key):
         """Retrieve value by key. Raises KeyError if not found."""
+        mask = self._mask
+        state = self._state
+        keys = self._keys
         index = self._hash(key)
-        node = self._buckets[index]
-        while node is not None:
-            if node.key == key:
-                return node.value
-            node = node.next
+        while state[index] != self._EMPTY:
+            if state[index] == self._USED and keys[index] == key:
+                return self._vals[index]
+            index = (index + 1) & mask
         raise KeyError(key)
 
     def __contains__(self, key):
         """Check if key exists: key in hashmap"""
+        mask = self._mask
+        state = self._state
+        keys = self._keys
         index = self._hash(key)
-        node = self._buckets[index]
-        while node is not None:
-            if node.key == key:
+        while state[index] != self._EMPTY:
+            if state[index] == self._USED and keys[index] == key:
                 return True
-            node = node.next
+            index = (index + 1) & mask
         return False
 
     def __delitem__(self, key):
         """Remove a key-value pair: del hashmap[key]"""
+        mask = self._mask
+        state = self._state
+        keys = self._keys
         index = self._hash(key)
-        node = self._buckets[index]
-        prev = None
-        while node is not None:
-            if node.key == key:
-                if prev is None:
-                    self._buckets[index] = node.next
-                else:
-                    prev.next = node.next
+        while state[index] != self._EMPTY:
+            if state[index] == self._USED and keys[index] == key:
+                # Leave a tombstone so probe runs through this slot survive
+                state[index] = self._TOMB
+                keys[index] = None
+                self._vals[index] = None
                 self._size -= 1
                 return
-            prev = node
-            node = node.next
+            index = (index + 1) & mask
         raise KeyError(key)
 
     def get(self, key, default=None):
@@ -134,38 +188,28 @@ class HashMap:
     def clear(self):
         """Remove all key-value pairs and reset to initial state."""
         self._capacity = self.INITIAL_CAPACITY
+        self._mask = self._capacity - 1
         self._size = 0
-        self._buckets = [None] * self._capacity
+        self._fill = 0
+        self._keys = [None] * self._capacity
+        self._vals = [None] * self._capacity
+        self._state = bytearray(self._capacity)
 
     def keys(self):
         """Return a list of all keys."""
-        result = []
-        for head in self._buckets:
-            node = head
-            while node is not None:
-                result.append(node.key)
-                node = node.next
-        return result
+        return [self._keys[i] for i, state in enumerate(self._state)
+                if state == self._USED]
 
     def values(self):
         """Return a list of all values."""
-        result = []
-        for head in self._buckets:
-            node = head
-            while node is not None:
-                result.append(node.value)
-                node = node.next
-        return result
+        return [self._vals[i] for i, state in enumerate(self._state)
+                if state == self._USED]
 
     def items(self):
         """Return a list of (key, value) tuples."""
-        result = []
-        for head in self._buckets:
-            node = head
-            while node is not None:
-                result.append((node.key, node.value))
-                node = node.next
-        return result
+        return [(self._keys[i], self._vals[i])
+                for i, state in enumerate(self._state)
+                if state == self._USED]
 
     def __len__(self):
         return self._size
@@ -179,110 +223,329 @@ class HashMap:
 # 2. MAX HEAP — Binary Max-Heap (Array-based)
 # ============================================================================
 
-class MaxHeap:
+def _sift_up(pri, items, index):
     """
-    Binary Max-Heap built from scratch using a flat array.
+    Bubble entry at index UP until the max-heap property holds.
+
+    Standalone function on purpose: the sift loops are the heap's hot
+    path, and a module-level function working on local array references
+    skips the bound-method dispatch and attribute loads that a method
+    pays on every call. Comparisons read the flat priority array only —
+    no tuple indexing or PyObject dereference per compare.
+    """
+    while index > 0:
+        parent = (index - 1) // 2
+        if pri[index] > pri[parent]:
+            pri[index], pri[parent] = pri[parent], pri[index]
+            items[index], items[parent] = items[parent], items[index]
+            index = parent
+        else:
+            break
+
+
+def _sift_down(pri, items, index, size):
+    """Bubble entry at index DOWN until the max-heap property holds."""
+    while True:
+        largest = index
+        left = 2 * index + 1
+        right = 2 * index + 2
+        if left < size and pri[left] > pri[largest]:
+            largest = left
+        if right < size and pri[right] > pri[largest]:
+            largest = right
+        if largest == index:
+            return
+        pri[index], pri[largest] = pri[largest], pri[index]
+        items[index], items[largest] = items[largest], items[index]
+        index = largest
+
+
+class PyMaxHeap:
+    """
+    Binary Max-Heap built from scratch using flat parallel arrays.
+
+    Kept as the pedagogical pure-Python implementation; production code
+    uses MaxHeap below, which delegates to CPython's C-level heapq.
 
     How it works:
-    - Stored as a flat array where for element at index i:
+    - Priorities live in a C double array (array('d')) and the payload
+      objects in a parallel list; slot i of each belongs together
+    - For the element at index i:
       - Parent is at (i-1) // 2
       - Left child is at 2i + 1
       - Right child is at 2i + 2
     - Max-heap property: parent priority >= both children
     - Supports efficient extraction of the N largest elements
 
+    Why parallel arrays instead of (priority, counter, item) tuples:
+    every comparison used to index a tuple and dereference the boxed
+    priority inside it, and every swap shuffled tuple references.
+    Priorities are numeric here (ratings, view counts, scores), so a
+    flat double array gives unboxed 8-byte reads per comparison.
+
     Time Complexity:
     - insert:      O(log n)
     - extract_max: O(log n)
     - nlargest(k): O(n log n + k log n)
     """
 
-    def __init__(self):
-        """Initialize an empty MaxHeap."""
-        self._heap = []   # Stores (priority, order, item) tuples
-        self._counter = 0  # Insertion order for tie-breaking
-
-    def _swap(self, i, j):
-        """Swap two elements in the heap array."""
-        self._heap[i], self._heap[j] = self._heap[j], self._heap[i]
-
-    def _heapify_up(self, index):
-        """Bubble element UP to restore heap property after insertion."""
-        while index > 0:
-            parent = (index - 1) // 2
-            if self._heap[index][0] > self._heap[parent][0]:
-                self._swap(index, parent)
-                index = parent
-            else:
-                break
+    def __init__(self, capacity=0):
+        """
+        Initialize an empty MaxHeap.
 
-    def _heapify_down(self, index):
-        """Bubble element DOWN to restore heap property after extraction."""
-        size = len(self._heap)
-        while True:
-            largest = index
-            left = 2 * index + 1
-            right = 2 * index + 2
-            if left < size and self._heap[left][0] > self._heap[largest][0]:
-                largest = left
-            if right < size and self._heap[right][0] > self._heap[largest][0]:
-                largest = right
-            if largest == index:
-                break
-            self._swap(index, largest)
-            index = largest
+        Args:
+            capacity (int): Optional number of slots to preallocate.
+                When the expected size is known up front this avoids the
+                periodic realloc-and-copy that growing a list append by
+                append triggers, and keeps both arrays in one block.
+        """
+        self._pri = array('d', [0.0] * capacity)  # Priorities (unboxed C doubles)
+        self._items = [None] * capacity           # Payload objects, parallel to _pri
+        self._n = 0                               # Occupied slots (<= capacity)
+
+    @classmethod
+    def heapify(cls, items, key=None):
+        """
+        Build a MaxHeap from a whole collection in O(n).
+
+        Inserting n items one by one costs O(n log n) sift-ups. When the
+        full collection is already in hand, Floyd's bottom-up heapify is
+        cheaper: materialize the entries, then sift DOWN every internal
+        node from the last parent (n//2 - 1) back to the root.
+
+        Args:
+            items: Collection of items to heap
+            key: Optional priority function (defaults to the item itself)
+
+        Returns:
+            MaxHeap: Heap containing all items
+        """
+        heap_obj = cls()
+        items = list(items)
+        if key is None:
+            pri = array('d', items)
+        else:
+            pri = array('d', [key(item) for item in items])
+        heap_obj._pri = pri
+        heap_obj._items = items
+        size = len(items)
+        heap_obj._n = size
+        for i in range(size // 2 - 1, -1, -1):
+            _sift_down(pri, items, i, size)
+        return heap_obj
 
     def insert(self, item, priority=None):
-        """Insert an item with a given priority into the heap."""
+        """Insert an item with a given (numeric) priority into the heap."""
         if priority is None:
             priority = item
-        self._heap.append((priority, self._counter, item))
-        self._counter += 1
-        self._heapify_up(len(self._heap) - 1)
+        pri = self._pri
+        items = self._items
+        n = self._n
+        if n == len(items):
+            # Out of preallocated slots — double capacity in one extend
+            # instead of paying append's incremental reallocations
+            grow = max(1, n)
+            pri.extend([0.0] * grow)
+            items.extend([None] * grow)
+        pri[n] = priority
+        items[n] = item
+        self._n = n + 1
+        _sift_up(pri, items, n)
 
     def extract_max(self):
         """Remove and return the item with the highest priority."""
-        if not self._heap:
+        n = self._n
+        if n == 0:
             raise IndexError("extract_max from an empty heap")
-        self._swap(0, len(self._heap) - 1)
-        _, _, item = self._heap.pop()
-        if self._heap:
-            self._heapify_down(0)
+        pri = self._pri
+        items = self._items
+        last = n - 1
+        item = items[0]
+        pri[0] = pri[last]
+        items[0] = items[last]
+        items[last] = None  # Release the payload reference for GC
+        self._n = last
+        if last:
+            _sift_down(pri, items, 0, last)
         return item
 
     def peek(self):
         """Return the maximum item without removing it."""
-        if not self._heap:
+        if self._n == 0:
             raise IndexError("peek from an empty heap")
-        return self._heap[0][2]
+        return self._items[0]
 
     def size(self):
         """Return the number of elements."""
-        return len(self._heap)
+        return self._n
 
     def is_empty(self):
         """Check if the heap is empty."""
-        return len(self._heap) == 0
+        return self._n == 0
 
     @staticmethod
     def nlargest(n, iterable, key=None):
         """
-        Return the n largest elements from iterable using a MaxHeap.
+        Return the n largest elements from iterable, best first.
         Drop-in replacement for heapq.nlargest().
 
-        Algorithm:
-        1. Insert all items into a MaxHeap with key values as priority
-        2. Extract the maximum element n times
+        Algorithm (bounded min-heap):
+        1. Keep a MIN-heap holding only the best n items seen so far
+        2. Push the first n items; after that, an item only enters the
+           heap if it beats the current minimum (the root), replacing it
+        3. Sort the n survivors descending at the end
+
+        Compared to heaping ALL items and extracting n, this does
+        ~n_total * log(k) comparisons instead of n_total * log(n_total)
+        and holds k items in memory instead of the whole input.
         """
         if key is None:
             key = lambda x: x
-        heap = MaxHeap()
+        if n <= 0:
+            return []
+
+        # When n is a sizeable fraction of the input, the bounded heap
+        # stops rejecting items and its filtering advantage disappears —
+        # an O(total) bottom-up build plus n extractions wins there
+        total = len(iterable) if hasattr(iterable, '__len__') else None
+        if total is not None and n * 4 >= total:
+            heap_obj = PyMaxHeap.heapify(iterable, key)
+            return [heap_obj.extract_max() for _ in range(min(n, total))]
+
+        heap = []  # (priority, counter, item) min-heap of the current top n
+        counter = 0
         for item in iterable:
-            heap.insert(item, key(item))
-        result = []
-        for _ in range(min(n, heap.size())):
-            result.append(heap.extract_max())
-        return result
+            priority = key(item)
+            if len(heap) < n:
+                # Push: append and sift UP (min-heap order)
+                heap.append((priority, counter, item))
+                i = len(heap) - 1
+                while i > 0:
+                    parent = (i - 1) // 2
+                    if heap[i][0] < heap[parent][0]:
+                        heap[i], heap[parent] = heap[parent], heap[i]
+                        i = parent
+                    else:
+                        break
+            elif priority > heap[0][0]:
+                # Replace the smallest survivor and sift DOWN
+                heap[0] = (priority, counter, item)
+                size = len(heap)
+                i = 0
+                while True:
+                    smallest = i
+                    left = 2 * i + 1
+                    right = 2 * i + 2
+                    if left < size and heap[left][0] < heap[smallest][0]:
+                        smallest = left
+                    if right < size and heap[right][0] < heap[smallest][0]:
+                        smallest = right
+                    if smallest == i:
+                        break
+                    heap[i], heap[smallest] = heap[smallest], heap[i]
+                    i = smallest
+            counter += 1
+
+        # k log k final sort is negligible next to the single input pass
+        heap.sort(key=lambda entry: (-entry[0], entry[1]))
+        return [item for _, _, item in heap]
+
+    def __len__(self):
+        return self._n
+
+    def __repr__(self):
+        return f'PyMaxHeap(size={self._n})'
+
+
+class MaxHeap:
+    """
+    Max-Heap delegating to CPython's C-implemented heapq module.
+
+    heapq only provides a MIN-heap, so priorities are stored NEGATED —
+    the canonical workaround. Entries are (-priority, counter, item)
+    tuples; the monotonically increasing counter breaks priority ties
+    before Python ever tries to compare two payload objects (which may
+    not define ordering).
+
+    Same public interface as PyMaxHeap above, which remains the
+    from-scratch teaching implementation. The C sift loops here run an
+    order of magnitude faster than any pure-Python version, so this is
+    the one the managers use.
+
+    Time Complexity:
+    - insert:      O(log n)
+    - extract_max: O(log n)
+    - nlargest(k): O(n log k)
+    """
+
+    def __init__(self, capacity=0):
+        """
+        Initialize an empty MaxHeap.
+
+        Args:
+            capacity (int): Accepted for interface compatibility with
+                PyMaxHeap; heapq manages its backing list itself.
+        """
+        self._heap = []
+        self._counter = 0
+
+    @classmethod
+    def heapify(cls, items, key=None):
+        """
+        Build a MaxHeap from a whole collection in O(n) using
+        heapq.heapify (Floyd's bottom-up build, in C).
+
+        Args:
+            items: Collection of items to heap
+            key: Optional priority function (defaults to the item itself)
+
+        Returns:
+            MaxHeap: Heap containing all items
+        """
+        heap_obj = cls()
+        if key is None:
+            entries = [(-item, i, item) for i, item in enumerate(items)]
+        else:
+            entries = [(-key(item), i, item) for i, item in enumerate(items)]
+        heapq.heapify(entries)
+        heap_obj._heap = entries
+        heap_obj._counter = len(entries)
+        return heap_obj
+
+    def insert(self, item, priority=None):
+        """Insert an item with a given (numeric) priority into the heap."""
+        if priority is None:
+            priority = item
+        heapq.heappush(self._heap, (-priority, self._counter, item))
+        self._counter += 1
+
+    def extract_max(self):
+        """Remove and return the item with the highest priority."""
+        if not self._heap:
+            raise IndexError("extract_max from an empty heap")
+        return heapq.heappop(self._heap)[2]
+
+    def peek(self):
+        """Return the maximum item without removing it."""
+        if not self._heap:
+            raise IndexError("peek from an empty heap")
+        return self._heap[0][2]
+
+    def size(self):
+        """Return the number of elements."""
+        return len(self._heap)
+
+    def is_empty(self):
+        """Check if the heap is empty."""
+        return not self._heap
+
+    @staticmethod
+    def nlargest(n, iterable, key=None):
+        """
+        Return the n largest elements from iterable, best first.
+        Thin wrapper over heapq.nlargest (bounded min-heap, in C).
+        """
+        return heapq.nlargest(n, iterable, key=key)
 
     def __len__(self):
         return len(self._heap)
@@ -292,67 +555,80 @@ class MaxHeap:
 
 
 # ============================================================================
-# 3. QUEUE — Linked-List-based FIFO Queue
+# 3. QUEUE — Ring-Buffer-based FIFO Queue
 # ============================================================================
 
-class _QueueNode:
-    """Internal node for the linked-list-based Queue."""
-    def __init__(self, value):
-        self.value = value
-        self.next = None
-
-
 class Queue:
     """
-    FIFO Queue built from scratch using a singly linked list.
+    FIFO Queue built from scratch on a power-of-two ring buffer.
 
     How it works:
-    - 'front' pointer for dequeue, 'rear' pointer for enqueue
-    - Enqueue appends to rear:  O(1)
-    - Dequeue removes from front: O(1)
-    - No fixed capacity — grows dynamically
-
-    Time Complexity: O(1) for enqueue, dequeue, peek
+    - Elements live in one contiguous list; _head indexes the front,
+      _tail the next free slot, both advanced with a bitmask wrap
+    - Enqueue writes at _tail: O(1), no allocation
+    - Dequeue reads at _head: O(1), no pointer chase
+    - When full, capacity doubles and elements are copied head-first
+
+    The previous linked-list version allocated a node object per
+    enqueue and followed a pointer per dequeue; the ring buffer keeps
+    everything in one flat array, so there's no per-element object
+    overhead and traversal stays cache-friendly.
+
+    Time Complexity: O(1) for enqueue (amortized), dequeue, peek
     Space Complexity: O(n)
     """
 
+    INITIAL_CAPACITY = 8  # Must stay a power of two (wrapping uses & mask)
+
     def __init__(self):
         """Initialize an empty Queue."""
-        self._front = None
-        self._rear = None
+        self._buf = [None] * self.INITIAL_CAPACITY
+        self._mask = self.INITIAL_CAPACITY - 1
+        self._head = 0
+        self._tail = 0
         self._size = 0
 
+    def _grow(self):
+        """Double capacity, copying elements into head-first order."""
+        old_buf = self._buf
+        capacity = len(old_buf) * 2
+        new_buf = [None] * capacity
+        head = self._head
+        mask = self._mask
+        for i in range(self._size):
+            new_buf[i] = old_buf[(head + i) & mask]
+        self._buf = new_buf
+        self._mask = capacity - 1
+        self._head = 0
+        self._tail = self._size
+
     def enqueue(self, value):
         """Add an element to the rear of the queue."""
-        new_node = _QueueNode(value)
-        if self._rear is None:
-            self._front = new_node
-            self._rear = new_node
-        else:
-            self._rear.next = new_node
-            self._rear = new_node
+        if self._size == len(self._buf):
+            self._grow()
+        self._buf[self._tail] = value
+        self._tail = (self._tail + 1) & self._mask
         self._size += 1
 
     def dequeue(self):
         """Remove and return the element at the front."""
-        if self._front is None:
+        if self._size == 0:
             raise IndexError("dequeue from an empty queue")
-        value = self._front.value
-        self._front = self._front.next
-        if self._front is None:
-            self._rear = None
+        value = self._buf[self._head]
+        self._buf[self._head] = None  # Drop the reference for GC
+        self._head = (self._head + 1) & self._mask
         self._size -= 1
         return value
 
     def peek(self):
         """Return the front element without removing it."""
-        if self._front is None:
+        if self._size == 0:
             raise IndexError("peek from an empty queue")
-        return self._front.value
+        return self._buf[self._head]
 
     def is_empty(self):
         """Check if the queue is empty."""
-        return self._front is None
+        return self._size == 0
 
     def append(self, value):
         """Alias for enqueue — compatibility with deque API."""
@@ -360,12 +636,9 @@ class Queue:
 
     def to_list(self):
         """Convert queue contents to a Python list (front to rear)."""
-        result = []
-        node = self._front
-        while node is not None:
-            result.append(node.value)
-            node = node.next
-        return result
+        head = self._head
+        mask = self._mask
+        return [self._buf[(head + i) & mask] for i in range(self._size)]
 
     def __len__(self):
         return self._size
@@ -378,44 +651,109 @@ class Queue:
 # 4. TRIE — Prefix Tree for Autocomplete
 # ============================================================================
 
+# Maps ASCII codepoint -> 0..25 for lowercase letters, -1 for everything else
+_CHARMAP = [-1] * 128
+for _c in range(ord('a'), ord('z') + 1):
+    _CHARMAP[_c] = _c - ord('a')
+del _c
+
+
 class _TrieNode:
     """
-    Internal node for the Trie (Prefix Tree).
-    Each node represents a character and contains:
-    - children: HashMap of child nodes (char -> _TrieNode)
+    Internal node for the radix-compressed Trie (PATRICIA tree).
+    Each node is reached over an edge carrying a LABEL of one or more
+    bytes (unary chains are merged into a single edge) and contains:
+    - label: the compressed edge (bytes) leading into this node
+    - children: fixed 26-slot list for child edges starting with a-z
+    - other: lazily created dict for edges starting outside a-z,
+      keyed by the integer value of the first label byte
     - is_end: whether this node marks the end of a complete word
     - original_word: the original-case version of the word
     - frequency: how many times this word was inserted
+
+    __slots__ removes the per-instance __dict__, and the a-z fast path
+    turns the child lookup into a plain list index instead of a string
+    hash. Children are keyed by the FIRST character of their label, which
+    is unique among siblings by the radix-tree invariant.
     """
-    def __init__(self):
-        self.children = {}        # char -> _TrieNode
+    __slots__ = ('label', 'children', 'other', 'is_end', 'original_word',
+                 'frequency', 'sorted_children', 'max_freq_below')
+
+    def __init__(self, label=b''):
+        self.label = label           # Compressed edge into this node (bytes)
+        self.children = [None] * 26  # a-z fast path (by label's first char)
+        self.other = None            # char -> _TrieNode, for the rest
         self.is_end = False
-        self.original_word = None  # Preserves original casing
+        self.original_word = None    # Preserves original casing
         self.frequency = 0
+        self.sorted_children = None  # Tuple cache, filled by Trie.freeze()
+        self.max_freq_below = 0      # Best frequency in this subtree (freeze)
+
+    def get_child(self, byte):
+        """Return the child whose label starts with byte (an int), or None."""
+        if byte < 128:
+            index = _CHARMAP[byte]
+            if index >= 0:
+                return self.children[index]
+        return self.other.get(byte) if self.other else None
+
+    def set_child(self, byte, node):
+        """Attach a child node under its label's first byte (an int)."""
+        if byte < 128:
+            index = _CHARMAP[byte]
+            if index >= 0:
+                self.children[index] = node
+                return
+        if self.other is None:
+            self.other = {}
+        self.other[byte] = node
+
+    def iter_children(self):
+        """Yield child nodes in stable (a-z, then other) order."""
+        for child in self.children:
+            if child is not None:
+                yield child
+        if self.other:
+            for _, child in sorted(self.other.items()):
+                yield child
 
 
 class Trie:
     """
-    Trie (Prefix Tree) built from scratch for autocomplete functionality.
+    Radix-compressed Trie (PATRICIA tree) built from scratch for
+    autocomplete functionality.
 
     How it works:
-    - Each node represents a single character
-    - Words are stored character-by-character along paths from root
-    - Prefix search traverses to the prefix end, then collects all words below
-    - All lookups are case-insensitive (stored lowercase, original case preserved)
+    - Edges carry whole substrings, not single characters: a chain of
+      nodes with one child each is collapsed into a single edge, so
+      inserting 'photography' into an empty tree allocates ONE node
+      instead of eleven
+    - When two words diverge in the middle of an edge, the edge is split
+      at the longest common prefix and both tails hang off the split node
+    - Prefix search walks edge labels, then collects all words below
+    - All lookups are case-insensitive (stored lowercase, original case
+      preserved on the terminal node)
+
+    Fewer nodes means fewer allocations and far less pointer chasing per
+    query — the traversal cost is dominated by cache misses, not compares.
 
     Time Complexity:
     - insert:          O(L) where L is word length
     - search:          O(L)
     - get_suggestions: O(L + K) where K is number of matching words
 
-    Space Complexity: O(ALPHABET_SIZE * L * N) where N is number of words
+    Space Complexity: O(total characters), with node count proportional
+    to the number of words rather than the number of characters
     """
 
     def __init__(self):
         """Initialize an empty Trie with a root node."""
         self.root = _TrieNode()
         self._word_count = 0
+        self._frozen = False
+        self._ac_goto = None  # Aho-Corasick tables, see build_failure_links()
+        self._ac_fail = None
+        self._ac_out = None
 
     def insert(self, word):
         """
@@ -424,11 +762,48 @@ class Trie:
         """
         if not word or not word.strip():
             return
+        self._frozen = False  # Invalidate freeze() caches
+        self._ac_goto = None  # Invalidate the matching automaton too
+        # Lowercase and encode ONCE: iterating a str walks it one-char
+        # string at a time (an allocation plus a dict probe per step),
+        # while iterating bytes yields plain ints that index _CHARMAP
+        # and the child array directly
+        text = word.lower().encode('utf-8')
+        length = len(text)
         node = self.root
-        for char in word.lower():
-            if char not in node.children:
-                node.children[char] = _TrieNode()
-            node = node.children[char]
+        i = 0
+        while i < length:
+            child = node.get_child(text[i])
+            if child is None:
+                # No outgoing edge — hang the whole remaining tail off
+                # this node as a single compressed edge
+                leaf = _TrieNode(text[i:])
+                node.set_child(text[i], leaf)
+                node = leaf
+                i = length
+                break
+
+            label = child.label
+            # Longest common prefix of the edge label and the remaining word
+            j = 0
+            limit = min(len(label), length - i)
+            while j < limit and label[j] == text[i + j]:
+                j += 1
+
+            if j < len(label):
+                # Word diverges inside this edge: split it at j
+                split = _TrieNode(label[:j])
+                node.set_child(label[0], split)
+                child.label = label[j:]
+                split.set_child(child.label[0], child)
+                node = split
+                i += j
+                # Next loop iteration either ends here (word is a prefix
+                # of the old edge) or adds the word's tail as a new leaf
+            else:
+                # Whole edge matched — descend
+                node = child
+                i += j
 
         if not node.is_end:
             self._word_count += 1
@@ -436,67 +811,250 @@ class Trie:
         node.original_word = word  # Preserve original casing
         node.frequency += 1
 
+    def freeze(self):
+        """
+        Precompute per-node query caches after a bulk build.
+
+        For every node this stores:
+        - sorted_children: the children as a tuple, so suggestion DFS
+          stops rebuilding (and ordering) the child list on every visit
+        - max_freq_below: the best word frequency anywhere in the
+          subtree, letting the bounded-heap DFS skip entire branches
+          that cannot beat its current worst survivor
+
+        The tree is built once every few minutes and queried constantly,
+        so paying this single post-order pass at build time removes the
+        per-node sort/allocation from every autocomplete call. Any later
+        insert() invalidates the caches until freeze() runs again.
+        """
+        # Post-order via a two-phase stack: children complete first so
+        # max_freq_below is ready when the parent is finalized
+        stack = [(self.root, False)]
+        while stack:
+            node, ready = stack.pop()
+            if ready:
+                children = tuple(node.iter_children())
+                node.sorted_children = children
+                best = node.frequency if node.is_end else 0
+                for child in children:
+                    if child.max_freq_below > best:
+                        best = child.max_freq_below
+                node.max_freq_below = best
+            else:
+                stack.append((node, True))
+                for child in node.iter_children():
+                    stack.append((child, False))
+        self._frozen = True
+
+    def _walk(self, text):
+        """
+        Follow edge labels for text (a bytes object, already lowercased)
+        and return (node, matched) where matched is how many bytes of
+        the final node's label were consumed (a lookup may stop
+        mid-edge). Returns (None, 0) when text leaves the tree.
+        """
+        node = self.root
+        i = 0
+        length = len(text)
+        while i < length:
+            node = node.get_child(text[i])
+            if node is None:
+                return None, 0
+            label = node.label
+            k = min(len(label), length - i)
+            if text[i:i + k] != label[:k]:
+                return None, 0
+            i += k
+        return node, k
+
     def search(self, word):
         """Check if an exact word exists in the Trie. Returns True/False."""
         if not word:
             return False
-        node = self.root
-        for char in word.lower():
-            if char not in node.children:
-                return False
-            node = node.children[char]
-        return node.is_end
+        node, matched = self._walk(word.lower().encode('utf-8'))
+        # Exact match must consume the final edge completely
+        return node is not None and matched == len(node.label) and node.is_end
 
     def starts_with(self, prefix):
         """Check if any word in the Trie starts with the given prefix."""
         if not prefix:
             return False
-        node = self.root
-        for char in prefix.lower():
-            if char not in node.children:
-                return False
-            node = node.children[char]
-        return True
-
-    def _collect_words(self, node, results, limit):
-        """DFS to collect all complete words below a given node."""
-        if len(results) >= limit:
-            return
-        if node.is_end:
-            results.append((node.original_word, node.frequency))
-        for char in sorted(node.children.keys()):
-            if len(results) >= limit:
-                return
-            self._collect_words(node.children[char], results, limit)
+        node, _ = self._walk(prefix.lower().encode('utf-8'))
+        return node is not None
+
+    def _collect_words(self, node, keys, words, limit):
+        """
+        DFS keeping only the best 'limit' words in a bounded heap.
+
+        keys/words form a parallel-array heap ordered so the ROOT is the
+        WORST surviving candidate (key = (-frequency, len(word)), reusing
+        the max-heap sift functions). A word is pushed while the heap has
+        room; afterwards it only replaces the root when it beats it, so
+        memory stays O(limit) no matter how big the prefix subtree is.
+
+        The walk itself is iterative over an explicit stack: recursion
+        paid a Python frame per node and risked the recursion limit on
+        deep subtrees, while a list-backed stack is a pop and an extend.
+        """
+        frozen = self._frozen
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.is_end:
+                key = (-node.frequency, len(node.original_word))
+                if len(words) < limit:
+                    keys.append(key)
+                    words.append(node.original_word)
+                    _sift_up(keys, words, len(words) - 1)
+                elif key < keys[0]:
+                    keys[0] = key
+                    words[0] = node.original_word
+                    _sift_down(keys, words, 0, len(words))
+            # Frozen trees reuse the cached child tuple instead of
+            # rebuilding the ordered list on every visit
+            if frozen:
+                children = node.sorted_children
+            else:
+                children = list(node.iter_children())
+            # Reversed so pop() visits children in their natural order
+            if frozen and len(words) == limit:
+                # Prune: skip subtrees whose best frequency can't beat
+                # the worst survivor (-keys[0][0]) already in the heap
+                min_freq = -keys[0][0]
+                for child in reversed(children):
+                    if child.max_freq_below >= min_freq:
+                        stack.append(child)
+            else:
+                for child in reversed(children):
+                    stack.append(child)
 
     def get_suggestions(self, prefix, limit=10):
         """
         Get autocomplete suggestions for a given prefix.
 
         Algorithm:
-        1. Navigate to the node representing the last char of prefix
-        2. DFS from that node to collect all complete words
-        3. Sort by frequency (most popular first), then by length
-        4. Return top 'limit' results with original casing
+        1. Walk edge labels to the node covering the prefix (stopping
+           mid-edge is fine — everything below still matches)
+        2. DFS from that node, keeping only the best 'limit' words in a
+           bounded heap (highest frequency, then shortest word)
+        3. Sort the few survivors for the final ordering
+
+        The old version collected limit*3 candidates and full-sorted
+        them — O(m log m) over work that was mostly thrown away. The
+        bounded heap does O(m log limit) with limit entries in memory.
 
         Returns:
             list: Suggestion strings matching the prefix
         """
         if not prefix:
             return []
-        node = self.root
-        for char in prefix.lower():
-            if char not in node.children:
-                return []
-            node = node.children[char]
+        node, _ = self._walk(prefix.lower().encode('utf-8'))
+        if node is None:
+            return []
 
-        results = []
-        self._collect_words(node, results, limit * 3)
+        keys = []
+        words = []
+        self._collect_words(node, keys, words, limit)
+
+        # Tiny final sort: best (highest frequency, shortest word) first
+        return [word for _, word in sorted(zip(keys, words))]
+
+    def _iter_words(self):
+        """Yield (lowercase_bytes, node) for every word stored in the tree."""
+        stack = [(self.root, b'')]
+        while stack:
+            node, prefix = stack.pop()
+            path = prefix + node.label
+            if node.is_end:
+                yield path, node
+            for child in node.iter_children():
+                stack.append((child, path))
+
+    def build_failure_links(self):
+        """
+        Build an Aho-Corasick automaton over the stored words for
+        multi-pattern matching (see find_all).
+
+        A plain walk restarts from the root after every mismatch, paying
+        O(L) per starting position of the haystack. Failure links jump a
+        mismatch to the longest proper suffix of the current path that
+        is still a valid prefix in the tree, so one pass over the
+        haystack finds every occurrence of every word.
+
+        The compressed edges are expanded into flat byte-level tables
+        here (goto dicts, fail links, per-state output lists) computed
+        with the classic BFS; any later insert() invalidates them.
+        Run this once after a bulk build, like freeze().
+        """
+        goto = [{}]
+        fail = [0]
+        out = [[]]
+        for word_bytes, node in self._iter_words():
+            state = 0
+            for b in word_bytes:
+                nxt = goto[state].get(b)
+                if nxt is None:
+                    goto.append({})
+                    fail.append(0)
+                    out.append([])
+                    nxt = len(goto) - 1
+                    goto[state][b] = nxt
+                state = nxt
+            # Byte length travels with the word so find_all can report
+            # where each match started
+            out[state].append((len(word_bytes), node.original_word))
+
+        # BFS: a node's failure target is found by walking its parent's
+        # failure chain until some state has a matching outgoing edge
+        queue = deque(goto[0].values())  # Depth 1 fails to the root
+        while queue:
+            state = queue.popleft()
+            for b, child in goto[state].items():
+                queue.append(child)
+                f = fail[state]
+                while f and b not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(b, 0)
+                fail[child] = target if target != child else 0
+                # A match ending here also ends every word that is a
+                # suffix of it — inherit the failure target's output
+                out[child].extend(out[fail[child]])
+
+        self._ac_goto = goto
+        self._ac_fail = fail
+        self._ac_out = out
+
+    def find_all(self, haystack):
+        """
+        Find every stored word occurring anywhere inside haystack.
 
-        # Sort by frequency (descending), then by word length (shorter first)
-        results.sort(key=lambda x: (-x[1], len(x[0])))
+        Single O(|haystack|) scan using the failure links (built lazily
+        if build_failure_links has not run since the last insert).
+        Matching is case-insensitive, like the rest of the tree.
 
-        return [word for word, freq in results[:limit]]
+        Returns:
+            list: (start, original_word) tuples, ordered by match end;
+                  start is a byte offset into the UTF-8 encoding of the
+                  lowercased haystack (equal to the character offset for
+                  ASCII text)
+        """
+        if not haystack or self._word_count == 0:
+            return []
+        if self._ac_goto is None:
+            self.build_failure_links()
+        goto = self._ac_goto
+        fail = self._ac_fail
+        out = self._ac_out
+
+        matches = []
+        state = 0
+        for i, b in enumerate(haystack.lower().encode('utf-8')):
+            while state and b not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(b, 0)
+            for length, word in out[state]:
+                matches.append((i - length + 1, word))
+        return matches
 
     def __len__(self):
         return self._word_count
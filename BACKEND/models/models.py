@@ -72,6 +72,12 @@ class User(UserMixin, db.Model):
     # Wallet balance - stored in DB so it persists across redeploys
     wallet_balance = db.Column(db.Float, default=0.0, nullable=False)
 
+    # Denormalized provider rating, kept in sync by the Review event
+    # listeners at the bottom of this module — profile reads vastly
+    # outnumber review writes, so the aggregate is paid on write
+    avg_rating = db.Column(db.Float, default=0.0)
+    rating_count = db.Column(db.Integer, default=0)
+
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -168,31 +174,26 @@ class User(UserMixin, db.Model):
     
     def get_average_rating(self):
         """
-        Calculate average rating for user's services
-        
-        Algorithm:
-        1. Get all services by this user
-        2. For each service, get its average rating
-        3. Calculate overall average
-        
+        Get average rating for user's services
+
+        Reads the denormalized avg_rating column (average of each
+        active service's own average, unreviewed services counting as
+        0 — same formula as before), which the Review event listeners
+        keep current. A column read instead of an aggregate scan.
+
         Returns:
             float: Average rating (0.0 to 5.0)
         """
-        services = self.get_services()
-        if not services:
-            return 0.0
-        
-        total_rating = sum(service.get_average_rating() for service in services)
-        return round(total_rating / len(services), 1)
-    
+        return round(float(self.avg_rating or 0.0), 1)
+
     def get_total_reviews(self):
         """
-        Get total number of reviews across all services
-        
+        Get total number of reviews across all active services
+
         Returns:
-            int: Total review count
+            int: Total review count (denormalized, see avg_rating)
         """
-        return sum(service.reviews.count() for service in self.get_services())
+        return int(self.rating_count or 0)
     
     def is_admin(self):
         """
@@ -420,7 +421,21 @@ class Service(db.Model):
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
+
+    # Partial composite indexes for the browse() hot path. Every browse
+    # filters on is_active AND is_approved, so only live rows are worth
+    # indexing; (category_id, price) serves the price sorts and
+    # (category_id, created_at DESC) the default newest-first sort as
+    # index range scans instead of table scans
+    __table_args__ = (
+        db.Index('ix_service_browse_price', 'category_id', 'price',
+                 postgresql_where=db.text('is_active AND is_approved'),
+                 sqlite_where=db.text('is_active AND is_approved')),
+        db.Index('ix_service_browse_recent', 'category_id', db.text('created_at DESC'),
+                 postgresql_where=db.text('is_active AND is_approved'),
+                 sqlite_where=db.text('is_active AND is_approved')),
+    )
+
     # Relationships
     # One service can have many reviews
     reviews = db.relationship('Review', backref='service', lazy='dynamic',
@@ -433,32 +448,93 @@ class Service(db.Model):
     favorited_by = db.relationship('Favorite', backref='service', lazy='dynamic',
                                    cascade='all, delete-orphan')
     
+    @staticmethod
+    def search_clause(query):
+        """
+        Build the WHERE clause for a free-text service search.
+
+        On PostgreSQL this probes the GIN-indexed search_vector column
+        (maintained by a trigger over title/description/tags — see
+        migrate_db.py) with plainto_tsquery, an indexed full-text match.
+        On SQLite (dev/tests) it falls back to the triple ILIKE, which
+        cannot use an index but keeps behaviour identical.
+
+        Args:
+            query (str): Raw search text from the user
+
+        Returns:
+            SQLAlchemy clause usable in .filter()
+        """
+        if db.engine.dialect.name == 'postgresql':
+            return db.text(
+                "services.search_vector @@ plainto_tsquery('english', :fts_q)"
+            ).bindparams(fts_q=query)
+        search_term = f'%{query.lower()}%'
+        return db.or_(
+            Service.title.ilike(search_term),
+            Service.description.ilike(search_term),
+            Service.tags.ilike(search_term)
+        )
+
+    @staticmethod
+    def preload_rating_stats(services):
+        """
+        Batch-load rating stats for many services in ONE grouped query.
+
+        Templates call get_average_rating()/get_review_count() on every
+        service card, and each call queries the reviews table — the
+        classic N+1 pattern on list pages. This computes AVG and COUNT
+        for all the given services at once and caches the result on each
+        instance, so the per-card calls become attribute reads.
+
+        Args:
+            services (list): Service objects to annotate
+        """
+        services = [s for s in services if s is not None]
+        if not services:
+            return
+        from sqlalchemy import func
+        rows = db.session.query(
+            Review.service_id,
+            func.avg(Review.rating),
+            func.count(Review.id)
+        ).filter(
+            Review.service_id.in_([s.id for s in services])
+        ).group_by(Review.service_id).all()
+        stats = {sid: (round(float(avg), 1), count) for sid, avg, count in rows}
+        for service in services:
+            service._rating_stats = stats.get(service.id, (0.0, 0))
+
     def get_average_rating(self):
         """
         Calculate average rating for this service
-        
-        Algorithm:
-        1. Get all reviews for this service
-        2. Calculate sum of ratings
-        3. Divide by count
-        
+
+        Uses the batch-loaded cache when preload_rating_stats() has run;
+        otherwise falls back to querying this service's reviews.
+
         Returns:
             float: Average rating (0.0 to 5.0)
         """
+        cached = getattr(self, '_rating_stats', None)
+        if cached is not None:
+            return cached[0]
         reviews = self.reviews.all()
         if not reviews:
             return 0.0
-        
+
         total_rating = sum(review.rating for review in reviews)
         return round(total_rating / len(reviews), 1)
-    
+
     def get_review_count(self):
         """
         Get total number of reviews
-        
+
         Returns:
             int: Review count
         """
+        cached = getattr(self, '_rating_stats', None)
+        if cached is not None:
+            return cached[1]
         return self.reviews.count()
     
     def get_tags_list(self):
@@ -554,9 +630,14 @@ class Review(db.Model):
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    # Composite index for faster queries
+    # Composite index for faster queries; the rating index lets the
+    # homepage satisfaction aggregate count 4-5 star reviews without
+    # scanning the whole table; (service_id, rating) makes the per-service
+    # rating histogram GROUP BY an index-only scan
     __table_args__ = (
         db.Index('idx_service_user', 'service_id', 'user_id'),
+        db.Index('ix_review_rating', 'rating'),
+        db.Index('idx_review_service_rating', 'service_id', 'rating'),
     )
     
     def validate_rating(self):
@@ -617,6 +698,16 @@ class Order(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     completed_at = db.Column(db.DateTime)
+
+    # Composite indexes for the per-user order scans: buyer/seller
+    # listings filter on one user column and sort by created_at, and
+    # earnings aggregations filter seller + status over completed_at —
+    # these turn both into index range scans as the table grows
+    __table_args__ = (
+        db.Index('ix_orders_buyer_created', 'buyer_id', 'created_at'),
+        db.Index('ix_orders_seller_created', 'seller_id', 'created_at'),
+        db.Index('ix_orders_seller_completed', 'seller_id', 'status', 'completed_at'),
+    )
     
     def update_status(self, new_status):
         """
@@ -697,9 +788,16 @@ class Notification(db.Model):
     title = db.Column(db.String(100), nullable=False)
     message = db.Column(db.Text, nullable=False)
     link = db.Column(db.String(255))
+    # Real column for the related order (when applicable) so rate-limit
+    # lookups can use an index seek instead of a LIKE scan on link
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=True)
     is_read = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
+
+    __table_args__ = (
+        db.Index('idx_notif_rate_limit', 'user_id', 'order_id', 'is_read', 'created_at'),
+    )
+
     def __repr__(self):
         return f'<Notification {self.title}>'
 
@@ -753,6 +851,13 @@ class AvailabilitySlot(db.Model):
     """
     __tablename__ = 'availability_slots'
 
+    # One provider's slots over a time window (today's bookings, the
+    # availability manager) is the only access pattern — a composite
+    # index makes it a single ordered range scan
+    __table_args__ = (
+        db.Index('ix_slot_provider_start', 'provider_id', 'start_time'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     provider_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     
@@ -809,6 +914,12 @@ class Testimonial(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # The homepage aggregate filters by is_active and splits by rating;
+    # this composite index serves that query without a table scan
+    __table_args__ = (
+        db.Index('ix_testimonial_active_rating', 'is_active', 'rating'),
+    )
+
     # Establish relationship for easier access to user info (avatar, name)
     user = db.relationship('User', backref=db.backref('testimonials', lazy=True))
 
@@ -828,6 +939,13 @@ class Certificate(db.Model):
 
     __tablename__ = 'certificates'
 
+    # my_certificates / issued_certificates filter one user and sort by
+    # issue date; composite indexes make both an index range scan
+    __table_args__ = (
+        db.Index('ix_cert_student_issued', 'student_id', 'issued_at'),
+        db.Index('ix_cert_provider_issued', 'provider_id', 'issued_at'),
+    )
+
     id           = db.Column(db.Integer, primary_key=True)
     cert_id      = db.Column(db.String(20), unique=True, nullable=False)
     order_id     = db.Column(db.Integer, db.ForeignKey('orders.id'), unique=True, nullable=False)
@@ -846,6 +964,77 @@ class Certificate(db.Model):
         return f'<Certificate {self.cert_id} Order {self.order_id}>'
 
 
+class UserDailyStats(db.Model):
+    """
+    UserDailyStats Model - Materialized daily order totals per user.
+
+    The dashboard trend charts used to re-aggregate the whole orders
+    table (GROUP BY date) on every page load. This rollup keeps one row
+    per (user, role, day), updated as orders are created and completed,
+    so the charts become an indexed range scan over a handful of rows.
+
+    DBMS Concepts:
+    - Materialized aggregate (rollup) table
+    - Composite UNIQUE constraint: one row per (user_id, role, date)
+    """
+    __tablename__ = 'user_daily_stats'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    role = db.Column(db.String(10), nullable=False)  # 'buyer' or 'seller'
+    date = db.Column(db.Date, nullable=False)
+    total_amount = db.Column(db.Float, default=0.0, nullable=False)
+    order_count = db.Column(db.Integer, default=0, nullable=False)
+
+    # The unique index doubles as the dashboard lookup index
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'role', 'date', name='uq_user_daily_stats'),
+    )
+
+    @classmethod
+    def record(cls, user_id, role, day, amount):
+        """
+        Add one order worth `amount` to a user's rollup row for `day`.
+
+        Tries an in-place UPDATE first (the common case), inserting the
+        row only when the day is new; a concurrent insert racing on the
+        unique constraint falls back to the UPDATE path.
+
+        Args:
+            user_id (int): User the stat belongs to
+            role (str): 'buyer' or 'seller'
+            day (date): Calendar day of the order event
+            amount (float): Order total to add
+        """
+        from sqlalchemy.exc import IntegrityError
+
+        delta = {
+            cls.total_amount: cls.total_amount + float(amount),
+            cls.order_count: cls.order_count + 1,
+        }
+        updated = cls.query.filter_by(
+            user_id=user_id, role=role, date=day
+        ).update(delta, synchronize_session=False)
+        if updated:
+            db.session.commit()
+            return
+
+        db.session.add(cls(user_id=user_id, role=role, date=day,
+                           total_amount=float(amount), order_count=1))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another request inserted this day's row first — add to it
+            db.session.rollback()
+            cls.query.filter_by(
+                user_id=user_id, role=role, date=day
+            ).update(delta, synchronize_session=False)
+            db.session.commit()
+
+    def __repr__(self):
+        return f'<UserDailyStats user {self.user_id} {self.role} {self.date}>'
+
+
 class ContactMessage(db.Model):
     """
     ContactMessage Model - Stores messages from the contact form
@@ -891,3 +1080,79 @@ class HiddenChat(db.Model):
 
     def __repr__(self):
         return f'<HiddenChat User {self.user_id} - Order {self.order_id}>'
+
+
+# ============================================================================
+# EVENT LISTENERS
+# ============================================================================
+
+from sqlalchemy import event, func as _sa_func, select as _sa_select
+
+
+def refresh_provider_rating(provider_id, connection=None):
+    """
+    Recompute User.avg_rating / rating_count for one provider.
+
+    The Review event listeners below call this on every review write,
+    but paths that bypass ORM events — bulk Review deletes, toggling a
+    service's is_active — must invoke it explicitly, inside the same
+    transaction as their own writes, or the denormalized columns go
+    stale until the next ordinary review write.
+
+    Args:
+        provider_id: User id whose aggregate to rebuild
+        connection: Core connection to run on (defaults to the current
+            session's, so the update rides in the caller's transaction)
+    """
+    if connection is None:
+        connection = db.session.connection()
+
+    svc = Service.__table__
+    rev = Review.__table__
+    usr = User.__table__
+
+    per_service = (
+        _sa_select(
+            _sa_func.coalesce(_sa_func.avg(rev.c.rating), 0.0).label('avg_r'),
+            _sa_func.count(rev.c.id).label('cnt')
+        )
+        .select_from(svc.outerjoin(rev, rev.c.service_id == svc.c.id))
+        .where(svc.c.user_id == provider_id, svc.c.is_active == True)
+        .group_by(svc.c.id)
+    ).subquery()
+
+    row = connection.execute(
+        _sa_select(
+            _sa_func.coalesce(_sa_func.avg(per_service.c.avg_r), 0.0),
+            _sa_func.coalesce(_sa_func.sum(per_service.c.cnt), 0)
+        )
+    ).one()
+
+    connection.execute(
+        usr.update().where(usr.c.id == provider_id).values(
+            avg_rating=float(row[0]), rating_count=int(row[1]))
+    )
+
+
+@event.listens_for(Review, 'after_insert')
+@event.listens_for(Review, 'after_update')
+@event.listens_for(Review, 'after_delete')
+def _refresh_provider_rating(mapper, connection, target):
+    """
+    Keep User.avg_rating / rating_count in sync with review writes.
+
+    Recomputes the provider's aggregate (average of per-service
+    averages over active services, matching get_average_rating's old
+    on-read formula exactly) in one statement. Review writes are rare
+    next to profile reads, so paying the aggregate here turns every
+    profile render into a plain column read.
+    """
+    svc = Service.__table__
+
+    provider_id = connection.execute(
+        _sa_select(svc.c.user_id).where(svc.c.id == target.service_id)
+    ).scalar()
+    if provider_id is None:
+        return
+
+    refresh_provider_rating(provider_id, connection)
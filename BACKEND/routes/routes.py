@@ -16,32 +16,329 @@ Author: SkillVerse Team
 Purpose: Handle HTTP requests and responses
 """
 
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, make_response
 from datetime import datetime, timezone, timedelta
 from flask_login import login_user, logout_user, login_required, current_user
 from functools import wraps
-from models import (db, User, Service, Category, Review, Order, Favorite, 
-                   Notification, Message, ProjectShowcase, AvailabilitySlot, 
-                   Booking, Testimonial, ContactMessage, Certificate, Transaction)
+from concurrent.futures import ThreadPoolExecutor
+from models import (db, User, Service, Category, Review, Order, Favorite,
+                   Notification, Message, ProjectShowcase, AvailabilitySlot,
+                   Booking, Testimonial, ContactMessage, Certificate, Transaction,
+                   UserDailyStats)
 from managers import (service_manager, user_manager, search_engine, 
                      review_system, order_manager, category_manager, notification_manager, chat_manager, availability_manager)
 from certificate_generator import generate_certificate, generate_cert_id
+from email_utils import (send_welcome_email, send_order_placed_emails,
+                         send_order_accepted_emails, send_order_completed_emails,
+                         send_order_rejected_email, send_booking_confirmation_email,
+                         send_booking_rejection_email, send_async_email,
+                         submit_email, _get_default_sender)
+from payment_system import (PaymentGateway, WalletManager, InvoiceGenerator,
+                            TransactionFilter, CustomException,
+                            InsufficientBalanceException,
+                            TransactionNotFoundException)
+
+# Shared payment objects — both classes are stateless between calls
+# (balances live on the User row, transactions in their table), so one
+# instance per process replaces a construction (and the gateway's
+# storage-path probe) in every wallet/order handler
+_gateway = PaymentGateway()
+_wallet_mgr = WalletManager(payment_gateway=_gateway)
+_invoice_gen = InvoiceGenerator()
 
 from werkzeug.utils import secure_filename
 import os
+import shutil
+import threading
+import time
 from flask import current_app
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 import io
 import base64
-from sqlalchemy import func
-import numpy as np
+
+# SIMD-accelerated base64 (SSSE3/AVX2) — several times faster than the
+# stdlib on the ~20KB PNG buffers the dashboard charts produce
+try:
+    import pybase64
+except ImportError:  # optional; stdlib fallback keeps dev setups working
+    pybase64 = None
+
+
+def _b64encode_png(data):
+    """base64-encode PNG bytes, using pybase64 when installed."""
+    if pybase64 is not None:
+        return pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode()
+from sqlalchemy import case, func
+from sqlalchemy.orm import joinedload
 import textwrap
 
+# matplotlib costs hundreds of ms and ~40MB RSS to import, but only the
+# dashboard chart routes use it — defer loading until the first plot so
+# every other request (and worker startup) skips it entirely
+_plt = None
+
+
+def _get_plt():
+    """Import matplotlib (Agg backend) on first use and return pyplot."""
+    global _plt
+    if _plt is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        _plt = plt
+    return _plt
+
+# Dashboard chart cache
+# Rendering a matplotlib figure to PNG is the dominant cost of the
+# dashboard views — each savefig is tens to hundreds of ms of pure CPU.
+# The PNG only changes when the data behind it changes, so the encoded
+# string is cached keyed by (user, chart kind, data fingerprint): the
+# cheap aggregate query still runs every request, and a changed result
+# produces a new fingerprint, so hits are always current. The TTL just
+# bounds memory for users who stop visiting.
+_CHART_CACHE_TTL = 300  # seconds
+_chart_cache = {}       # (user_id, kind, fingerprint) -> (b64 str, expires)
+
+# Shared pie-slice palette for every dashboard chart
+_CHART_COLORS = ['#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0', '#9966FF',
+                 '#FF9F40', '#C9CBCF', '#7CFC00', '#FF1493', '#00CED1']
+
+
+# Two workers: a dashboard renders at most two charts, and savefig
+# releases the GIL inside libpng's C compression, so both renders
+# genuinely overlap instead of running back to back
+_chart_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='chart')
+
+
+def _chart_cache_lookup(user_id, kind, payload):
+    """Return (cache key, cached PNG or None) for a chart request."""
+    import hashlib
+    digest = hashlib.blake2b(digest_size=16)
+    for part in payload:
+        if hasattr(part, 'tobytes'):
+            # ndarray: repr() elides large arrays, tobytes() is exact
+            digest.update(part.tobytes())
+        else:
+            digest.update(repr(part).encode())
+    key = (user_id, kind, digest.hexdigest())
+    hit = _chart_cache.get(key)
+    if hit and hit[1] > time.time():
+        return key, hit[0]
+    return key, None
+
+
+def _chart_cache_store(key, encoded):
+    """Store a rendered chart, pruning expired entries when the cache grows."""
+    now = time.time()
+    # Drop expired entries once in a while so the cache can't grow
+    # without bound across many users
+    if len(_chart_cache) > 512:
+        for stale in [k for k, (_, exp) in _chart_cache.items() if exp <= now]:
+            _chart_cache.pop(stale, None)
+    _chart_cache[key] = (encoded, now + _CHART_CACHE_TTL)
+
+
+def _cached_chart(user_id, kind, payload, render_fn):
+    """
+    Return the base64 PNG for a chart, rendering only on cache miss.
+
+    Args:
+        user_id (int): Owner of the dashboard
+        kind (str): Chart identifier, e.g. 'spending' or 'earnings'
+        payload: The plotted data (hashed into the cache key)
+        render_fn (callable): Zero-arg function producing the base64 PNG
+
+    Returns:
+        str: base64-encoded PNG image
+    """
+    key, hit = _chart_cache_lookup(user_id, kind, payload)
+    if hit is not None:
+        return hit
+    encoded = render_fn()
+    _chart_cache_store(key, encoded)
+    return encoded
+
+
+def _cached_charts(user_id, specs):
+    """
+    Resolve several dashboard charts at once, rendering misses in parallel.
+
+    Cached charts are returned straight from the cache; only the misses
+    are submitted to the render pool, so the common two-chart dashboard
+    pays one savefig of wall time instead of two.
+
+    Args:
+        user_id (int): Owner of the dashboard
+        specs (list): (kind, payload, render_fn) tuples, one per chart
+
+    Returns:
+        list: base64-encoded PNGs, in the same order as specs
+    """
+    results = [None] * len(specs)
+    pending = {}
+    for i, (kind, payload, render_fn) in enumerate(specs):
+        key, hit = _chart_cache_lookup(user_id, kind, payload)
+        if hit is not None:
+            results[i] = hit
+        else:
+            pending[i] = (key, _chart_executor.submit(render_fn))
+    for i, (key, future) in pending.items():
+        encoded = future.result()
+        _chart_cache_store(key, encoded)
+        results[i] = encoded
+    return results
+
+
+# Reusable Figures, one per chart kind per thread. Building a Figure +
+# canvas + transform stack from scratch costs tens of ms per request;
+# the OO API lets us keep them alive and just clear the axes between
+# renders. threading.local keeps concurrent request threads from
+# drawing on each other's canvas (pyplot's global state would not).
+_chart_figs = threading.local()
+
+
+def _get_chart_fig(kind, figsize):
+    """Return this thread's reusable Figure for a chart kind."""
+    figs = getattr(_chart_figs, 'figs', None)
+    if figs is None:
+        figs = _chart_figs.figs = {}
+    fig = figs.get(kind)
+    if fig is None:
+        _get_plt()  # ensure matplotlib is imported with the Agg backend
+        from matplotlib.figure import Figure
+        fig = figs[kind] = Figure(figsize=figsize)
+    return fig
+
+
+def _render_line_chart_png(dates, values, title, ylabel, color):
+    """Render the dashboard line chart (line plot as per PDF) to base64 PNG."""
+    fig = _get_chart_fig('line', (8, 4))
+    ax = fig.add_subplot(111)
+    ax.plot(dates, values, color=color, marker='o', linestyle='-', linewidth=2)
+    ax.set_title(title, fontsize=12, fontweight='bold')
+    ax.set_xlabel('Date')
+    ax.set_ylabel(ylabel)
+    ax.grid(True)
+    ax.tick_params(axis='x', rotation=45)
+    fig.tight_layout()
+
+    buf = io.BytesIO()
+    # 72 dpi is plenty for an embedded dashboard image, bbox_inches=None
+    # skips the extra tight-bounds pass (tight_layout above already fits
+    # the labels), and compress_level=1 trades a slightly larger PNG for
+    # much cheaper encoding
+    fig.savefig(buf, format='png', dpi=72, bbox_inches=None, pad_inches=0,
+                facecolor='white', pil_kwargs={'optimize': False, 'compress_level': 1})
+    fig.clear()  # leave the Figure empty for the next render on this thread
+    return _b64encode_png(buf.getvalue())
+
+
+def _render_pie_chart_png(sizes, labels, title):
+    """Render the dashboard pie chart (pie plot as per PDF) to base64 PNG."""
+    fig = _get_chart_fig('pie', (8, 5))
+    ax = fig.add_subplot(111)
+    ax.pie(sizes, labels=labels, autopct='%1.1f%%',
+           colors=_CHART_COLORS[:len(sizes)], startangle=90)
+    ax.set_title(title, fontsize=12, fontweight='bold')
+    ax.axis('equal')
+    fig.tight_layout()
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=72, bbox_inches=None, pad_inches=0,
+                facecolor='white', pil_kwargs={'optimize': False, 'compress_level': 1})
+    fig.clear()
+    return _b64encode_png(buf.getvalue())
+
+
+def _render_growth_chart_png(dates, values):
+    """Render the admin user-growth chart (filled line) to base64 PNG."""
+    fig = _get_chart_fig('growth', (10, 5))
+    ax = fig.add_subplot(111)
+    ax.plot(dates, values, color='#198754', linewidth=3, marker='o', markersize=8)
+    ax.fill_between(dates, values, color='#198754', alpha=0.15)
+    ax.set_title('User Growth (New Signups)', fontsize=14, fontweight='bold', pad=15)
+    ax.set_ylabel('New Users', fontsize=12)
+    ax.tick_params(axis='x', rotation=45, labelsize=10)
+    ax.tick_params(axis='y', labelsize=10)
+    fig.tight_layout()
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=72, bbox_inches=None, pad_inches=0,
+                facecolor='white', pil_kwargs={'optimize': False, 'compress_level': 1})
+    fig.clear()
+    return _b64encode_png(buf.getvalue())
+
+
+def _render_barh_chart_png(names, counts, title, xlabel):
+    """Render a horizontal bar chart (admin category ranking) to base64 PNG."""
+    import numpy as np
+    plt = _get_plt()
+    fig = _get_chart_fig('barh', (10, 5))
+    ax = fig.add_subplot(111)
+    ax.barh(names, counts, color=plt.cm.Paired(np.arange(len(names))))
+    ax.set_title(title, fontsize=14, fontweight='bold', pad=15)
+    ax.set_xlabel(xlabel, fontsize=12)
+    ax.tick_params(labelsize=10)
+    fig.tight_layout()
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=72, bbox_inches=None, pad_inches=0,
+                facecolor='white', pil_kwargs={'optimize': False, 'compress_level': 1})
+    fig.clear()
+    return _b64encode_png(buf.getvalue())
+
+
+def _chart_series(rows, empty_label='No Data'):
+    """
+    Split (date, amount) rollup rows into chart labels and values.
+
+    The value column is converted in one C-level pass to a float64
+    ndarray that matplotlib plots without copying, instead of a float()
+    call per row. Labels keep the MM-DD slice of the ISO date.
+
+    Args:
+        rows (list): (date, amount) tuples from the daily rollup query
+        empty_label (str): Placeholder x label when there is no data
+
+    Returns:
+        tuple: (labels list, values ndarray-or-list)
+    """
+    if not rows:
+        return [empty_label], [0]
+    import numpy as np
+    labels = [str(r[0])[-5:] for r in rows]  # MM-DD format
+    values = np.fromiter((r[1] for r in rows), dtype=np.float64, count=len(rows))
+    return labels, values
+
+
+# Admin account id, resolved once per process — every platform-fee
+# wallet movement targets the same row, so there is no point running
+# the unindexed user_type filter per order action
+_admin_user_id = None
+
+
+def _get_admin_user_id():
+    """Return the admin user's id, looked up once and then cached."""
+    global _admin_user_id
+    if _admin_user_id is None:
+        admin = User.query.filter_by(user_type='admin').first()
+        if admin:
+            _admin_user_id = admin.id
+    return _admin_user_id
+
+
+# Upload folders already created by this process — os.makedirs with
+# exist_ok still stats every path component, so remember the answer
+_created_upload_dirs = set()
+
+
 def save_uploaded_file(file_storage, folder='images'):
     """
     Save uploaded file to static folder
+
+    The destination directory is only created on the first upload into
+    it; the file body is streamed to disk in 64 KiB chunks so memory
+    stays flat regardless of upload size.
     """
     if not file_storage:
         return None
@@ -50,19 +347,22 @@ def save_uploaded_file(file_storage, folder='images'):
     filename = secure_filename(file_storage.filename)
     if not filename:
         return None
-        
+
     # Generate unique filename
     import uuid
     name, ext = os.path.splitext(filename)
     unique_filename = f"{name}_{uuid.uuid4().hex[:8]}{ext}"
-    
-    # Ensure directory exists
+
+    # Ensure directory exists (once per folder per process)
     upload_path = os.path.join(current_app.static_folder, folder)
-    os.makedirs(upload_path, exist_ok=True)
-    
-    # Save file
+    if upload_path not in _created_upload_dirs:
+        os.makedirs(upload_path, exist_ok=True)
+        _created_upload_dirs.add(upload_path)
+
+    # Stream the file to disk chunk by chunk
     file_storage.seek(0)
-    file_storage.save(os.path.join(upload_path, unique_filename))
+    with open(os.path.join(upload_path, unique_filename), 'wb') as out:
+        shutil.copyfileobj(file_storage.stream, out, 1 << 16)
     return unique_filename
 
 
@@ -133,67 +433,144 @@ def provider_required(f):
 # MAIN ROUTES
 # ============================================================================
 
-@main_bp.route('/')
-def index():
+# Homepage stats cache
+# The landing page is the busiest route and serves mostly anonymous
+# visitors, but its stats (satisfaction rate, user/service totals) only
+# change when someone reviews, testifies or completes an order — on the
+# order of minutes, not per-request. Caching the computed dict for a
+# short TTL removes the aggregate queries from almost every hit.
+_HOMEPAGE_STATS_TTL = 60  # seconds
+_homepage_stats = {'data': None, 'expires': 0.0}
+
+
+def _invalidate_homepage_stats():
+    """Force the next homepage request to recompute its cached stats."""
+    _homepage_stats['data'] = None
+    _homepage_stats['expires'] = 0.0
+
+
+# Buffered view counting
+# Writing view_count on every detail() hit puts an UPDATE + commit on
+# the hottest read path and hammers one row per popular service.
+# Increments are buffered in-process and flushed as a handful of
+# "view_count = view_count + delta" statements once enough accumulate
+# or enough time passes; additive UPDATEs stay correct across workers.
+_VIEW_FLUSH_INTERVAL = 15   # seconds between flushes
+_VIEW_FLUSH_THRESHOLD = 50  # pending increments that force a flush
+_view_buffer = {}
+_view_buffer_lock = threading.Lock()
+_view_last_flush = time.time()
+
+
+def _cacheable_response(html):
     """
-    Landing page route
-    
-    Displays:
-    - Hero section
-    - Categories
-    - Featured services
-    - How it works
-    - Testimonials
-    - CTA
-    
+    Wrap rendered catalogue HTML with HTTP caching headers.
+
+    Anonymous visitors (the bulk of browse/detail traffic) get a short
+    public max-age so browsers and any CDN can skip the whole
+    render+DB path on repeat views; logged-in pages stay private. The
+    ETag lets clients revalidate with a 304 instead of a full body.
+
+    Args:
+        html (str): Rendered template output
+
     Returns:
-        Rendered template
+        Response: response with Cache-Control and ETag set
+    """
+    resp = make_response(html)
+    if current_user.is_authenticated:
+        resp.headers['Cache-Control'] = 'private, max-age=0'
+    else:
+        resp.headers['Cache-Control'] = 'public, max-age=30'
+    # Cache entries must be keyed by session: without Vary a shared
+    # cache (CDN, proxy) could hand the anonymous-rendered page — or a
+    # 304 against the anonymous ETag — to a logged-in user
+    resp.headers['Vary'] = 'Cookie'
+    resp.add_etag()
+    return resp.make_conditional(request)
+
+
+def _bump_view_count(service_id):
+    """
+    Record one view of a service without a per-request DB write.
+
+    Args:
+        service_id (int): Service being viewed
+    """
+    global _view_last_flush
+    with _view_buffer_lock:
+        _view_buffer[service_id] = _view_buffer.get(service_id, 0) + 1
+        pending = sum(_view_buffer.values())
+        due = (pending >= _VIEW_FLUSH_THRESHOLD or
+               time.time() - _view_last_flush >= _VIEW_FLUSH_INTERVAL)
+        if not due:
+            return
+        snapshot = dict(_view_buffer)
+        _view_buffer.clear()
+        _view_last_flush = time.time()
+
+    try:
+        from sqlalchemy import update
+        for sid, delta in snapshot.items():
+            db.session.execute(
+                update(Service)
+                .where(Service.id == sid)
+                .values(view_count=func.coalesce(Service.view_count, 0) + delta)
+            )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"[WARNING] View-count flush failed: {e}")
+
+
+def _compute_homepage_stats():
+    """
+    Compute the landing-page stats dict (satisfaction rate + totals).
+
+    Satisfaction rate is a real-world weighted calculation combining
+    3 signals: Service Reviews + Testimonials + Order Completions.
+    Each signal is weighted, and only signals with data contribute.
+
+    Returns:
+        dict: total_users, total_services, total_reviews, satisfaction_rate
     """
-    # Get featured services using ServiceManager
-    featured_services = service_manager.get_featured_services(limit=4)
-    
-    # Get all categories
-    categories = category_manager.get_all_categories()
-    
-    # Get category stats
-    category_stats = category_manager.get_category_stats()
-    
-    # =========================================================================
-    # SATISFACTION RATE - Real-world weighted calculation
-    # Combines 3 signals: Service Reviews + Testimonials + Order Completions
-    # Each signal is weighted, and only signals with data contribute
-    # =========================================================================
-    
     satisfaction_components = []
-    
+
     # Signal 1: Service Review Satisfaction (weight: 40%)
-    # Reviews with 4-5 stars are considered "satisfied"
-    total_reviews = Review.query.count()
+    # Reviews with 4-5 stars are considered "satisfied".
+    # One scan with a conditional SUM instead of two COUNT round-trips
+    total_reviews, positive_reviews = db.session.query(
+        func.count(Review.id),
+        func.sum(case((Review.rating >= 4, 1), else_=0))
+    ).one()
     if total_reviews > 0:
-        positive_reviews = Review.query.filter(Review.rating >= 4).count()
         review_satisfaction = (positive_reviews / total_reviews) * 100
         satisfaction_components.append({'score': review_satisfaction, 'weight': 40})
-    
+
     # Signal 2: Testimonial Satisfaction (weight: 30%)
     # Testimonials with 4-5 stars are considered "satisfied"
-    total_testimonials = Testimonial.query.filter_by(is_active=True).count()
+    total_testimonials, positive_testimonials = db.session.query(
+        func.count(Testimonial.id),
+        func.sum(case((Testimonial.rating >= 4, 1), else_=0))
+    ).filter(Testimonial.is_active == True).one()
     if total_testimonials > 0:
-        positive_testimonials = Testimonial.query.filter(
-            Testimonial.is_active == True,
-            Testimonial.rating >= 4
-        ).count()
         testimonial_satisfaction = (positive_testimonials / total_testimonials) * 100
         satisfaction_components.append({'score': testimonial_satisfaction, 'weight': 30})
-    
+
     # Signal 3: Order Completion Rate (weight: 30%)
-    # Completed orders vs total resolved orders (completed + cancelled)
-    completed_orders = Order.query.filter_by(status='completed').count()
-    cancelled_orders = Order.query.filter_by(status='cancelled').count()
+    # Completed orders vs total resolved orders (completed + cancelled),
+    # both tallied in a single pass over orders
+    completed_orders, cancelled_orders = db.session.query(
+        func.sum(case((Order.status == 'completed', 1), else_=0)),
+        func.sum(case((Order.status == 'cancelled', 1), else_=0))
+    ).one()
+    completed_orders = completed_orders or 0
+    cancelled_orders = cancelled_orders or 0
     resolved_orders = completed_orders + cancelled_orders
     if resolved_orders > 0:
         completion_rate = (completed_orders / resolved_orders) * 100
         satisfaction_components.append({'score': completion_rate, 'weight': 30})
-    
+
     # Calculate weighted average (only from signals that have data)
     if satisfaction_components:
         total_weight = sum(c['weight'] for c in satisfaction_components)
@@ -201,13 +578,56 @@ def index():
         satisfaction_rate = round(weighted_sum / total_weight)
     else:
         satisfaction_rate = 0
-    
-    stats_data = {
-        'total_users': User.query.count(),
-        'total_services': Service.query.filter_by(is_active=True, is_approved=True).count(),
+
+    # Users and services counted in one round-trip via scalar subqueries
+    total_users, total_services = db.session.query(
+        db.session.query(func.count(User.id)).scalar_subquery(),
+        db.session.query(func.count(Service.id)).filter(
+            Service.is_active == True, Service.is_approved == True
+        ).scalar_subquery()
+    ).one()
+
+    return {
+        'total_users': total_users,
+        'total_services': total_services,
         'total_reviews': total_reviews,
         'satisfaction_rate': satisfaction_rate
     }
+
+
+@main_bp.route('/')
+def index():
+    """
+    Landing page route
+    
+    Displays:
+    - Hero section
+    - Categories
+    - Featured services
+    - How it works
+    - Testimonials
+    - CTA
+    
+    Returns:
+        Rendered template
+    """
+    # Get featured services using ServiceManager
+    featured_services = service_manager.get_featured_services(limit=4)
+    
+    # Get all categories
+    categories = category_manager.get_all_categories()
+    
+    # Get category stats
+    category_stats = category_manager.get_category_stats()
+    
+    # Satisfaction rate + totals, served from the 60s module cache.
+    # featured_services above has its own (longer) TTL inside
+    # ServiceManager, so a stats refresh doesn't rebuild the heap.
+    now = time.time()
+    if _homepage_stats['data'] is None or now >= _homepage_stats['expires']:
+        _homepage_stats['data'] = _compute_homepage_stats()
+        _homepage_stats['expires'] = now + _HOMEPAGE_STATS_TTL
+    stats_data = _homepage_stats['data']
     
     return render_template('index.html',
                          featured_services=featured_services,
@@ -236,6 +656,8 @@ def add_testimonial():
         )
         db.session.add(t)
         db.session.commit()
+        # New testimonial feeds the satisfaction rate — drop the cached stats
+        _invalidate_homepage_stats()
         flash('Thank you for your review!', 'success')
     else:
         flash('Review content cannot be empty.', 'error')
@@ -435,7 +857,6 @@ def register():
         
         if user:
             # Send welcome email
-            from email_utils import send_welcome_email
             send_welcome_email(user)
             
             flash('Account created successfully! Please log in.', 'success')
@@ -519,7 +940,6 @@ def google_callback():
             db.session.commit()
             
             # Send welcome email
-            from email_utils import send_welcome_email
             send_welcome_email(user)
             
             role_label = 'service provider' if google_user_type == 'provider' else 'client'
@@ -585,41 +1005,56 @@ def browse():
     max_price = request.args.get('max_price', type=float)
     sort_by = request.args.get('sort', 'rating')
     
-    # Build filters dictionary
-    filters = {}
+    # Build ONE SQL query: filters, text search and ordering all happen
+    # in the database. The old version loaded every matching row into
+    # Python and sorted there — for the rating sort that also meant one
+    # aggregate query per service (a classic N+1)
+    services_query = Service.query.filter_by(is_active=True, is_approved=True)
+
+    if query:
+        # Indexed full-text search on PostgreSQL, ILIKE fallback on SQLite
+        services_query = services_query.filter(Service.search_clause(query))
     if category_id:
-        filters['category_id'] = category_id
+        services_query = services_query.filter(Service.category_id == category_id)
     if min_price:
-        filters['min_price'] = min_price
+        services_query = services_query.filter(Service.price >= min_price)
     if max_price:
-        filters['max_price'] = max_price
-    
-    # Search services
-    if query or filters:
-        services = service_manager.search_services(query, filters)
-    else:
-        # Get all services (only approved and active)
-        services = Service.query.filter_by(is_active=True, is_approved=True).all()
-    
-    # Sort services
+        services_query = services_query.filter(Service.price <= max_price)
+
+    # Sort in SQL (ORDER BY can use indexes; Python sort never can)
     if sort_by == 'price_asc':
-        services.sort(key=lambda s: s.price)
+        services_query = services_query.order_by(Service.price.asc())
     elif sort_by == 'price_desc':
-        services.sort(key=lambda s: s.price, reverse=True)
-    elif sort_by == 'rating':
-        services.sort(key=lambda s: s.get_average_rating(), reverse=True)
+        services_query = services_query.order_by(Service.price.desc())
     elif sort_by == 'newest':
-        services.sort(key=lambda s: s.created_at, reverse=True)
-    
+        services_query = services_query.order_by(Service.created_at.desc())
+    else:
+        # Rating sort (the default): aggregate reviews in the same query
+        services_query = services_query.outerjoin(
+            Review, Review.service_id == Service.id
+        ).group_by(Service.id).order_by(
+            func.coalesce(func.avg(Review.rating), 0).desc()
+        )
+
+    # Paginate: fetch one page of rows, not the whole catalogue —
+    # memory and render cost stay O(page size) as services grow
+    page = request.args.get('page', 1, type=int)
+    pagination = services_query.paginate(page=page, per_page=24, error_out=False)
+    services = pagination.items
+
+    # One grouped query for the rating/count shown on every card
+    Service.preload_rating_stats(services)
+
     # Get categories for filter
     categories = category_manager.get_all_categories()
-    
-    return render_template('services.html',
+
+    return _cacheable_response(render_template('services.html',
                          services=services,
+                         pagination=pagination,
                          categories=categories,
                          query=query,
                          selected_category=category_id,
-                         sort_by=sort_by)
+                         sort_by=sort_by))
 
 
 @service_bp.route('/<int:service_id>')
@@ -633,8 +1068,13 @@ def detail(service_id):
     Returns:
         Rendered template with service details
     """
-    service = Service.query.get_or_404(service_id)
-    
+    # Eager-load the relations the template touches (category name,
+    # provider card) so rendering doesn't lazy-load them one by one
+    service = Service.query.options(
+        joinedload(Service.category),
+        joinedload(Service.provider)
+    ).filter_by(id=service_id).first_or_404()
+
     # Block unapproved services from public view (allow owner and admin)
     if not service.is_approved:
         if not current_user.is_authenticated:
@@ -644,8 +1084,8 @@ def detail(service_id):
             flash('This service is not available.', 'warning')
             return redirect(url_for('service.browse'))
     
-    # Increment view count
-    service.increment_views()
+    # Increment view count (buffered — no DB write on the read path)
+    _bump_view_count(service_id)
     
     # Get reviews
     reviews = review_system.get_service_reviews(service_id, limit=10)
@@ -653,45 +1093,62 @@ def detail(service_id):
     # Get rating distribution
     rating_dist = review_system.calculate_rating_distribution(service_id)
     
-    # Get related services (same category, approved only)
-    related_services = Service.query.filter(
+    # Related services (same category, approved only) as plain dicts:
+    # one column-only query with the rating aggregate folded in, instead
+    # of hydrating full ORM objects whose getters Jinja could call into
+    # the database from inside a loop
+    related_rows = db.session.query(
+        Service.id, Service.title, Service.price, Service.image_url,
+        func.coalesce(func.avg(Review.rating), 0), func.count(Review.id)
+    ).outerjoin(Review, Review.service_id == Service.id).filter(
         Service.category_id == service.category_id,
         Service.id != service_id,
         Service.is_active == True,
         Service.is_approved == True
-    ).limit(4).all()
-    
+    ).group_by(Service.id).limit(4).all()
+    related_services = [
+        {'id': rid, 'title': title, 'price': price, 'image_url': image_url,
+         'avg_rating': round(float(avg), 1), 'review_count': count}
+        for rid, title, price, image_url, avg, count in related_rows
+    ]
+
+    # The main card shows rating + review count; load them in one query
+    Service.preload_rating_stats([service])
+
     # Check if user has favorited this service
     is_favorited = False
     existing_order = None
     wallet_balance = 0  # Default wallet balance
     
     if current_user.is_authenticated:
-        is_favorited = service.is_favorited_by(current_user)
-        
+        # Existence probe instead of loading the whole Favorite row
+        is_favorited = db.session.query(Favorite.id).filter_by(
+            user_id=current_user.id, service_id=service_id
+        ).limit(1).scalar() is not None
+
         # Get wallet balance for order validation (Unit-9: OOP, Composition)
-        from payment_system import WalletManager
-        wallet_mgr = WalletManager()
+        wallet_mgr = _wallet_mgr
         wallet_balance = wallet_mgr.get_balance(current_user.id)
         
         # Check if user has an ACTIVE order for this service (pending or in_progress)
-        # This determines if Chat button should be shown instead of Order Now
+        # This determines if Chat button should be shown instead of Order Now.
+        # The template only reads .id and .status, so select those two
+        # columns instead of hydrating a full Order object per page view
         if current_user.id != service.user_id:
-            existing_order = Order.query.filter_by(
-                service_id=service_id,
-                buyer_id=current_user.id
-            ).filter(
+            existing_order = db.session.query(Order.id, Order.status).filter(
+                Order.service_id == service_id,
+                Order.buyer_id == current_user.id,
                 Order.status.in_(['pending', 'in_progress'])
-            ).order_by(Order.created_at.desc()).first()
+            ).order_by(Order.created_at.desc()).limit(1).first()
     
-    return render_template('service_detail.html',
+    return _cacheable_response(render_template('service_detail.html',
                          service=service,
                          reviews=reviews,
                          rating_dist=rating_dist,
                          related_services=related_services,
                          is_favorited=is_favorited,
                          existing_order=existing_order,
-                         wallet_balance=wallet_balance)
+                         wallet_balance=wallet_balance))
 
 
 @service_bp.route('/create', methods=['GET', 'POST'])
@@ -712,14 +1169,14 @@ def create():
     """
     if request.method == 'POST':
         
-        # Get form data
+        # Get form data — Werkzeug's type= coercion returns None instead
+        # of raising on malformed/missing values, so no bare int()/float()
         data = {
             'title': request.form.get('title'),
             'description': request.form.get('description'),
-            'price': float(request.form.get('price', 0)),
+            'price': request.form.get('price', type=float) or 0.0,
             'delivery_time': request.form.get('delivery_time'),
-            'category_id': int(request.form.get('category_id')),
-            'category_id': int(request.form.get('category_id')),
+            'category_id': request.form.get('category_id', type=int),
             'tags': request.form.get('tags', '')
         }
         
@@ -777,9 +1234,9 @@ def edit(service_id):
         # Update service
         service.title = request.form.get('title')
         service.description = request.form.get('description')
-        service.price = float(request.form.get('price', 0))
+        service.price = request.form.get('price', type=float) or 0.0
         service.delivery_time = request.form.get('delivery_time')
-        service.category_id = int(request.form.get('category_id'))
+        service.category_id = request.form.get('category_id', type=int)
         service.tags = request.form.get('tags', '')
         
         # Handle Image Upload
@@ -790,22 +1247,49 @@ def edit(service_id):
                 if filename:
                     service.image_url = filename
         
-        db.session.commit()
-        
-        # If the service was previously rejected and the owner edited it, re-submit for approval
-        if not current_user.is_admin() and not service.is_approved:
+        # If the service was previously rejected and the owner edited it,
+        # re-submit for approval. Clearing the rejection reason rides in
+        # the same commit as the field updates — one WAL flush, not two
+        resubmitted = not current_user.is_admin() and not service.is_approved
+        if resubmitted:
             service.rejection_reason = None  # Clear rejection reason to mark as "pending" again
-            db.session.commit()
-            
-            # Notify admins about re-submission
-            admins = User.query.filter_by(user_type='admin').all()
-            for admin in admins:
-                notification_manager.create_notification(
-                    user_id=admin.id,
-                    title='Service Re-submitted for Review 🔄',
-                    message=f'{current_user.username} updated and re-submitted "{service.title}" for review.',
-                    link='/admin/services/pending'
-                )
+
+        db.session.commit()
+
+        if resubmitted:
+            # Notify admins about re-submission — one INSERT statement
+            # covering every admin instead of a round-trip per admin
+            admin_ids = [row.id for row in
+                         User.query.filter_by(user_type='admin')
+                                   .with_entities(User.id).all()]
+            if admin_ids:
+                now = datetime.utcnow()
+                rows = [{
+                    'user_id': admin_id,
+                    'title': 'Service Re-submitted for Review 🔄',
+                    'message': f'{current_user.username} updated and re-submitted "{service.title}" for review.',
+                    'link': '/admin/services/pending',
+                    'is_read': False,
+                    'created_at': now,
+                } for admin_id in admin_ids]
+                if db.engine.dialect.name == 'postgresql':
+                    # The unread-dedup index ix_notif_unread_dedup keys on
+                    # (user_id, title, link), which is identical for every
+                    # re-submission — ON CONFLICT DO NOTHING skips just the
+                    # admins who still have an unread copy, instead of an
+                    # IntegrityError rollback discarding the whole batch
+                    from sqlalchemy import text
+                    from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+                    stmt = pg_insert(Notification).on_conflict_do_nothing(
+                        index_elements=['user_id', 'title', 'link'],
+                        index_where=text('is_read = false')
+                    )
+                    db.session.execute(stmt, rows)
+                else:
+                    # SQLite has no partial dedup index — plain bulk insert
+                    db.session.bulk_insert_mappings(Notification, rows)
+                db.session.commit()
             flash('Service updated and re-submitted for review!', 'info')
         else:
             flash('Service updated successfully!', 'success')
@@ -842,21 +1326,32 @@ def delete(service_id):
         service_title = service.title
         
         try:
-            # Delete related orders and their messages first
-            orders = Order.query.filter_by(service_id=service_id).all()
-            for order in orders:
-                # Delete messages associated with this order
-                Message.query.filter_by(order_id=order.id).delete()
-                db.session.delete(order)
-            
+            # Bulk DELETEs: the old loop loaded every order and issued a
+            # message delete per order — hundreds of round-trips for a
+            # busy service. Three set-based statements do the same work.
+            order_ids = db.session.query(Order.id).filter_by(service_id=service_id)
+            Message.query.filter(
+                Message.order_id.in_(order_ids)
+            ).delete(synchronize_session=False)
+            Order.query.filter_by(service_id=service_id).delete(synchronize_session=False)
+
             # Delete related reviews
-            Review.query.filter_by(service_id=service_id).delete()
-            
+            Review.query.filter_by(service_id=service_id).delete(synchronize_session=False)
+
             # Delete related favorites
-            Favorite.query.filter_by(service_id=service_id).delete()
-            
+            Favorite.query.filter_by(service_id=service_id).delete(synchronize_session=False)
+
             # Now delete the service
             db.session.delete(service)
+
+            # The bulk review delete above bypasses ORM events, so the
+            # provider's denormalized rating must be rebuilt explicitly
+            # (after the flush so the dead service is already gone from
+            # the aggregate), in the same transaction as the deletes
+            provider_id = service.user_id
+            db.session.flush()
+            from models import refresh_provider_rating
+            refresh_provider_rating(provider_id)
             db.session.commit()
             
             flash(f'Service "{service_title}" and all related data permanently deleted.', 'success')
@@ -868,6 +1363,11 @@ def delete(service_id):
     else:
         # Regular user: Soft delete (set is_active to False)
         service.is_active = False
+        # Deactivating changes the active-service set the denormalized
+        # rating is averaged over — rebuild it in the same commit
+        db.session.flush()
+        from models import refresh_provider_rating
+        refresh_provider_rating(service.user_id)
         db.session.commit()
         flash('Service deleted successfully.', 'success')
         return redirect(url_for('user.dashboard'))
@@ -962,7 +1462,6 @@ def place_order(service_id):
         Redirect
     """
     # Import payment system for wallet validation
-    from payment_system import WalletManager, PaymentGateway, InsufficientBalanceException
     
     # Block admin from purchasing services
     if current_user.user_type == 'admin':
@@ -990,115 +1489,101 @@ def place_order(service_id):
         order_price = base_price  # Standard price
     
     # =====================================================================
-    # WALLET BALANCE VALIDATION (Unit-8: Exception Handling, Unit-9: OOP)
+    # WALLET SETUP (Unit-8: Exception Handling, Unit-9: OOP)
+    # No Python-side balance pre-check here: deduct_money() enforces the
+    # balance floor atomically in SQL, so a separate read-then-compare
+    # would only add a query and a race window. Insufficient funds
+    # surface as InsufficientBalanceException below.
     # =====================================================================
-    gateway = PaymentGateway()
-    wallet_mgr = WalletManager(payment_gateway=gateway)
-    
-    # Get current wallet balance
-    current_balance = wallet_mgr.get_balance(current_user.id)
-    
-    # Check if user has sufficient balance
-    if current_balance < order_price:
-        # Insufficient balance - redirect to wallet page
-        shortfall = order_price - current_balance
-        flash(f'Insufficient wallet balance! You need ₹{int(order_price)} but have only ₹{int(current_balance)}. Please add ₹{int(shortfall)} to your wallet.', 'danger')
-        return redirect(url_for('user.wallet'))
-    
+    wallet_mgr = _wallet_mgr
+
     # Create order using OrderManager
     order = order_manager.create_order(service_id, current_user.id, requirements, '', budget_tier, None)
     
     if order:
         # =====================================================================
-        # DEDUCT AMOUNT FROM WALLET (Unit-6: File Handling, Unit-9: OOP)
+        # MOVE THE MONEY — ONE TRANSACTION (Unit-8: Exceptions, Unit-9: OOP)
+        # Buyer deduction, seller credit, platform fee and the seller's
+        # notification all commit together: one fsync instead of four,
+        # and either every movement lands or none does (no more
+        # "buyer paid but seller credit failed" half-states).
         # =====================================================================
-        buyer_payment_success = False
-        seller_credit_success = False
-        buyer_txn_id = None
-        
+        # Platform fee: 10% (SkillVerse keeps 10%, seller gets 90%)
+        platform_fee_percent = 0.10
+        seller_amount = order.total_price * (1 - platform_fee_percent)
+        platform_fee_amount = order.total_price * platform_fee_percent
+
+        # Get seller username for transaction record
+        seller = User.query.get(order.seller_id)
+        seller_username = seller.username if seller else f'User #{order.seller_id}'
+        admin_id = _get_admin_user_id()
+        admin_user = User.query.get(admin_id) if admin_id else None
+
         try:
             # Capture transaction result to get ID
             buyer_txn = wallet_mgr.deduct_money(
                 user_id=current_user.id,
                 amount=order.total_price,
                 description=f'Service Purchase: {service.title} (Order #{order.id})',
-                username=current_user.username
+                username=current_user.username,
+                commit=False
             )
             buyer_txn_id = buyer_txn.get('id')
-            buyer_payment_success = True
-            print(f"[DEBUG] Successfully deducted ₹{order.total_price} from buyer (user_id: {current_user.id}). Txn ID: {buyer_txn_id}")
-            
-        except InsufficientBalanceException:
-            # This shouldn't happen as we checked above, but just in case
-            flash('Payment failed due to insufficient balance.', 'danger')
-            # Cancel the order
-            order.status = 'cancelled'
-            db.session.commit()
-            return redirect(url_for('service.detail', service_id=service_id))
-        except Exception as e:
-            print(f"[ERROR] Buyer deduction failed: {str(e)}")
-            flash(f'Payment processing error: {str(e)}', 'danger')
-            order.status = 'cancelled'
-            db.session.commit()
-            return redirect(url_for('service.detail', service_id=service_id))
-        
-        # =====================================================================
-        # CREDIT AMOUNT TO SELLER'S WALLET (Unit-6: File Handling, Unit-9: OOP)
-        # =====================================================================
-        # Platform fee: 10% (SkillVerse keeps 10%, seller gets 90%)
-        platform_fee_percent = 0.10
-        seller_amount = order.total_price * (1 - platform_fee_percent)
-        
-        # Get seller username for transaction record
-        seller = User.query.get(order.seller_id)
-        seller_username = seller.username if seller else f'User #{order.seller_id}'
-        
-        try:
-            print(f"[DEBUG] Attempting to credit seller (user_id: {order.seller_id}) with ₹{seller_amount}")
+
             wallet_mgr.credit_seller(
                 user_id=order.seller_id,
                 amount=seller_amount,
                 description=f'Payment Received: {service.title} (Order #{order.id}) - After 10% platform fee',
                 username=seller_username,
-                transaction_id=buyer_txn_id
+                transaction_id=buyer_txn_id,
+                commit=False
             )
-            seller_credit_success = True
-            print(f"[DEBUG] Successfully credited ₹{seller_amount} to seller (user_id: {order.seller_id})")
-            
-            # =====================================================================
-            # CREDIT PLATFORM FEE TO ADMIN'S WALLET
-            # =====================================================================
-            platform_fee_amount = order.total_price * platform_fee_percent
-            admin_user = User.query.filter_by(user_type='admin').first()
+
             if admin_user:
-                print(f"[DEBUG] Attempting to credit admin (user_id: {admin_user.id}) with ₹{platform_fee_amount}")
                 wallet_mgr.credit_seller(
                     user_id=admin_user.id,
                     amount=platform_fee_amount,
                     description=f'Platform Fee Received: {service.title} (Order #{order.id})',
                     username=admin_user.username,
-                    transaction_id=buyer_txn_id
+                    transaction_id=buyer_txn_id,
+                    commit=False
                 )
-                print(f"[DEBUG] Successfully credited ₹{platform_fee_amount} to admin (user_id: {admin_user.id})")
             else:
                 print(f"[WARNING] No admin user found to credit platform fee.")
 
+            # Create notification for the provider (same transaction)
+            notification_manager.create_notification(
+                user_id=order.seller_id,
+                title=f'New Order #{order.id} Received',
+                message=f'You have a new order #{order.id} for "{service.title}" from {current_user.username}. Price: ₹{int(order.total_price)}',
+                link=url_for('user.order_detail', order_id=order.id),
+                commit=False
+            )
+
+            # The single commit for every movement above
+            db.session.commit()
+            print(f"[DEBUG] Order #{order.id}: moved ₹{order.total_price} (seller ₹{seller_amount}, fee ₹{platform_fee_amount}) in one transaction. Txn ID: {buyer_txn_id}")
+
+        except InsufficientBalanceException as e:
+            # The guarded UPDATE in deduct_money matched no row — the
+            # wallet couldn't cover the order price at debit time
+            db.session.rollback()
+            shortfall = float(e.required) - float(e.available)
+            flash(f'Insufficient wallet balance! You need ₹{int(e.required)} but have only ₹{int(e.available)}. Please add ₹{int(shortfall)} to your wallet.', 'danger')
+            # Cancel the order
+            order.status = 'cancelled'
+            db.session.commit()
+            return redirect(url_for('user.wallet'))
         except Exception as e:
-            # Log the error but don't cancel the order - the buyer already paid
-            # Admin will need to manually credit the seller
-            print(f"[ERROR] Failed to credit seller or admin: {str(e)}")
-            # Note: In production, you'd want to queue this for retry or alert admin
-        
-        # Create notification for the provider
-        notification_manager.create_notification(
-            user_id=order.seller_id,
-            title=f'New Order #{order.id} Received',
-            message=f'You have a new order #{order.id} for "{order.service.title}" from {current_user.username}. Price: ₹{int(order.total_price)}',
-            link=url_for('user.order_detail', order_id=order.id)
-        )
-        
+            # Nothing was committed — the rollback undoes every movement
+            db.session.rollback()
+            print(f"[ERROR] Payment transaction failed: {str(e)}")
+            flash(f'Payment processing error: {str(e)}', 'danger')
+            order.status = 'cancelled'
+            db.session.commit()
+            return redirect(url_for('service.detail', service_id=service_id))
+
         # Send emails to both customer and provider
-        from email_utils import send_order_placed_emails
         send_order_placed_emails(order)
         
         flash(f'Order placed successfully! ₹{int(order.total_price)} deducted from your wallet.', 'success')
@@ -1117,203 +1602,90 @@ def place_order(service_id):
 def dashboard():
     """
     User dashboard
-    
-    Shows different content based on user type:
-    - Provider: Services, orders, earnings
-    - Client: Orders, favorites
-    - Admin: Redirect to admin panel
-    
+
+    Unified model: every non-admin user sees the client dashboard here
+    (buyer_dashboard and seller_dashboard cover the role-specific
+    views); admins are redirected to the admin panel.
+
     Returns:
         Rendered template
     """
     if current_user.is_admin():
         return redirect(url_for('admin.dashboard'))
     
-    # Get combined stats for unified dashboard
+    # Unified model: always show the client dashboard
     stats = user_manager.get_user_stats(current_user.id)
-    
-    # BUYER DATA
-    buyer_orders = order_manager.get_user_orders(current_user.id, as_buyer=True)
+    orders = order_manager.get_user_orders(current_user.id, as_buyer=True)
     favorites = Favorite.query.filter_by(user_id=current_user.id).all()
-    
-    # SELLER DATA
-    services = current_user.get_services()
-    seller_orders = order_manager.get_user_orders(current_user.id, as_buyer=False)
-    
-    # Combined view - show client dashboard with additional seller stats
-    if False:  # Unified model: always show client dashboard
-        # Provider dashboard
-        services = current_user.get_services()
-        orders = order_manager.get_user_orders(current_user.id, as_buyer=False)
-        
-        # Get today's bookings
-        today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0).replace(tzinfo=None)
-        today_end = today_start.replace(hour=23, minute=59, second=59)
-        
-        todays_bookings = Booking.query.join(AvailabilitySlot).filter(
-            AvailabilitySlot.provider_id == current_user.id,
-            AvailabilitySlot.start_time >= today_start,
-            AvailabilitySlot.start_time <= today_end
-        ).order_by(AvailabilitySlot.start_time).all()
-
-        # Personal Analytics Graphs - Using Line Chart and Pie Chart (as per PDF)
-        plt.style.use('default')
-
-        # Graph 1: Earnings Trend - LINE CHART (plt.plot)
-        earnings_data = db.session.query(
-            func.date(Order.completed_at), func.sum(Order.total_price)
-        ).filter(
-            Order.seller_id == current_user.id,
-            Order.status == 'completed',
-            Order.completed_at != None
-        ).group_by(func.date(Order.completed_at)).order_by(func.date(Order.completed_at)).all()
-
-        dates_earn = []
-        values_earn = []
-        if earnings_data:
-            dates_earn = [str(r[0])[-5:] for r in earnings_data]  # Show MM-DD format
-            values_earn = [float(r[1]) for r in earnings_data]
-        else:
-            dates_earn = ['No Data']
-            values_earn = [0]
-
-        # LINE CHART - Simple as per PDF syntax: plt.plot(x, y)
-        fig1 = plt.figure(figsize=(8, 4))
-        plt.plot(dates_earn, values_earn, color='green', marker='o', linestyle='-', linewidth=2)
-        plt.title('My Earnings Trend', fontsize=12, fontweight='bold')
-        plt.xlabel('Date')
-        plt.ylabel('Earnings (₹)')
-        plt.grid(True)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-
-        img1 = io.BytesIO()
-        fig1.savefig(img1, format='png', dpi=100, bbox_inches='tight', facecolor='white')
-        img1.seek(0)
-        earnings_graph = base64.b64encode(img1.getvalue()).decode()
-        plt.close(fig1)
-
-        # Graph 2: Service Views Distribution - PIE CHART (plt.pie)
-        my_services = Service.query.filter_by(user_id=current_user.id).all()
-        top_services = sorted(my_services, key=lambda s: s.view_count, reverse=True)[:5]
-
-        if top_services and sum(s.view_count for s in top_services) > 0:
-            svc_names = [s.title[:15] + '...' if len(s.title) > 15 else s.title for s in top_services]
-            svc_views = [s.view_count for s in top_services]
-        else:
-            svc_names = ['No Views Yet']
-            svc_views = [1]
-
-        # PIE CHART - Simple as per PDF syntax: plt.pie(sizes, labels=labels)
-        fig2 = plt.figure(figsize=(8, 5))
-        colors = ['#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0', '#9966FF', '#FF9F40', '#C9CBCF', '#7CFC00', '#FF1493', '#00CED1']
-        plt.pie(svc_views, labels=svc_names, autopct='%1.1f%%', colors=colors[:len(svc_views)], startangle=90)
-        plt.title('Service Views Distribution', fontsize=12, fontweight='bold')
-        plt.axis('equal')
-        plt.tight_layout()
-
-        img2 = io.BytesIO()
-        fig2.savefig(img2, format='png', dpi=100, bbox_inches='tight', facecolor='white')
-        img2.seek(0)
-        services_graph = base64.b64encode(img2.getvalue()).decode()
-        plt.close(fig2)
-
-        return render_template('user/provider_dashboard.html',
-                             services=services,
-                             orders=orders,
-                             stats=stats,
-                             todays_bookings=todays_bookings,
-                             earnings_graph=earnings_graph,
-                             services_graph=services_graph)
+    recommendations = service_manager.get_recommendations(current_user, limit=6)
+
+    # Calculate session stats — one batched query for all bookings
+    # (slots eager-loaded) instead of a query per order
+    sessions_to_schedule = 0
+    upcoming_sessions = 0
+
+    bookings_by_order = {}
+    order_ids = [o.id for o in orders]
+    if order_ids:
+        bookings_by_order = {
+            b.order_id: b for b in Booking.query.options(
+                joinedload(Booking.slot)
+            ).filter(Booking.order_id.in_(order_ids)).all()
+        }
+    now_naive = datetime.now(timezone.utc).replace(tzinfo=None)
+    for order in orders:
+        # Check if order has a booking
+        booking = bookings_by_order.get(order.id)
+        if not booking and order.status not in ['cancelled', 'completed']:
+            sessions_to_schedule += 1
+        elif booking and booking.slot.start_time > now_naive:
+            upcoming_sessions += 1
+
+    # --- Client Analytics Graphs - Using Line Chart and Pie Chart (as per PDF) ---
+
+    # Graph 1: Spending Trend - LINE CHART (plt.plot)
+    # Indexed scan over the daily rollup instead of re-aggregating
+    # the orders table on every load
+    spending_data = db.session.query(
+        UserDailyStats.date, UserDailyStats.total_amount
+    ).filter_by(
+        user_id=current_user.id, role='buyer'
+    ).order_by(UserDailyStats.date).all()
+
+    dates_spend, values_spend = _chart_series(spending_data)
+
+    # Graph 2: Category Distribution - PIE CHART (plt.pie)
+    # Grouping on the primary key lets the planner dedupe on the
+    # integer id instead of comparing name strings per row
+    cat_data = db.session.query(
+        Category.id, Category.name, func.count(Order.id)
+    ).select_from(Order).join(Service).join(Category).filter(
+        Order.buyer_id == current_user.id
+    ).group_by(Category.id, Category.name).all()
+
+    if cat_data:
+        labels = [r[1] for r in cat_data]
+        sizes = [r[2] for r in cat_data]
     else:
-        # Client dashboard
-        orders = order_manager.get_user_orders(current_user.id, as_buyer=True)
-        favorites = Favorite.query.filter_by(user_id=current_user.id).all()
-        recommendations = service_manager.get_recommendations(current_user, limit=6)
-        
-        # Calculate session stats
-        sessions_to_schedule = 0
-        upcoming_sessions = 0
-        
-        for order in orders:
-            # Check if order has a booking
-            booking = Booking.query.filter_by(order_id=order.id).first()
-            if not booking and order.status not in ['cancelled', 'completed']:
-                sessions_to_schedule += 1
-            elif booking and booking.slot.start_time > datetime.now(timezone.utc).replace(tzinfo=None):
-                upcoming_sessions += 1
-        
-        # --- Client Analytics Graphs - Using Line Chart and Pie Chart (as per PDF) ---
-        plt.style.use('default') 
-
-        # Graph 1: Spending Trend - LINE CHART (plt.plot)
-        spending_data = db.session.query(
-            func.date(Order.created_at), func.sum(Order.total_price)
-        ).filter(
-            Order.buyer_id == current_user.id
-        ).group_by(func.date(Order.created_at)).order_by(func.date(Order.created_at)).all()
-
-        dates_spend = []
-        values_spend = []
-        if spending_data:
-            dates_spend = [str(r[0])[-5:] for r in spending_data]  # Show MM-DD format
-            values_spend = [float(r[1]) for r in spending_data]
-        else:
-            dates_spend = ['No Data']
-            values_spend = [0]
-
-        # LINE CHART - Simple as per PDF syntax: plt.plot(x, y)
-        fig3 = plt.figure(figsize=(8, 4))
-        plt.plot(dates_spend, values_spend, color='blue', marker='o', linestyle='-', linewidth=2)
-        plt.title('My Spending Trend', fontsize=12, fontweight='bold')
-        plt.xlabel('Date')
-        plt.ylabel('Amount (₹)')
-        plt.grid(True)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-
-        img3 = io.BytesIO()
-        fig3.savefig(img3, format='png', dpi=100, bbox_inches='tight', facecolor='white')
-        img3.seek(0)
-        spending_graph = base64.b64encode(img3.getvalue()).decode()
-        plt.close(fig3)
-
-
-        # Graph 2: Category Distribution - PIE CHART (plt.pie)
-        cat_data = db.session.query(
-            Category.name, func.count(Order.id)
-        ).select_from(Order).join(Service).join(Category).filter(
-            Order.buyer_id == current_user.id
-        ).group_by(Category.name).all()
-
-        if cat_data:
-            labels = [r[0] for r in cat_data]
-            sizes = [r[1] for r in cat_data]
-        else:
-            labels = ['No Orders']
-            sizes = [1]
-
-        # PIE CHART - Simple as per PDF syntax: plt.pie(sizes, labels=labels)
-        fig4 = plt.figure(figsize=(8, 5))
-        colors = ['#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0', '#9966FF', '#FF9F40', '#C9CBCF', '#7CFC00', '#FF1493', '#00CED1']
-        plt.pie(sizes, labels=labels, autopct='%1.1f%%', colors=colors[:len(sizes)], startangle=90)
-        plt.title('Orders by Category', fontsize=12, fontweight='bold')
-        plt.axis('equal')
-        plt.tight_layout()
-        
-        img4 = io.BytesIO()
-        fig4.savefig(img4, format='png', dpi=100, bbox_inches='tight', facecolor='white')
-        img4.seek(0)
-        distribution_graph = base64.b64encode(img4.getvalue()).decode()
-        plt.close(fig4)
-        
-        return render_template('user/client_dashboard.html',
-                             stats=stats,
-                             orders=orders,
-                             favorites=favorites,
-                             recommendations=recommendations,
-                             spending_graph=spending_graph,
-                             distribution_graph=distribution_graph)
+        labels = ['No Orders']
+        sizes = [1]
+
+    # Render both charts at once; any cache misses overlap on the pool
+    spending_graph, distribution_graph = _cached_charts(current_user.id, [
+        ('spending', (dates_spend, values_spend),
+         lambda: _render_line_chart_png(dates_spend, values_spend,
+                                        'My Spending Trend', 'Amount (₹)', 'blue')),
+        ('category', (labels, sizes),
+         lambda: _render_pie_chart_png(sizes, labels, 'Orders by Category')),
+    ])
+
+    return render_template('user/client_dashboard.html',
+                         stats=stats,
+                         orders=orders,
+                         favorites=favorites,
+                         recommendations=recommendations,
+                         spending_graph=spending_graph,
+                         distribution_graph=distribution_graph)
 
 
 @user_bp.route('/dashboard/buyer')
@@ -1328,78 +1700,63 @@ def buyer_dashboard():
     favorites = Favorite.query.filter_by(user_id=current_user.id).all()
     recommendations = service_manager.get_recommendations(current_user, limit=6)
     
-    # Calculate session stats
+    # Calculate session stats — one batched query for all bookings
+    # (slots eager-loaded) instead of a query per order
     sessions_to_schedule = 0
     upcoming_sessions = 0
-    
+
+    bookings_by_order = {}
+    order_ids = [o.id for o in orders]
+    if order_ids:
+        bookings_by_order = {
+            b.order_id: b for b in Booking.query.options(
+                joinedload(Booking.slot)
+            ).filter(Booking.order_id.in_(order_ids)).all()
+        }
+    now_naive = datetime.now(timezone.utc).replace(tzinfo=None)
     for order in orders:
-        booking = Booking.query.filter_by(order_id=order.id).first()
+        booking = bookings_by_order.get(order.id)
         if not booking and order.status not in ['cancelled', 'completed']:
             sessions_to_schedule += 1
-        elif booking and booking.slot.start_time > datetime.now(timezone.utc).replace(tzinfo=None):
+        elif booking and booking.slot.start_time > now_naive:
             upcoming_sessions += 1
 
     # Buyer Analytics Graphs
-    plt.style.use('default')
 
-    # Spending Trend
+    # Spending Trend — indexed scan over the daily rollup
     spending_data = db.session.query(
-        func.date(Order.created_at), func.sum(Order.total_price)
-    ).filter(
-        Order.buyer_id == current_user.id
-    ).group_by(func.date(Order.created_at)).order_by(func.date(Order.created_at)).all()
+        UserDailyStats.date, UserDailyStats.total_amount
+    ).filter_by(
+        user_id=current_user.id, role='buyer'
+    ).order_by(UserDailyStats.date).all()
 
-    dates_spend = []
-    values_spend = []
-    if spending_data:
-        dates_spend = [str(r[0])[-5:] for r in spending_data]
-        values_spend = [float(r[1]) for r in spending_data]
-    else:
-        dates_spend = ['No Data']
-        values_spend = [0]
-
-    fig3 = plt.figure(figsize=(8, 4))
-    plt.plot(dates_spend, values_spend, color='blue', marker='o', linestyle='-', linewidth=2)
-    plt.title('My Spending Trend', fontsize=12, fontweight='bold')
-    plt.xlabel('Date')
-    plt.ylabel('Amount (₹)')
-    plt.grid(True)
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-
-    img3 = io.BytesIO()
-    fig3.savefig(img3, format='png', dpi=100, bbox_inches='tight', facecolor='white')
-    img3.seek(0)
-    spending_graph = base64.b64encode(img3.getvalue()).decode()
-    plt.close(fig3)
+    dates_spend, values_spend = _chart_series(spending_data)
 
     # Category Distribution
+    # Group on the primary key so the planner dedupes on the integer id
+    # instead of comparing name strings per row
     cat_data = db.session.query(
-        Category.name, func.count(Order.id)
+        Category.id, Category.name, func.count(Order.id)
     ).select_from(Order).join(Service).join(Category).filter(
         Order.buyer_id == current_user.id
-    ).group_by(Category.name).all()
+    ).group_by(Category.id, Category.name).all()
 
     if cat_data:
-        labels = [r[0] for r in cat_data]
-        sizes = [r[1] for r in cat_data]
+        labels = [r[1] for r in cat_data]
+        sizes = [r[2] for r in cat_data]
     else:
         labels = ['No Orders']
         sizes = [1]
 
-    fig4 = plt.figure(figsize=(8, 5))
-    colors = ['#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0', '#9966FF', '#FF9F40', '#C9CBCF', '#7CFC00', '#FF1493', '#00CED1']
-    plt.pie(sizes, labels=labels, autopct='%1.1f%%', colors=colors[:len(sizes)], startangle=90)
-    plt.title('Orders by Category', fontsize=12, fontweight='bold')
-    plt.axis('equal')
-    plt.tight_layout()
-    
-    img4 = io.BytesIO()
-    fig4.savefig(img4, format='png', dpi=100, bbox_inches='tight', facecolor='white')
-    img4.seek(0)
-    distribution_graph = base64.b64encode(img4.getvalue()).decode()
-    plt.close(fig4)
-    
+    # Render both charts at once; any cache misses overlap on the pool
+    spending_graph, distribution_graph = _cached_charts(current_user.id, [
+        ('spending', (dates_spend, values_spend),
+         lambda: _render_line_chart_png(dates_spend, values_spend,
+                                        'My Spending Trend', 'Amount (₹)', 'blue')),
+        ('category', (labels, sizes),
+         lambda: _render_pie_chart_png(sizes, labels, 'Orders by Category')),
+    ])
+
     return render_template('user/client_dashboard.html',
                          stats=stats,
                          orders=orders,
@@ -1420,55 +1777,33 @@ def seller_dashboard():
     services = current_user.get_services()
     orders = order_manager.get_user_orders(current_user.id, as_buyer=False)
     
-    # Get today's bookings
+    # Get today's bookings — half-open range [today, tomorrow) so slots
+    # in the final 23:59:59–00:00 second aren't silently dropped, and
+    # the (provider_id, start_time) index walks the day in sorted order
     today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0).replace(tzinfo=None)
-    today_end = today_start.replace(hour=23, minute=59, second=59)
-    
+    tomorrow = today_start + timedelta(days=1)
+
     todays_bookings = Booking.query.join(AvailabilitySlot).filter(
         AvailabilitySlot.provider_id == current_user.id,
         AvailabilitySlot.start_time >= today_start,
-        AvailabilitySlot.start_time <= today_end
+        AvailabilitySlot.start_time < tomorrow
     ).order_by(AvailabilitySlot.start_time).all()
 
     # Seller Analytics Graphs
-    plt.style.use('default')
 
-    # Earnings Trend
+    # Earnings Trend — indexed scan over the daily rollup
     earnings_data = db.session.query(
-        func.date(Order.completed_at), func.sum(Order.total_price)
-    ).filter(
-        Order.seller_id == current_user.id,
-        Order.status == 'completed',
-        Order.completed_at != None
-    ).group_by(func.date(Order.completed_at)).order_by(func.date(Order.completed_at)).all()
-
-    dates_earn = []
-    values_earn = []
-    if earnings_data:
-        dates_earn = [str(r[0])[-5:] for r in earnings_data]
-        values_earn = [float(r[1]) for r in earnings_data]
-    else:
-        dates_earn = ['No Data']
-        values_earn = [0]
-
-    fig1 = plt.figure(figsize=(8, 4))
-    plt.plot(dates_earn, values_earn, color='green', marker='o', linestyle='-', linewidth=2)
-    plt.title('My Earnings Trend', fontsize=12, fontweight='bold')
-    plt.xlabel('Date')
-    plt.ylabel('Earnings (₹)')
-    plt.grid(True)
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-
-    img1 = io.BytesIO()
-    fig1.savefig(img1, format='png', dpi=100, bbox_inches='tight', facecolor='white')
-    img1.seek(0)
-    earnings_graph = base64.b64encode(img1.getvalue()).decode()
-    plt.close(fig1)
-
-    # Service Views Distribution
-    my_services = Service.query.filter_by(user_id=current_user.id).all()
-    top_services = sorted(my_services, key=lambda s: s.view_count, reverse=True)[:5]
+        UserDailyStats.date, UserDailyStats.total_amount
+    ).filter_by(
+        user_id=current_user.id, role='seller'
+    ).order_by(UserDailyStats.date).all()
+
+    dates_earn, values_earn = _chart_series(earnings_data)
+
+    # Service Views Distribution - sort and truncate in SQL instead of
+    # loading every service just to keep the five most viewed
+    top_services = Service.query.filter_by(user_id=current_user.id).order_by(
+        Service.view_count.desc()).limit(5).all()
 
     if top_services and sum(s.view_count for s in top_services) > 0:
         svc_names = [s.title[:15] + '...' if len(s.title) > 15 else s.title for s in top_services]
@@ -1477,18 +1812,14 @@ def seller_dashboard():
         svc_names = ['No Views Yet']
         svc_views = [1]
 
-    fig2 = plt.figure(figsize=(8, 5))
-    colors = ['#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0', '#9966FF', '#FF9F40', '#C9CBCF', '#7CFC00', '#FF1493', '#00CED1']
-    plt.pie(svc_views, labels=svc_names, autopct='%1.1f%%', colors=colors[:len(svc_views)], startangle=90)
-    plt.title('Service Views Distribution', fontsize=12, fontweight='bold')
-    plt.axis('equal')
-    plt.tight_layout()
-
-    img2 = io.BytesIO()
-    fig2.savefig(img2, format='png', dpi=100, bbox_inches='tight', facecolor='white')
-    img2.seek(0)
-    services_graph = base64.b64encode(img2.getvalue()).decode()
-    plt.close(fig2)
+    # Render both charts at once; any cache misses overlap on the pool
+    earnings_graph, services_graph = _cached_charts(current_user.id, [
+        ('earnings', (dates_earn, values_earn),
+         lambda: _render_line_chart_png(dates_earn, values_earn,
+                                        'My Earnings Trend', 'Earnings (₹)', 'green')),
+        ('views', (svc_names, svc_views),
+         lambda: _render_pie_chart_png(svc_views, svc_names, 'Service Views Distribution')),
+    ])
 
     return render_template('user/provider_dashboard.html',
                          services=services,
@@ -1605,7 +1936,12 @@ def order_detail(order_id):
 @login_required
 def order_action(order_id, action):
     """Handle order actions (accept/complete)"""
-    order = Order.query.get_or_404(order_id)
+    # Every action branch reads order.service (notification text, refund
+    # descriptions, certificate skill name) — fetch it in the same query
+    # instead of a lazy SELECT on first access
+    order = Order.query.options(
+        joinedload(Order.service)
+    ).filter_by(id=order_id).first_or_404()
     
     if current_user.id != order.seller_id:
         flash('Unauthorized', 'danger')
@@ -1624,78 +1960,35 @@ def order_action(order_id, action):
             notification_manager.create_notification(order.buyer_id, f"Order #{order.id} Accepted", f"Your order for {order.service.title} has been accepted.", url_for('user.order_detail', order_id=order.id))
             
             # Send acceptance emails
-            from email_utils import send_order_accepted_emails
             send_order_accepted_emails(order)
             
     elif action == 'complete':
         if order_manager.complete_order(order_id):
             # ── 1. Update order status and basic notification ──────────────────
+            # Completed orders feed the homepage satisfaction rate
+            _invalidate_homepage_stats()
             flash('Order marked as complete!', 'success')
             notification_manager.create_notification(order.buyer_id, f"Order #{order.id} Completed", f"Your order for {order.service.title} is ready!", url_for('user.order_detail', order_id=order.id))
             
             # Send completion emails
-            from email_utils import send_order_completed_emails
             send_order_completed_emails(order)
 
-            # ── 2. Generate certificate ───────────────────────────────────────────
-            try:
-                print(f"[Certificate] Starting certificate generation for order {order.id}")
-                student  = User.query.get(order.buyer_id)
-                provider = User.query.get(order.seller_id)
-                service  = order.service
-                
-                print(f"[Certificate] Student: {student.username}, Provider: {provider.username}, Service: {service.title}")
-
-                cert_id  = generate_cert_id()
-                print(f"[Certificate] Generated cert_id: {cert_id}")
-
-                # Determine paths
-                print(f"[Certificate] Calling generate_certificate function...")
-                pdf_path = generate_certificate(
-                    student_name    = student.full_name or student.username,
-                    skill_name      = service.title,
-                    provider_name   = provider.full_name or provider.username,
-                    order_id        = order.id,
-                    cert_id         = cert_id
-                )
-                print(f"[Certificate] PDF generated at: {pdf_path}")
-
-                # ── 3. Save cert record to DB ─────────────────────────────────────
-                cert = Certificate(
-                    cert_id      = cert_id,
-                    order_id     = order.id,
-                    student_id   = order.buyer_id,
-                    provider_id  = order.seller_id,
-                    skill_name   = service.title,
-                    pdf_filename = os.path.basename(pdf_path),
-                )
-                db.session.add(cert)
-                
-                # ── 4. Notify the buyer about the certificate ─────────────────────
-                notification = Notification(
-                    user_id = order.buyer_id,
-                    title   = '🎓 Your Certificate is Ready!',
-                    message = (f'Congratulations! You have completed "{service.title}". '
-                               f'Your certificate ({cert_id}) is ready to download.'),
-                    link    = url_for('user.download_certificate', cert_id=cert_id),
-                )
-                db.session.add(notification)
-                db.session.commit()
-
-                # ── 5. (Optional) send email with cert link ──────────────────────
-                try:
-                    _send_certificate_email(student, cert, pdf_path)
-                except Exception as mail_err:
-                    print(f"[Certificate] Email failed (non-fatal): {mail_err}")
-
-                flash(f'Certificate {cert_id} has been issued successfully.', 'success')
-
-            except Exception as e:
-                import traceback
-                print(f"[Certificate] Generation failed: {e}")
-                print(f"[Certificate] Full traceback:")
-                traceback.print_exc()
-                flash(f'Order marked complete, but certificate generation failed: {str(e)}', 'warning')
+            # ── 2. Issue the certificate off the request path ─────────────────
+            # PDF rendering alone can take over a second and the buyer
+            # only sees the result via notification/email anyway, so the
+            # whole generate + record + notify + mail pipeline runs on a
+            # worker thread after this response has returned. The links
+            # are built here while the request context is still available.
+            cert_id = generate_cert_id()
+            _cert_executor.submit(
+                _issue_certificate,
+                current_app._get_current_object(),
+                order.id,
+                cert_id,
+                url_for('user.download_certificate', cert_id=cert_id),
+                url_for('user.download_certificate', cert_id=cert_id, _external=True),
+            )
+            flash(f'Certificate {cert_id} is being generated and will be delivered to the buyer shortly.', 'info')
 
 
     elif action == 'reject':
@@ -1717,24 +2010,39 @@ def order_action(order_id, action):
         order.update_status('cancelled')
         db.session.commit()
 
-        # Refund the buyer's wallet and reverse the seller's credit
+        # Refund the buyer's wallet and reverse the seller's credit.
+        # All three movements ride in ONE transaction (single fsync, no
+        # partial refunds): the involved user rows are locked up front
+        # with SELECT ... FOR UPDATE so concurrent wallet writes can't
+        # interleave between the balance checks and the updates.
         try:
-            from payment_system import WalletManager, PaymentGateway
-            gateway = PaymentGateway()
-            wallet_mgr = WalletManager(payment_gateway=gateway)
+            wallet_mgr = _wallet_mgr
+
+            platform_fee_percent = 0.10
+            seller_amount = order.total_price * (1 - platform_fee_percent)
+            platform_fee_amount = order.total_price * platform_fee_percent
+            admin_id = _get_admin_user_id()
+
+            lock_ids = [order.buyer_id, order.seller_id]
+            if admin_id:
+                lock_ids.append(admin_id)
+            locked_users = {
+                u.id: u for u in User.query.with_for_update().filter(
+                    User.id.in_(lock_ids)).all()
+            }
+            seller = locked_users.get(order.seller_id)
+            admin_user = locked_users.get(admin_id) if admin_id else None
 
             # 1. Refund full amount back to buyer
             wallet_mgr.add_money(
                 user_id=order.buyer_id,
                 amount=order.total_price,
                 payment_method='refund',
-                description=f'Refund for rejected Order #{order.id} - {order.service.title}'
+                description=f'Refund for rejected Order #{order.id} - {order.service.title}',
+                commit=False
             )
 
             # 2. Reverse the 90% that was credited to the seller at order placement
-            platform_fee_percent = 0.10
-            seller_amount = order.total_price * (1 - platform_fee_percent)
-            seller = User.query.get(order.seller_id)
             seller_balance = float(seller.wallet_balance or 0.0) if seller else 0.0
 
             if seller and seller_balance >= seller_amount:
@@ -1742,7 +2050,8 @@ def order_action(order_id, action):
                     user_id=order.seller_id,
                     amount=seller_amount,
                     description=f'Reversal for rejected Order #{order.id} - {order.service.title}',
-                    username=seller.username
+                    username=seller.username,
+                    commit=False
                 )
                 print(f"[Order Reject] Reversed ₹{seller_amount:.0f} from seller (user_id: {order.seller_id})")
             else:
@@ -1751,8 +2060,6 @@ def order_action(order_id, action):
                       f"(user_id: {order.seller_id}). Current balance: ₹{seller_balance:.0f}. Manual review needed.")
 
             # 3. Reverse the 10% platform fee from admin wallet
-            platform_fee_amount = order.total_price * platform_fee_percent
-            admin_user = User.query.filter_by(user_type='admin').first()
             if admin_user:
                 admin_balance = float(admin_user.wallet_balance or 0.0)
                 if admin_balance >= platform_fee_amount:
@@ -1760,11 +2067,17 @@ def order_action(order_id, action):
                         user_id=admin_user.id,
                         amount=platform_fee_amount,
                         description=f'Platform Fee Reversal for rejected Order #{order.id} - {order.service.title}',
-                        username=admin_user.username
+                        username=admin_user.username,
+                        commit=False
                     )
                     print(f"[Order Reject] Reversed ₹{platform_fee_amount:.0f} platform fee from admin")
 
+            db.session.commit()
+
         except Exception as e:
+            # Roll back every movement — the committed status change above
+            # is untouched, so the order stays cancelled for manual review
+            db.session.rollback()
             print(f"[Order Reject] Wallet refund/reversal failed (non-fatal): {e}")
 
         # Notify the buyer with rejection reason
@@ -1777,7 +2090,6 @@ def order_action(order_id, action):
         )
         
         # Send rejection email to the buyer
-        from email_utils import send_order_rejected_email
         send_order_rejected_email(order, reason=reason)
         
         flash('Order rejected. The buyer has been notified and their payment refunded.', 'warning')
@@ -1792,8 +2104,8 @@ def download_certificate(cert_id):
     Serves the certificate PDF.
     Only the student (buyer) or the provider or admin can download it.
     """
-    from flask import send_file, abort
-    
+    from flask import send_from_directory, abort
+
     cert = Certificate.query.filter_by(cert_id=cert_id).first_or_404()
 
     # Access control
@@ -1806,25 +2118,12 @@ def download_certificate(cert_id):
         abort(403)
 
     # Use Flask's static folder directly - it's already configured correctly
-    pdf_path = os.path.join(current_app.static_folder, 'certificates', cert.pdf_filename)
-    
-    # Debug logging
-    print(f"\n{'='*60}")
-    print(f"[CERTIFICATE DOWNLOAD]")
-    print(f"{'='*60}")
-    print(f"Cert ID: {cert_id}")
-    print(f"Filename: {cert.pdf_filename}")
-    print(f"Static folder: {current_app.static_folder}")
-    print(f"Full path: {pdf_path}")
-    print(f"File exists: {os.path.exists(pdf_path)}")
-    
-    if os.path.exists(current_app.static_folder):
-        cert_dir = os.path.join(current_app.static_folder, 'certificates')
-        print(f"Cert dir exists: {os.path.exists(cert_dir)}")
-        if os.path.exists(cert_dir):
-            files = os.listdir(cert_dir)
-            print(f"Files in cert dir ({len(files)}): {files[:10]}")  # Show first 10
-    print(f"{'='*60}\n")
+    cert_dir = os.path.join(current_app.static_folder, 'certificates')
+    pdf_path = os.path.join(cert_dir, cert.pdf_filename)
+
+    if current_app.debug:
+        print(f"[CERTIFICATE DOWNLOAD] {cert_id} -> {pdf_path} "
+              f"(exists: {os.path.exists(pdf_path)})")
 
     if not os.path.exists(pdf_path):
         print(f"[ERROR] Certificate file not found at: {pdf_path}")
@@ -1832,16 +2131,21 @@ def download_certificate(cert_id):
         return redirect(url_for('user.my_certificates'))
 
     try:
-        return send_file(
-            pdf_path,
+        # send_from_directory streams through wsgi.file_wrapper (kernel
+        # sendfile where available) and conditional=True honours
+        # If-None-Match, so re-downloads of an unchanged PDF are 304s.
+        # Certificates are immutable once issued, hence the long max_age.
+        return send_from_directory(
+            cert_dir,
+            cert.pdf_filename,
             as_attachment=True,
             download_name=f"SkillVerse_Certificate_{cert.cert_id}.pdf",
-            mimetype='application/pdf'
+            mimetype='application/pdf',
+            conditional=True,
+            max_age=31536000
         )
     except Exception as e:
         print(f"[ERROR] Failed to send file: {e}")
-        import traceback
-        traceback.print_exc()
         flash(f"Error downloading certificate: {str(e)}", "danger")
         return redirect(url_for('user.my_certificates'))
 
@@ -1865,7 +2169,11 @@ def get_order_certificate(order_id):
 @login_required
 def my_certificates():
     """Page listing all certificates earned by the current user."""
-    certificates = Certificate.query.filter_by(student_id=current_user.id).order_by(Certificate.issued_at.desc()).all()
+    # The template shows the instructor per certificate — join the
+    # provider in the same query rather than one SELECT per row
+    certificates = Certificate.query.options(
+        joinedload(Certificate.provider)
+    ).filter_by(student_id=current_user.id).order_by(Certificate.issued_at.desc()).all()
     return render_template('user/my_certificates.html', certificates=certificates)
 
 
@@ -1873,25 +2181,102 @@ def my_certificates():
 @login_required
 def issued_certificates():
     """Page listing all certificates issued by the current provider or all for admin."""
+    # The template shows student and provider for every row — eager-load
+    # both users so the listing stays at one query regardless of count
+    base_query = Certificate.query.options(
+        joinedload(Certificate.student),
+        joinedload(Certificate.provider)
+    )
     # All non-admin users can see certificates they issued
     if current_user.is_admin():
         # Admin sees everything
-        certificates = Certificate.query.order_by(Certificate.issued_at.desc()).all()
+        certificates = base_query.order_by(Certificate.issued_at.desc()).all()
     else:
         # User sees only what they issued (as seller)
-        certificates = Certificate.query.filter_by(provider_id=current_user.id).order_by(Certificate.issued_at.desc()).all()
+        certificates = base_query.filter_by(provider_id=current_user.id).order_by(Certificate.issued_at.desc()).all()
         
     return render_template('user/issued_certificates.html', certificates=certificates)
 
 
-def _send_certificate_email(student, cert, pdf_path):
-    """Send certificate download link to the student via email."""
-    from email_utils import send_async_email, _get_default_sender
-    from flask import current_app
-    from threading import Thread
+# Single worker: certificate issuance is rare (one per completed
+# order) and the PDF renderer isn't worth parallelizing
+_cert_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='certificate')
+
+
+def _issue_certificate(app, order_id, cert_id, cert_link, download_url):
+    """
+    Background task for the complete action: render the certificate
+    PDF, save its record and notify/mail the buyer.
 
-    download_url = url_for('user.download_certificate',
-                           cert_id=cert.cert_id, _external=True)
+    Runs on _cert_executor outside any request, so the links are
+    precomputed by the caller and an app context is entered here.
+
+    Args:
+        app: The Flask application object
+        order_id (int): The completed order
+        cert_id (str): Pre-generated certificate id
+        cert_link (str): In-app download path for the notification
+        download_url (str): External download URL for the email
+    """
+    with app.app_context():
+        try:
+            order = db.session.get(Order, order_id)
+            if order is None:
+                print(f"[Certificate] Order {order_id} vanished before issuance")
+                return
+            student = db.session.get(User, order.buyer_id)
+            provider = db.session.get(User, order.seller_id)
+            service = order.service
+
+            print(f"[Certificate] Generating {cert_id} for order {order.id} "
+                  f"(student: {student.username}, provider: {provider.username})")
+            pdf_path = generate_certificate(
+                student_name    = student.full_name or student.username,
+                skill_name      = service.title,
+                provider_name   = provider.full_name or provider.username,
+                order_id        = order.id,
+                cert_id         = cert_id
+            )
+
+            # Save cert record and buyer notification together
+            cert = Certificate(
+                cert_id      = cert_id,
+                order_id     = order.id,
+                student_id   = order.buyer_id,
+                provider_id  = order.seller_id,
+                skill_name   = service.title,
+                pdf_filename = os.path.basename(pdf_path),
+            )
+            db.session.add(cert)
+            notification = Notification(
+                user_id = order.buyer_id,
+                title   = '🎓 Your Certificate is Ready!',
+                message = (f'Congratulations! You have completed "{service.title}". '
+                           f'Your certificate ({cert_id}) is ready to download.'),
+                link    = cert_link,
+            )
+            db.session.add(notification)
+            db.session.commit()
+
+            try:
+                _send_certificate_email(student, cert, pdf_path, download_url=download_url)
+            except Exception as mail_err:
+                print(f"[Certificate] Email failed (non-fatal): {mail_err}")
+
+            print(f"[Certificate] {cert_id} issued for order {order_id}")
+
+        except Exception as e:
+            import traceback
+            db.session.rollback()
+            print(f"[Certificate] Generation failed for order {order_id}: {e}")
+            traceback.print_exc()
+
+
+def _send_certificate_email(student, cert, pdf_path, download_url=None):
+    """Send certificate download link to the student via email."""
+    if download_url is None:
+        download_url = url_for('user.download_certificate',
+                               cert_id=cert.cert_id, _external=True)
     sender = _get_default_sender()
 
     html_content = f"""
@@ -1913,11 +2298,17 @@ def _send_certificate_email(student, cert, pdf_path):
         </div>
         """
     
-    app = current_app._get_current_object()
-    Thread(
-        target=send_async_email,
-        args=(app, f'🎓 Your SkillVerse Certificate - {cert.skill_name}', student.email, html_content, sender)
-    ).start()
+    from flask_mail import Message
+    msg = Message(
+        subject=f'🎓 Your SkillVerse Certificate - {cert.skill_name}',
+        recipients=[student.email],
+        html=html_content,
+        sender=sender
+    )
+
+    # Shared bounded mail pool — no per-send thread spawn, and SMTP
+    # concurrency stays capped during certificate bursts
+    submit_email(current_app._get_current_object(), msg)
 
 
 @user_bp.route('/order/<int:order_id>/message', methods=['POST'])
@@ -1926,13 +2317,12 @@ def send_message(order_id):
     """Send chat message"""
     content = request.form.get('content')
     if content:
-        msg, error = chat_manager.send_message(order_id, current_user.id, content)
+        msg, error, receiver_id = chat_manager.send_message(order_id, current_user.id, content)
         if error:
             flash(error, 'danger')
         else:
-            # Notify receiver
-            order = Order.query.get(order_id)
-            receiver_id = order.buyer_id if current_user.id == order.seller_id else order.seller_id
+            # Notify receiver — the manager already resolved who that is
+            # while authorizing the sender, so no extra Order fetch here
             notification_manager.create_notification(receiver_id, "New Message", f"New message from {current_user.username}", url_for('user.order_detail', order_id=order_id))
             
     return redirect(url_for('user.order_detail', order_id=order_id))
@@ -1964,29 +2354,33 @@ def profile(username):
     # Formula: 40% Testimonials + 20% Skill Reviews + 10% Skills Available + 30% Provider Reviews
     from models import Testimonial, Review, Service as Svc
 
+    # Components 1 and 2 come back as two scalars in ONE round-trip:
+    # the DB averages via scalar subqueries instead of us loading every
+    # testimonial and review row just to mean them. The active-service
+    # count is already in stats (get_user_stats counts exactly that),
+    # so it isn't recomputed here
+    testimonial_avg_sq = db.session.query(
+        func.avg(Testimonial.rating)
+    ).filter(
+        Testimonial.user_id == user.id, Testimonial.is_active == True
+    ).scalar_subquery()
+    review_avg_sq = db.session.query(func.avg(Review.rating)).join(
+        Svc, Review.service_id == Svc.id
+    ).filter(Svc.user_id == user.id).scalar_subquery()
+
+    avg_testimonial, avg_review = db.session.query(
+        testimonial_avg_sq, review_avg_sq
+    ).one()
+    active_service_count = stats.get('total_services', 0) if stats else 0
+
     # Component 1 (40%): Average testimonial rating (scale 1-5 → 0-100)
-    testimonials = Testimonial.query.filter_by(user_id=user.id, is_active=True).all()
-    if testimonials:
-        avg_testimonial = sum(t.rating for t in testimonials) / len(testimonials)
-        testimonial_score = (avg_testimonial / 5.0) * 100
-    else:
-        testimonial_score = 0.0
+    testimonial_score = (float(avg_testimonial) / 5.0) * 100 if avg_testimonial is not None else 0.0
 
     # Component 2 (20%): Average skill review rating across all provider services
-    all_service_ids = [s.id for s in Svc.query.filter_by(user_id=user.id).all()]
-    if all_service_ids:
-        reviews_for_services = Review.query.filter(Review.service_id.in_(all_service_ids)).all()
-        if reviews_for_services:
-            avg_review = sum(r.rating for r in reviews_for_services) / len(reviews_for_services)
-            review_score = (avg_review / 5.0) * 100
-        else:
-            review_score = 0.0
-    else:
-        review_score = 0.0
+    review_score = (float(avg_review) / 5.0) * 100 if avg_review is not None else 0.0
 
     # Component 3 (10%): Skills available — score based on active service count (max 10 services = 100%)
-    active_service_count = Svc.query.filter_by(user_id=user.id, is_active=True).count()
-    skills_available_score = min(active_service_count / 10.0, 1.0) * 100
+    skills_available_score = min((active_service_count or 0) / 10.0, 1.0) * 100
 
     # Component 4 (30%): Provider's own average rating (from User.get_average_rating)
     provider_avg_rating = user.get_average_rating()  # Returns float 0-5
@@ -2147,11 +2541,9 @@ def wallet():
         Rendered template
     """
     # Import payment system classes
-    from payment_system import WalletManager, PaymentGateway
     
     # Initialize wallet manager
-    gateway = PaymentGateway()
-    wallet_mgr = WalletManager(payment_gateway=gateway)
+    wallet_mgr = _wallet_mgr
     
     # Get wallet balance for current user
     wallet_balance = wallet_mgr.get_balance(current_user.id)
@@ -2177,7 +2569,6 @@ def add_money():
     Returns:
         JSON response with transaction result
     """
-    from payment_system import WalletManager, PaymentGateway, CustomException
     
     try:
         data = request.get_json()
@@ -2187,8 +2578,7 @@ def add_money():
         if amount <= 0:
             return jsonify({'success': False, 'error': 'Invalid amount'})
         
-        gateway = PaymentGateway()
-        wallet_mgr = WalletManager(payment_gateway=gateway)
+        wallet_mgr = _wallet_mgr
         
         # Process payment and add to wallet
         result = wallet_mgr.add_money(
@@ -2222,7 +2612,6 @@ def deduct_money():
     Returns:
         JSON response with transaction result
     """
-    from payment_system import WalletManager, PaymentGateway, InsufficientBalanceException, CustomException
     
     try:
         data = request.get_json()
@@ -2232,8 +2621,7 @@ def deduct_money():
         if amount <= 0:
             return jsonify({'success': False, 'error': 'Invalid amount'})
         
-        gateway = PaymentGateway()
-        wallet_mgr = WalletManager(payment_gateway=gateway)
+        wallet_mgr = _wallet_mgr
         
         # Check balance and deduct
         result = wallet_mgr.deduct_money(
@@ -2271,9 +2659,8 @@ def get_balance():
     Returns:
         JSON response with balance
     """
-    from payment_system import WalletManager
     
-    wallet_mgr = WalletManager()
+    wallet_mgr = _wallet_mgr
     balance = wallet_mgr.get_balance(current_user.id)
     
     return jsonify({
@@ -2296,9 +2683,8 @@ def transactions():
     Returns:
         Rendered template
     """
-    from payment_system import PaymentGateway
     
-    gateway = PaymentGateway()
+    gateway = _gateway
     user_transactions = gateway.get_user_transactions(current_user.id)
     
     return render_template('user/transactions.html',
@@ -2314,21 +2700,17 @@ def export_transactions():
     Returns:
         CSV file download
     """
-    from payment_system import PaymentGateway, TransactionFilter
-    from flask import Response
-    
-    gateway = PaymentGateway()
-    transactions = gateway.get_user_transactions(current_user.id)
-    
-    # Generate CSV content
-    csv_content = TransactionFilter.export_to_csv(
-        transactions,
-        filename=f'transactions_{current_user.id}.csv'
-    )
-    
-    # Return as downloadable file
+    from flask import Response, stream_with_context
+
+    gateway = _gateway
+
+    # Stream row by row: the DB cursor feeds batches into the CSV
+    # generator and WSGI sends each line as it's produced, so a large
+    # history downloads at constant memory instead of being built as
+    # one string first
+    rows = gateway.iter_user_transactions(current_user.id)
     return Response(
-        csv_content,
+        stream_with_context(TransactionFilter.iter_csv(rows)),
         mimetype='text/csv',
         headers={'Content-Disposition': f'attachment;filename=transactions_{current_user.id}.csv'}
     )
@@ -2346,10 +2728,9 @@ def get_invoice(txn_id):
     Returns:
         HTML invoice or JSON error
     """
-    from payment_system import PaymentGateway, InvoiceGenerator, TransactionNotFoundException
     
     try:
-        gateway = PaymentGateway()
+        gateway = _gateway
         transaction = gateway.get_transaction(txn_id)
         
         # Verify transaction belongs to current user
@@ -2357,7 +2738,7 @@ def get_invoice(txn_id):
             return jsonify({'success': False, 'error': 'Unauthorized'}), 403
         
         # Generate invoice HTML
-        invoice_gen = InvoiceGenerator()
+        invoice_gen = _invoice_gen
         invoice_html = invoice_gen.generate_invoice_html(transaction)
         
         return invoice_html
@@ -2404,17 +2785,24 @@ def dashboard():
 
     # --- Generate Graphs (Optimized for Admin Dashboard) ---
     # REPLACED Revenue Graph with User Growth Graph (Platform Adoption)
-    
-    plt.style.use('fivethirtyeight')
-    
+    #
+    # The cheap aggregate queries still run every request, but the PNGs
+    # come from the shared chart cache keyed by the query results — any
+    # admin session reuses the encoded chart until the data changes (or
+    # the TTL lapses), and the two misses render in parallel off the
+    # request thread instead of blocking it back to back
+
     # Graph 1: User Growth (New Signups per Day)
     # Suited for: Tracking platform adoption and marketing effectiveness
+    # Bounded to the last 30 days — unbounded, the result set (and the
+    # chart's x axis) grows with platform age
+    signup_cutoff = datetime.utcnow() - timedelta(days=30)
     user_data = db.session.query(
         func.date(User.created_at), func.count(User.id)
+    ).filter(
+        User.created_at >= signup_cutoff
     ).group_by(func.date(User.created_at)).order_by(func.date(User.created_at)).all()
-    
-    dates_curr = []
-    values_curr = []
+
     if user_data:
         dates_curr = [str(r[0]) for r in user_data]
         values_curr = [int(r[1]) for r in user_data]
@@ -2422,29 +2810,10 @@ def dashboard():
         dates_curr = ['No Data']
         values_curr = [0]
 
-    fig1 = plt.figure(figsize=(10, 5))
-    ax1 = plt.gca()
-    # Plot formatting: Green line for growth
-    ax1.plot(dates_curr, values_curr, color='#198754', linewidth=3, marker='o', markersize=8)
-    ax1.fill_between(dates_curr, values_curr, color='#198754', alpha=0.15)
-    
-    ax1.set_title('User Growth (New Signups)', fontsize=14, fontweight='bold', pad=15)
-    ax1.set_ylabel('New Users', fontsize=12)
-    plt.xticks(rotation=45, fontsize=10)
-    plt.yticks(fontsize=10)
-    plt.tight_layout()
-    
-    # Save Graph 1
-    img1 = io.BytesIO()
-    fig1.savefig(img1, format='png', dpi=100, bbox_inches='tight', facecolor='white')
-    img1.seek(0)
-    user_graph = base64.b64encode(img1.getvalue()).decode()
-    plt.close(fig1)
-
     # Graph 2: Top Categories (Bar Chart)
     # Suited for: Understanding market demand
     cat_data = db.session.query(Category.name, func.count(Service.id)).outerjoin(Service).group_by(Category.name).order_by(func.count(Service.id).desc()).limit(8).all()
-    
+
     if cat_data:
         cat_names = [r[0] for r in cat_data]
         cat_counts = [r[1] for r in cat_data]
@@ -2455,25 +2824,17 @@ def dashboard():
         cat_names = ['No Categories']
         cat_counts = [0]
 
-    fig2 = plt.figure(figsize=(10, 5))
-    ax2 = plt.gca()
-    # Plot formatting: Distinct colors for bars
-    colors = plt.cm.Paired(np.arange(len(cat_names)))
-    bars = ax2.barh(cat_names, cat_counts, color=colors)
-    
-    ax2.set_title('Top Service Categories', fontsize=14, fontweight='bold', pad=15)
-    ax2.set_xlabel('Number of Services', fontsize=12)
-    plt.xticks(fontsize=10)
-    plt.yticks(fontsize=10)
-    plt.tight_layout()
-    
-    # Save Graph 2
-    img2 = io.BytesIO()
-    fig2.savefig(img2, format='png', dpi=100, bbox_inches='tight', facecolor='white')
-    img2.seek(0)
-    category_graph = base64.b64encode(img2.getvalue()).decode()
-    plt.close(fig2)
-    
+    # user_id 0: the admin charts are platform-wide, one cache slot
+    # shared by every admin
+    user_graph, category_graph = _cached_charts(0, [
+        ('admin_growth', (tuple(dates_curr), tuple(values_curr)),
+         lambda: _render_growth_chart_png(dates_curr, values_curr)),
+        ('admin_categories', (tuple(cat_names), tuple(cat_counts)),
+         lambda: _render_barh_chart_png(cat_names, cat_counts,
+                                        'Top Service Categories',
+                                        'Number of Services')),
+    ])
+
     stats = {
         'total_users': total_users,
         'total_services': total_services,
@@ -2957,7 +3318,6 @@ def approve_booking(booking_id):
         # Send confirmation email
         from models import Booking, Notification
         booking = Booking.query.get(booking_id)
-        from email_utils import send_booking_confirmation_email
         if booking:
             send_booking_confirmation_email(booking)
             
@@ -2993,7 +3353,6 @@ def reject_booking(booking_id):
     success, error = availability_manager.reject_booking(booking_id, current_user.id)
     if success:
         # Send rejection email
-        from email_utils import send_booking_rejection_email
         if booking:
             send_booking_rejection_email(booking)
             
@@ -3045,12 +3404,8 @@ def search_services_api():
         
         # 3. Apply SQL Filters (Filter Logic)
         if search_query:
-            search_filter = db.or_(
-                Service.title.ilike(f'%{search_query}%'),
-                Service.description.ilike(f'%{search_query}%'),
-                Service.tags.ilike(f'%{search_query}%')
-            )
-            query = query.filter(search_filter)
+            # Indexed full-text search on PostgreSQL, ILIKE fallback on SQLite
+            query = query.filter(Service.search_clause(search_query))
         
         if min_price is not None:
             query = query.filter(Service.price >= min_price)
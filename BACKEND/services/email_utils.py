@@ -5,10 +5,32 @@ This module handles all email sending functionality using Flask-Mail (SMTP).
 """
 
 import os
+import atexit
 from flask_mail import Message
 from flask import render_template, current_app
 from extensions import mail
-from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared background pool for outgoing mail. A bounded pool of reusable
+# workers replaces spawning a fresh Thread per email: no per-message
+# thread start-up cost, and a burst of orders queues mail instead of
+# piling up hundreds of live threads on the SMTP server
+_email_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='email')
+atexit.register(_email_executor.shutdown, wait=False)
+
+
+def submit_email(app, msg):
+    """
+    Queue a prepared Message on the shared mail pool.
+
+    Use this from other modules instead of spawning ad-hoc threads so
+    every outgoing mail shares the same bounded workers.
+
+    Args:
+        app: Flask application instance
+        msg: Flask-Mail Message object
+    """
+    _email_executor.submit(send_async_email, app, msg)
 
 
 def _get_default_sender():
@@ -16,19 +38,32 @@ def _get_default_sender():
     return current_app.config.get('MAIL_DEFAULT_SENDER')
 
 
-def send_async_email(app, msg):
+def send_async_email(app, msg, max_retries=3):
     """
     Send email in a background thread via Flask-Mail.
-    
+
+    Transient SMTP failures (connection drops, greylisting) are retried
+    a few times with a short backoff before the message is given up on,
+    so a mail-server hiccup no longer silently loses the send.
+
     Args:
         app: Flask application instance
         msg: Flask-Mail Message object
+        max_retries (int): Attempts before giving up (default 3)
     """
+    import time as _time
     with app.app_context():
-        try:
-            mail.send(msg)
-        except Exception as e:
-            app.logger.error(f"Failed to send email: {str(e)}")
+        for attempt in range(1, max_retries + 1):
+            try:
+                mail.send(msg)
+                return
+            except Exception as e:
+                if attempt < max_retries:
+                    app.logger.warning(
+                        f"Email send attempt {attempt}/{max_retries} failed, retrying: {e}")
+                    _time.sleep(2 ** attempt)  # 2s, 4s, ...
+                else:
+                    app.logger.error(f"Failed to send email after {max_retries} attempts: {e}")
 
 
 def send_email(subject, recipient, template, **kwargs):
@@ -57,11 +92,9 @@ def send_email(subject, recipient, template, **kwargs):
             sender=_get_default_sender()
         )
 
-        # Send asynchronously to avoid blocking the request
-        Thread(
-            target=send_async_email,
-            args=(app, msg)
-        ).start()
+        # Send asynchronously on the shared worker pool so the HTTP
+        # response returns as soon as the DB work is committed
+        _email_executor.submit(send_async_email, app, msg)
 
         return True
     except Exception as e:
@@ -13,14 +13,56 @@ Purpose: Centralized business logic with data structure demonstrations
 """
 
 import random
+import time
 from collections import defaultdict
+from functools import wraps
 from data_structures import HashMap, MaxHeap, Queue, Trie
 from datetime import datetime, timedelta
-from models import db, Service, User, Category, Review, Order, Favorite, Notification, Message
+from models import db, Service, User, Category, Review, Order, Favorite, Notification, Message, UserDailyStats
 from sqlalchemy.orm import joinedload
 
 from flask import current_app
 
+
+def memoize_ttl(ttl):
+    """
+    Memoize a manager method for a short time window.
+
+    Dashboard reloads and background polls repeat the same per-user
+    computations within seconds; a tiny TTL cache keyed on the call
+    arguments absorbs those repeats as dict lookups. Only use this on
+    methods that return plain values (dicts, lists of ids) — never
+    ORM objects, which go stale once their session closes.
+
+    Args:
+        ttl (int): Seconds a cached result stays valid
+
+    Returns:
+        Decorator caching results per (args, kwargs) key
+    """
+    def decorator(fn):
+        cache = {}
+
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.time()
+            hit = cache.get(key)
+            if hit and hit[1] > now:
+                return hit[0]
+            value = fn(self, *args, **kwargs)
+            # Keep the cache bounded: drop expired entries when it grows
+            if len(cache) > 1024:
+                for stale in [k for k, (_, exp) in cache.items() if exp <= now]:
+                    cache.pop(stale, None)
+            cache[key] = (value, now + ttl)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
 class ServiceManager:
     """
     Service Manager Class - Handles all service-related operations
@@ -75,9 +117,13 @@ class ServiceManager:
             joinedload(Service.category),
             joinedload(Service.provider)
         ).filter_by(is_active=True, is_approved=True).all()
-        
-        # Use custom MaxHeap (built from scratch) to get top N services by rating
-        # MaxHeap.nlargest uses heapify-up/down internally — O(n log k)
+
+        # One grouped query for every service's rating stats — both the
+        # ranking key below and the homepage cards read them
+        Service.preload_rating_stats(services)
+
+        # Use MaxHeap (heapq-backed) to get top N services by rating
+        # MaxHeap.nlargest keeps a bounded min-heap in C — O(n log k)
         featured = MaxHeap.nlargest(
             limit,
             services,
@@ -112,16 +158,10 @@ class ServiceManager:
         # Start with all active and approved services
         results = Service.query.filter_by(is_active=True, is_approved=True)
         
-        # Apply text search if query provided
+        # Apply text search if query provided (GIN-indexed tsvector on
+        # PostgreSQL, ILIKE fallback on SQLite — see Service.search_clause)
         if query:
-            search_term = f'%{query.lower()}%'
-            results = results.filter(
-                db.or_(
-                    Service.title.ilike(search_term),
-                    Service.description.ilike(search_term),
-                    Service.tags.ilike(search_term)
-                )
-            )
+            results = results.filter(Service.search_clause(query))
         
         # Apply filters if provided
         if filters:
@@ -184,39 +224,62 @@ class ServiceManager:
         if not user or not user.is_authenticated:
             # Return popular services for non-authenticated users
             return self.get_featured_services(limit)
-        
+
+        # The expensive part (favourite/order scans + rating sort) is
+        # memoized as a list of ids; only a cheap IN fetch runs on a hit
+        rec_ids = self._recommendation_ids(user.id, limit)
+        if rec_ids is None:
+            # No favourite categories yet - fallback to featured services
+            return self.get_featured_services(limit)
+        if not rec_ids:
+            return []
+
+        services = Service.query.filter(Service.id.in_(rec_ids)).all()
+        position = {sid: i for i, sid in enumerate(rec_ids)}
+        services.sort(key=lambda s: position[s.id])
+        return services
+
+    @memoize_ttl(ttl=15)
+    def _recommendation_ids(self, user_id, limit):
+        """
+        Compute the ranked recommendation ids for a user.
+
+        Returns:
+            list: Service ids in rank order, or None when the user has
+                  no favourite categories yet (caller falls back to
+                  featured services)
+        """
         # Get categories from user's favorites and orders
         favorite_categories = set()
-        
+
         # From favorites
-        favorites = Favorite.query.filter_by(user_id=user.id).all()
+        favorites = Favorite.query.filter_by(user_id=user_id).all()
         for fav in favorites:
             if fav.service.category_id:
                 favorite_categories.add(fav.service.category_id)
-        
+
         # From orders
-        orders = Order.query.filter_by(buyer_id=user.id).all()
+        orders = Order.query.filter_by(buyer_id=user_id).all()
         for order in orders:
             if order.service.category_id:
                 favorite_categories.add(order.service.category_id)
-        
+
+        if not favorite_categories:
+            return None
+
         # Get services from favorite categories
-        if favorite_categories:
-            recommendations = Service.query.filter(
-                Service.category_id.in_(favorite_categories),
-                Service.is_active == True,
-                Service.is_approved == True
-            ).limit(limit * 2).all()
-            
-            # Sort by rating and return top N
-            recommendations.sort(
-                key=lambda s: s.get_average_rating(),
-                reverse=True
-            )
-            return recommendations[:limit]
-        
-        # Fallback to featured services
-        return self.get_featured_services(limit)
+        recommendations = Service.query.filter(
+            Service.category_id.in_(favorite_categories),
+            Service.is_active == True,
+            Service.is_approved == True
+        ).limit(limit * 2).all()
+
+        # Sort by rating and return top N
+        recommendations.sort(
+            key=lambda s: s.get_average_rating(),
+            reverse=True
+        )
+        return [s.id for s in recommendations[:limit]]
     
     def get_all_tags(self):
         """
@@ -480,28 +543,70 @@ class UserManager:
         
         return user, None
     
+    @memoize_ttl(ttl=15)
     def get_user_stats(self, user_id):
         """
         Calculate user statistics
-        
+
+        All the figures come back in ONE round-trip: a single SELECT
+        over the user row with scalar subqueries for each count, rather
+        than a COUNT query per relationship plus a review query per
+        service for the rating. Memoized for 15s on top of that, since
+        the dashboard and profile hit this on every load.
+
         Returns:
             dict: User statistics
         """
-        user = User.query.get(user_id)
-        if not user:
+        from sqlalchemy import func
+
+        total_services = db.session.query(func.count(Service.id)).filter(
+            Service.user_id == user_id, Service.is_active == True
+        ).scalar_subquery()
+
+        total_reviews = db.session.query(func.count(Review.id)).join(
+            Service, Review.service_id == Service.id
+        ).filter(
+            Service.user_id == user_id, Service.is_active == True
+        ).scalar_subquery()
+
+        # Same semantics as User.get_average_rating(): average each
+        # service's own average (unreviewed services count as 0)
+        per_service_avg = db.session.query(
+            func.coalesce(func.avg(Review.rating), 0.0).label('avg_rating')
+        ).select_from(Service).outerjoin(
+            Review, Review.service_id == Service.id
+        ).filter(
+            Service.user_id == user_id, Service.is_active == True
+        ).group_by(Service.id).subquery()
+        average_rating = db.session.query(
+            func.avg(per_service_avg.c.avg_rating)
+        ).scalar_subquery()
+
+        seller_orders = db.session.query(func.count(Order.id)).filter(
+            Order.seller_id == user_id).scalar_subquery()
+        buyer_orders = db.session.query(func.count(Order.id)).filter(
+            Order.buyer_id == user_id).scalar_subquery()
+        completed_orders = db.session.query(func.count(Order.id)).filter(
+            Order.seller_id == user_id, Order.status == 'completed'
+        ).scalar_subquery()
+
+        row = db.session.query(
+            User.created_at, total_services, total_reviews, average_rating,
+            seller_orders, buyer_orders, completed_orders
+        ).filter(User.id == user_id).first()
+
+        if row is None:
             return {}
-        
-        stats = {
-            'total_services': user.services.filter_by(is_active=True).count(),
-            'total_reviews': user.get_total_reviews(),
-            'average_rating': user.get_average_rating(),
-            'total_orders_as_seller': user.orders_as_seller.count(),
-            'total_orders_as_buyer': user.orders_as_buyer.count(),
-            'completed_projects': user.orders_as_seller.filter_by(status='completed').count(),
-            'member_since': user.created_at.strftime('%B %Y')
+
+        return {
+            'total_services': row[1] or 0,
+            'total_reviews': row[2] or 0,
+            'average_rating': round(float(row[3] or 0.0), 1),
+            'total_orders_as_seller': row[4] or 0,
+            'total_orders_as_buyer': row[5] or 0,
+            'completed_projects': row[6] or 0,
+            'member_since': row[0].strftime('%B %Y')
         }
-        
-        return stats
 
 
 class SearchEngine:
@@ -547,6 +652,9 @@ class SearchEngine:
             if service.tags:
                 for tag in service.get_tags_list():
                     self._trie.insert(tag)
+        # Freeze after the bulk build: precomputes per-node child tuples
+        # and subtree frequency bounds used to prune suggestion queries
+        self._trie.freeze()
         self._trie_built_at = datetime.now()
     
     def _ensure_trie_fresh(self):
@@ -683,29 +791,39 @@ class ReviewSystem:
         Returns:
             list: Review objects
         """
-        query = Review.query.filter_by(service_id=service_id)\
+        # Eager-load the reviewer — templates show their name and avatar
+        # per review, which otherwise lazy-loads one user at a time
+        query = Review.query.options(joinedload(Review.reviewer))\
+                           .filter_by(service_id=service_id)\
                            .order_by(Review.created_at.desc())
-        
+
         if limit:
             query = query.limit(limit)
-        
+
         return query.all()
     
     def calculate_rating_distribution(self, service_id):
         """
         Calculate rating distribution for a service
-        
+
+        The histogram is built by the database with a single
+        GROUP BY rating query (covered by the idx_review_service_rating
+        index) instead of loading every review row into Python.
+
         Returns:
             dict: Rating distribution (1-5 stars with counts)
         """
-        reviews = Review.query.filter_by(service_id=service_id).all()
-        
-        # Initialize distribution dictionary
+        from sqlalchemy import func
+
+        rows = (db.session.query(Review.rating, func.count(Review.id))
+                .filter_by(service_id=service_id)
+                .group_by(Review.rating)
+                .all())
+
+        # Initialize distribution dictionary, then overlay actual counts
         distribution = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-        
-        for review in reviews:
-            distribution[review.rating] += 1
-        
+        distribution.update(dict(rows))
+
         return distribution
 
 
@@ -767,7 +885,11 @@ class OrderManager:
         
         db.session.add(order)
         db.session.commit()
-        
+
+        # Keep the buyer's daily spending rollup current (dashboard chart)
+        UserDailyStats.record(buyer_id, 'buyer',
+                              order.created_at.date(), order.total_price)
+
         # Add to processing queue
         self.processing_queue.append(order.id)
         
@@ -800,6 +922,9 @@ class OrderManager:
         if order and order.status == 'in_progress':
             order.update_status('completed')
             db.session.commit()
+            # Keep the seller's daily earnings rollup current
+            UserDailyStats.record(order.seller_id, 'seller',
+                                  order.completed_at.date(), order.total_price)
             return True
         return False
         
@@ -808,20 +933,30 @@ class OrderManager:
     def get_user_orders(self, user_id, as_buyer=True):
         """
         Get orders for a user
-        
+
+        The order tables in the dashboards show service title/price,
+        the service's provider avatar and the counterparty per row, so
+        those relations are eager-loaded here — one joined query instead
+        of up to three lazy SELECTs per listed order.
+
         Args:
             user_id (int): User ID
             as_buyer (bool): True for buyer orders, False for seller orders
-            
+
         Returns:
             list: Order objects
         """
+        query = Order.query.options(
+            joinedload(Order.service).joinedload(Service.provider),
+            joinedload(Order.buyer),
+            joinedload(Order.seller)
+        )
         if as_buyer:
-            return Order.query.filter_by(buyer_id=user_id)\
-                             .order_by(Order.created_at.desc()).all()
+            return query.filter_by(buyer_id=user_id)\
+                        .order_by(Order.created_at.desc()).all()
         else:
-            return Order.query.filter_by(seller_id=user_id)\
-                             .order_by(Order.created_at.desc()).all()
+            return query.filter_by(seller_id=user_id)\
+                        .order_by(Order.created_at.desc()).all()
     
     def update_order_status(self, order_id, new_status):
         """
@@ -848,16 +983,51 @@ class CategoryManager:
     - CRUD operations for categories
     - Dynamic category management
     """
-    
+
+    def __init__(self):
+        """
+        Initialize CategoryManager with cache
+
+        Categories are read on nearly every page (browse filters,
+        create/edit dropdowns, homepage) but change only when an admin
+        edits them, so a short TTL cache removes a SELECT per render.
+        """
+        self._cache = HashMap()
+        self._cache_timeout = 300  # Cache timeout in seconds (5 minutes)
+
+    def _invalidate_cache(self):
+        """Drop cached category data after a mutation."""
+        self._cache.clear()
+
     def get_all_categories(self):
         """
-        Get all categories with service counts
-        
+        Get all categories (cached)
+
+        Plain dicts, not Category instances: the cache outlives the
+        request that filled it, and a cached ORM object is detached
+        once its session closes — rendering it later raises
+        DetachedInstanceError. Dicts carry no session and Jinja's
+        attribute lookup (category.name) falls through to keys, so the
+        templates don't care.
+
         Returns:
-            list: Category objects
+            list: Category dicts (id, name, description, icon, color)
         """
-        return Category.query.all()
-    
+        if 'all_categories' in self._cache:
+            cached_data, timestamp = self._cache['all_categories']
+            if (datetime.now() - timestamp).seconds < self._cache_timeout:
+                return cached_data
+
+        categories = [{
+            'id': c.id,
+            'name': c.name,
+            'description': c.description,
+            'icon': c.icon,
+            'color': c.color,
+        } for c in Category.query.all()]
+        self._cache['all_categories'] = (categories, datetime.now())
+        return categories
+
     def create_category(self, name, description='', icon='', color=''):
         """
         Create new category (Admin function)
@@ -885,28 +1055,42 @@ class CategoryManager:
         
         db.session.add(category)
         db.session.commit()
+        self._invalidate_cache()
         
         return category
     
     def get_category_stats(self):
         """
-        Get statistics for all categories
-        
+        Get statistics for all categories (cached)
+
+        Service counts come from one grouped query instead of a
+        per-category count — plain dicts, so the cached result has no
+        session attached and is always safe to render.
+
         Returns:
             list: Category stats with service counts
         """
-        categories = self.get_all_categories()
+        if 'category_stats' in self._cache:
+            cached_data, timestamp = self._cache['category_stats']
+            if (datetime.now() - timestamp).seconds < self._cache_timeout:
+                return cached_data
+
+        from sqlalchemy import func
+        counts = dict(db.session.query(
+            Service.category_id, func.count(Service.id)
+        ).filter_by(is_active=True).group_by(Service.category_id).all())
+
         stats = []
-        
-        for category in categories:
+        for category in self.get_all_categories():
             stats.append({
-                'id': category.id,
-                'name': category.name,
-                'service_count': category.get_service_count(),
-                'icon': category.icon,
-                'color': category.color
+                'id': category['id'],
+                'name': category['name'],
+                'service_count': counts.get(category['id'], 0),
+                'icon': category['icon'],
+                'color': category['color']
             })
-        
+
+        self._cache['category_stats'] = (stats, datetime.now())
         return stats
 
 
@@ -917,8 +1101,20 @@ class NotificationManager:
     Handles creation and retrieval of user notifications
     """
     
-    def create_notification(self, user_id, title, message, link=None):
-        """Create a new notification"""
+    def create_notification(self, user_id, title, message, link=None, commit=True):
+        """
+        Create a new notification
+
+        A partial unique index (ix_notif_unread_dedup) blocks identical
+        unread notifications for the same user/title/link — in that case
+        the duplicate is silently skipped and None is returned.
+
+        Pass commit=False to leave the row pending so the caller can
+        commit it together with other writes in one transaction (the
+        dedup conflict then surfaces at the caller's commit).
+        """
+        from sqlalchemy.exc import IntegrityError
+
         notification = Notification(
             user_id=user_id,
             title=title,
@@ -926,7 +1122,13 @@ class NotificationManager:
             link=link
         )
         db.session.add(notification)
-        db.session.commit()
+        if not commit:
+            return notification
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return None
         return notification
     
     def get_unread_count(self, user_id):
@@ -976,34 +1178,43 @@ class ChatManager:
     Chat Management System for Orders
     """
     def send_message(self, order_id, sender_id, content):
-        """Send a message in an order chat"""
+        """
+        Send a message in an order chat.
+
+        Returns the receiver alongside the message: the order is already
+        loaded here to authorize the sender, so callers who need to
+        notify the other party don't re-fetch it.
+
+        Returns:
+            tuple: (Message, error str or None, receiver_id or None)
+        """
         from models import HiddenChat
-        
+
         # Verify sender is part of order
         order = Order.query.get(order_id)
         if not order:
-            return None, "Order not found"
-            
+            return None, "Order not found", None
+
         if sender_id not in [order.buyer_id, order.seller_id]:
-            return None, "Unauthorized"
-            
+            return None, "Unauthorized", None
+
         message = Message(
             order_id=order_id,
             sender_id=sender_id,
             content=content
         )
-        
+
         db.session.add(message)
-        
+
         # Auto-unhide the chat for the receiver when a new message arrives
         receiver_id = order.buyer_id if sender_id == order.seller_id else order.seller_id
         hidden = HiddenChat.query.filter_by(user_id=receiver_id, order_id=order_id).first()
         if hidden:
             db.session.delete(hidden)
-        
+
         db.session.commit()
-        
-        return message, None
+
+        return message, None, receiver_id
 
     def get_messages(self, order_id, user_id):
         """Get messages for an order"""
@@ -177,16 +177,18 @@ class PaymentGateway:
         
         return True
     
-    def process_payment(self, amount, payment_method, user_id, description=""):
+    def process_payment(self, amount, payment_method, user_id, description="", commit=True):
         """
         Process a payment with 80% success rate simulation.
-        
+
         Args:
             amount: Transaction amount in rupees
             payment_method: 'card', 'upi', 'netbanking', or 'wallet'
             user_id: ID of the user making payment
             description: Transaction description
-            
+            commit: Commit the transaction record immediately (default).
+                Pass False when the caller batches several movements.
+
         Returns:
             dict: Transaction result with status, txn_id, etc.
         """
@@ -220,11 +222,11 @@ class PaymentGateway:
         }
         
         # Save transaction to file
-        self.save_transaction(txn_data)
-        
+        self.save_transaction(txn_data, commit=commit)
+
         return txn_data
     
-    def save_transaction(self, txn_data):
+    def save_transaction(self, txn_data, commit=True):
         """
         Save transaction to PostgreSQL database.
 
@@ -232,6 +234,8 @@ class PaymentGateway:
 
         Args:
             txn_data: Dictionary containing transaction details
+            commit: Commit immediately (default). Pass False when the
+                caller groups several writes into one transaction.
         """
         try:
             from models import db, Transaction
@@ -259,7 +263,6 @@ class PaymentGateway:
                 timestamp   = ts,
             )
             db.session.add(txn)
-            db.session.commit()
 
         except Exception:
             # Fallback: write to txt file so nothing is lost
@@ -268,6 +271,21 @@ class PaymentGateway:
                     f.write(json.dumps(txn_data) + '\n')
             except IOError as e:
                 raise CustomException(f"Error saving transaction: {e}")
+            return
+
+        # The commit stays OUTSIDE the fallback: when commit=True this
+        # is also what persists the caller's wallet UPDATE in the same
+        # transaction, so a commit failure must surface as an error —
+        # not be swallowed into the txt file while the caller reports a
+        # success for a debit that was rolled back at teardown
+        if commit:
+            try:
+                from models import db
+                db.session.commit()
+            except Exception as e:
+                from models import db
+                db.session.rollback()
+                raise CustomException(f"Error committing transaction: {e}")
     
     def get_transaction(self, txn_id, user_id=None):
         """
@@ -317,6 +335,32 @@ class PaymentGateway:
         except Exception as e:
             raise CustomException(f"Error reading transactions: {e}")
     
+    def iter_user_transactions(self, user_id):
+        """
+        Stream a user's transactions as dicts, newest first.
+
+        Uses yield_per so the database cursor feeds rows in batches of
+        1000 instead of materializing the whole history in memory —
+        meant for exports, where the rows are consumed once and
+        discarded.
+
+        Args:
+            user_id: User ID to filter by
+
+        Yields:
+            dict: One transaction at a time
+        """
+        try:
+            from models import Transaction
+            query = (Transaction.query
+                     .filter_by(user_id=int(user_id))
+                     .order_by(Transaction.timestamp.desc())
+                     .yield_per(1000))
+            for t in query:
+                yield t.to_dict()
+        except Exception as e:
+            raise CustomException(f"Error reading transactions: {e}")
+
     def get_all_transactions(self):
         """
         Get all transactions from PostgreSQL (newest first).
@@ -374,18 +418,60 @@ class WalletManager:
         except Exception:
             return None
 
-    def __save_balance(self, user, new_balance):
+    # Process-wide balance cache: user_id -> (balance, expires). Sits
+    # behind the per-request flask.g cache so balance polling between
+    # requests skips SQL too. Every wallet movement in this process
+    # writes through the post-commit value, and the short TTL bounds
+    # staleness from writes made by other worker processes.
+    _balance_cache = {}
+    _BALANCE_TTL = 60  # seconds
+
+    @staticmethod
+    def __cache_key(user_id):
+        return f'_wallet_balance_{user_id}'
+
+    def __cache_invalidate(self, user_id):
+        """Drop the cached balance after any wallet movement."""
+        self._balance_cache.pop(int(user_id), None)
+        try:
+            from flask import g, has_app_context
+            if has_app_context():
+                g.pop(self.__cache_key(user_id), None)
+        except Exception:
+            pass  # Outside Flask entirely (e.g. the __main__ demo)
+
+    def __cache_store(self, user_id, balance):
+        """Cache a known-committed balance for this process."""
+        import time
+        cache = self._balance_cache
+        if len(cache) > 4096:
+            now = time.time()
+            for stale in [k for k, (_, exp) in cache.items() if exp <= now]:
+                cache.pop(stale, None)
+        cache[int(user_id)] = (balance, time.time() + self._BALANCE_TTL)
+
+    def __save_balance(self, user, new_balance, commit=True):
         """
         Persist updated balance to PostgreSQL.
-        
+
         Args:
             user: SQLAlchemy User object
             new_balance: New balance value (float)
+            commit: Commit immediately (default). Pass False when the
+                caller groups several writes into one transaction.
         """
         try:
             from models import db
             user.wallet_balance = float(new_balance)
-            db.session.commit()
+            if commit:
+                db.session.commit()
+            self.__cache_invalidate(user.id)
+            if commit:
+                # Write through the committed value so the next balance
+                # read in this process is a cache hit. Deferred-commit
+                # callers only get the invalidation above — their value
+                # isn't durable yet
+                self.__cache_store(user.id, float(new_balance))
         except Exception as e:
             from models import db
             db.session.rollback()
@@ -398,17 +484,46 @@ class WalletManager:
     def get_balance(self, user_id):
         """
         Get current wallet balance for a user from the database.
-        
+
+        The value is memoized on flask.g for the rest of the request, so
+        a page that shows the balance in several places (navbar, detail
+        sidebar, wallet widget) pays for one query instead of one per
+        call, and in a process-wide TTL cache so UI balance polling
+        between requests skips SQL too. Any wallet movement invalidates
+        both layers (and writes the committed value through).
+
         Args:
             user_id: User ID
-            
+
         Returns:
             float: Current balance (0.0 if user not found)
         """
+        import time
+        try:
+            from flask import g, has_app_context
+            in_ctx = has_app_context()
+        except Exception:
+            in_ctx = False
+
+        key = self.__cache_key(user_id)
+        if in_ctx:
+            cached = g.get(key)
+            if cached is not None:
+                return cached
+
+        hit = self._balance_cache.get(int(user_id))
+        if hit is not None and hit[1] > time.time():
+            if in_ctx:
+                setattr(g, key, hit[0])
+            return hit[0]
+
         user = self.__get_user(user_id)
-        if user:
-            return float(user.wallet_balance or 0.0)
-        return 0.0
+        balance = float(user.wallet_balance or 0.0) if user else 0.0
+
+        if in_ctx:
+            setattr(g, key, balance)
+        self.__cache_store(user_id, balance)
+        return balance
 
     def get_wallet(self, user_id):
         """
@@ -454,23 +569,25 @@ class WalletManager:
             self.__save_balance(user, initial_balance)
         return self.get_wallet(user_id)
 
-    def add_money(self, user_id, amount, payment_method='card', description='Wallet Recharge'):
+    def add_money(self, user_id, amount, payment_method='card', description='Wallet Recharge', commit=True):
         """
         Add money to wallet using payment gateway.
-        
+
         Exception Handling (Unit-8):
         - Validates amount
         - Handles payment failure
-        
+
         Args:
             user_id: User ID
             amount: Amount to add
             payment_method: Payment method used
             description: Transaction description
-            
+            commit: Commit immediately (default). Pass False to let the
+                caller commit several wallet movements atomically.
+
         Returns:
             dict: Transaction result
-            
+
         Raises:
             CustomException: If amount is invalid or payment fails
         """
@@ -482,7 +599,8 @@ class WalletManager:
             amount=amount,
             payment_method=payment_method,
             user_id=user_id,
-            description=description
+            description=description,
+            commit=commit
         )
 
         # Only update DB balance if payment succeeded
@@ -492,43 +610,70 @@ class WalletManager:
                 raise CustomException(f"User {user_id} not found in database")
 
             new_balance = float(user.wallet_balance or 0.0) + float(amount)
-            self.__save_balance(user, new_balance)
+            self.__save_balance(user, new_balance, commit=commit)
             txn_result['new_balance'] = new_balance
 
         return txn_result
 
-    def deduct_money(self, user_id, amount, description='Service Purchase', username=None):
+    def deduct_money(self, user_id, amount, description='Service Purchase', username=None, commit=True):
         """
         Deduct money from wallet for purchase.
-        
+
+        The balance check and the decrement happen in ONE atomic SQL
+        UPDATE (``... WHERE wallet_balance >= amount``), so two
+        concurrent purchases can never both pass a stale Python-side
+        check and overdraw the wallet. If no row matches, the balance
+        was insufficient.
+
         Exception Handling (Unit-8):
-        - Checks sufficient balance
-        - Raises InsufficientBalanceException if needed
-        
+        - Raises InsufficientBalanceException if the guarded UPDATE
+          matches no row
+
         Args:
             user_id: User ID
             amount: Amount to deduct
             description: Transaction description
             username: Username for display
-            
+            commit: Commit immediately (default). Pass False to let the
+                caller commit several wallet movements atomically.
+
         Returns:
             dict: Transaction result
         """
         if amount <= 0:
             raise CustomException("Amount must be greater than 0")
 
-        user = self.__get_user(user_id)
-        if user is None:
-            raise CustomException(f"User {user_id} not found in database")
+        from sqlalchemy import update
+        from models import db, User
 
-        current_balance = float(user.wallet_balance or 0.0)
+        amount = float(amount)
 
-        # Check sufficient balance
-        if current_balance < amount:
-            raise InsufficientBalanceException(required=amount, available=current_balance)
+        # Atomic decrement: check and write in a single statement so the
+        # database enforces the balance floor, not a read-then-write race
+        result = db.session.execute(
+            update(User)
+            .where(User.id == int(user_id), User.wallet_balance >= amount)
+            .values(wallet_balance=User.wallet_balance - amount)
+        )
 
-        new_balance = current_balance - float(amount)
-        self.__save_balance(user, new_balance)
+        if result.rowcount == 0:
+            # Either the user doesn't exist or the balance was short —
+            # fetch once only to build a meaningful error
+            user = self.__get_user(user_id)
+            if user is None:
+                raise CustomException(f"User {user_id} not found in database")
+            raise InsufficientBalanceException(
+                required=amount,
+                available=float(user.wallet_balance or 0.0)
+            )
+
+        # Re-read inside the same transaction for the receipt
+        new_balance = float(
+            db.session.query(User.wallet_balance)
+            .filter(User.id == int(user_id))
+            .scalar() or 0.0
+        )
+        self.__cache_invalidate(user_id)
 
         # Use IST for all timestamps
         try:
@@ -554,20 +699,22 @@ class WalletManager:
             'new_balance': new_balance
         }
 
-        self.payment_gateway.save_transaction(txn_result)
+        self.payment_gateway.save_transaction(txn_result, commit=commit)
         return txn_result
 
-    def credit_seller(self, user_id, amount, description='Payment Received', username=None, transaction_id=None):
+    def credit_seller(self, user_id, amount, description='Payment Received', username=None, transaction_id=None, commit=True):
         """
         Credit money to seller's wallet when a purchase is made.
-        
+
         Args:
             user_id: Seller's user ID
             amount: Amount to credit
             description: Transaction description
             username: Seller's username
             transaction_id: ID to use for transaction (shared with buyer)
-            
+            commit: Commit immediately (default). Pass False to let the
+                caller commit several wallet movements atomically.
+
         Returns:
             dict: Transaction result
         """
@@ -579,7 +726,7 @@ class WalletManager:
             raise CustomException(f"Seller user {user_id} not found in database")
 
         new_balance = float(user.wallet_balance or 0.0) + float(amount)
-        self.__save_balance(user, new_balance)
+        self.__save_balance(user, new_balance, commit=commit)
 
         # Use IST for all timestamps
         try:
@@ -605,7 +752,7 @@ class WalletManager:
             'new_balance': new_balance
         }
 
-        self.payment_gateway.save_transaction(txn_result)
+        self.payment_gateway.save_transaction(txn_result, commit=commit)
         return txn_result
 
     def get_transaction_history(self, user_id):
@@ -960,6 +1107,40 @@ class TransactionFilter:
         """
         return [txn for txn in transactions if txn.get('status') == status]
     
+    @staticmethod
+    def iter_csv(transactions):
+        """
+        Stream transactions as CSV, one chunk per row.
+
+        File Handling (Unit-6):
+        - Generates CSV formatted output incrementally
+
+        Unlike export_to_csv this never holds more than one row in
+        memory and works off any iterable (including a streaming DB
+        cursor), so a large export starts downloading immediately
+        instead of being built as one giant string first.
+
+        Args:
+            transactions: Iterable of transaction dictionaries
+
+        Yields:
+            str: CSV header, then one CSV line per transaction
+        """
+        headers = ['Transaction ID', 'Amount', 'Status', 'Method', 'Description', 'Date', 'Time']
+        yield ','.join(headers) + '\n'
+
+        for txn in transactions:
+            row = [
+                str(txn.get('id', '')),
+                str(txn.get('amount', '')),
+                str(txn.get('status', '')),
+                str(txn.get('method', '')),
+                str(txn.get('description', '')).replace(',', ';'),  # Escape commas
+                str(txn.get('date', '')),
+                str(txn.get('time', ''))
+            ]
+            yield ','.join(row) + '\n'
+
     @staticmethod
     def export_to_csv(transactions, filename='transactions.csv'):
         """
@@ -19,6 +19,10 @@ sys.path.insert(0, ROOT_DIR)
 # Change to BACKEND/core directory for proper template/static paths
 os.chdir(os.path.join(ROOT_DIR, 'BACKEND', 'core'))
 
+# The dev runner is a single process, so let it set up the database on
+# boot (production workers skip this and use `flask init-db` instead)
+os.environ.setdefault('FLASK_RUN_MIGRATIONS', '1')
+
 # Import and run the app
 from app import create_app
 from extensions import socketio